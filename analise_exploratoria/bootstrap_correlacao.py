@@ -0,0 +1,220 @@
+import contextlib
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from analise_exploratoria.correlacao_streaming import METODOS, pearson
+
+# Dados numéricos compartilhados com os processos do pool (definidos por `_iniciar_processo`)
+_VALORES = None
+
+
+def _iniciar_processo(valores: np.ndarray) -> None:
+    """Recebe os dados uma única vez por processo, e não a cada lote."""
+    global _VALORES
+    _VALORES = valores
+
+
+def correlacoes_em_lote(amostras: np.ndarray, deslocamento: np.ndarray) -> np.ndarray:
+    """
+    Correlações de Pearson de várias amostras de uma vez.
+
+    Os co-momentos de todas as amostras saem de produtos de matrizes em 3D
+    (amostras x colunas x linhas) @ (amostras x linhas x colunas): um só, se não houver
+    valores ausentes; quatro, com o mesmo tratamento par a par dos ausentes de
+    `DataFrame.corr()`, se houver.
+
+    Args:
+        amostras (np.ndarray): Pilha (amostras x linhas x colunas) em float64.
+        deslocamento (np.ndarray): Valor subtraído de cada coluna (ex.: a média), para estabilidade.
+
+    Returns:
+        np.ndarray: Pilha (amostras x colunas x colunas) de matrizes de correlação.
+    """
+    validos = ~np.isnan(amostras)
+    if validos.all():
+        # Sem ausentes, contagens e somas não dependem do par: basta um produto de matrizes
+        centrados = amostras - deslocamento
+        forma = (amostras.shape[0], amostras.shape[2], amostras.shape[2])
+        soma = np.broadcast_to(centrados.sum(axis=1)[:, :, None], forma)
+        soma_quadrados = np.broadcast_to((centrados * centrados).sum(axis=1)[:, :, None], forma)
+        n = np.full(forma, float(amostras.shape[1]))
+        return pearson(n, soma, soma_quadrados, np.swapaxes(centrados, 1, 2) @ centrados)
+
+    centrados = np.where(validos, amostras - deslocamento, 0.0)
+    mascara = validos.astype(np.float64)
+    centrados_t = np.swapaxes(centrados, 1, 2)
+    return pearson(
+        np.swapaxes(mascara, 1, 2) @ mascara,
+        centrados_t @ mascara,
+        np.swapaxes(centrados * centrados, 1, 2) @ mascara,
+        centrados_t @ centrados,
+    )
+
+
+def _menores(valores: np.ndarray, m: int) -> np.ndarray:
+    """Os `m` menores valores de cada coluna de `valores` (sem NaN), em ordem crescente."""
+    if len(valores) > m:
+        valores = np.partition(valores, m - 1, axis=0)[:m]
+    return np.sort(valores, axis=0)
+
+
+def _percentil_inferior(menores: np.ndarray, validas: np.ndarray, fracao: float) -> np.ndarray:
+    """
+    Percentil `fracao` (interpolação linear, como em `np.nanpercentile`) de cada par.
+
+    Só as posições próximas do início da amostra ordenada são usadas, de modo que bastam
+    os menores valores de cada par (`menores`, com +inf nas posições sem valor válido).
+    """
+    posicao = (validas - 1) * fracao
+    abaixo = np.floor(np.maximum(posicao, 0)).astype(np.intp)
+    acima = np.minimum(abaixo + 1, np.maximum(validas - 1, 0))
+    a = np.take_along_axis(menores, abaixo[None], axis=0)[0]
+    b = np.take_along_axis(menores, acima[None], axis=0)[0]
+    with np.errstate(invalid='ignore'):
+        percentil = np.where(acima > abaixo, a + (posicao - abaixo) * (b - a), a)
+    return np.where(validas > 0, percentil, np.nan)
+
+
+def _reamostrar_lote(tarefa: tuple) -> tuple:
+    """
+    Processa um lote de reamostras dentro de um processo do pool.
+
+    Cada reamostra bootstrap sorteia linhas com reposição; cada permutação embaralha cada
+    coluna de forma independente, o que desfaz a associação de todos os pares ao mesmo tempo.
+    Das correlações bootstrap, só voltam as `m` menores e as `m` maiores de cada par, que
+    é tudo de que os percentis das caudas precisam.
+
+    Args:
+        tarefa (tuple): (semente, reamostras no lote, correlação observada, deslocamento, m).
+
+    Returns:
+        tuple: (m menores correlações bootstrap de cada par, em ordem crescente, com +inf
+        nas faltantes; m maiores, negadas, idem; reamostras válidas por par; contagem por
+        par de permutações com |r| maior ou igual ao observado).
+    """
+    semente, tamanho, observada, deslocamento, m = tarefa
+    valores = _VALORES
+    n, k = valores.shape
+    gerador = np.random.default_rng(semente)
+    i, j = np.triu_indices(k, k=1)
+
+    linhas = gerador.integers(0, n, size=(tamanho, n))
+    bootstrap = correlacoes_em_lote(valores[linhas], deslocamento)[:, i, j]
+    nulas_bootstrap = np.isnan(bootstrap)
+    menores = _menores(np.where(nulas_bootstrap, np.inf, bootstrap), m)
+    maiores = _menores(np.where(nulas_bootstrap, np.inf, -bootstrap), m)
+    validas = (~nulas_bootstrap).sum(axis=0)
+
+    permutacoes = gerador.permuted(np.tile(np.arange(n)[:, None], (tamanho, 1, k)), axis=1)
+    permutadas = np.take_along_axis(valores[None, :, :], permutacoes, axis=1)
+    nulas = correlacoes_em_lote(permutadas, deslocamento)
+    extremas = (np.abs(nulas[:, i, j]) >= np.abs(observada[i, j]) - 1e-12).sum(axis=0)
+    return menores, maiores, validas, extremas
+
+
+def testar_correlacoes(df: pd.DataFrame, metodo: str = 'pearson', n_reamostras: int = 1000,
+                       nivel: float = 0.95, tamanho_lote: int = 50, n_workers: int = 1,
+                       semente: int = 0) -> pd.DataFrame:
+    """
+    Calcula p-valores e intervalos de confiança bootstrap para todos os pares de colunas numéricas.
+
+    As reamostras são geradas em lotes; cada lote calcula as correlações de todas as suas
+    reamostras com produtos de matrizes em 3D, e os lotes são distribuídos entre processos
+    quando `n_workers > 1`. O p-valor (bilateral) é o de um teste de permutação:
+    a fração de permutações com correlação, em módulo, ao menos tão grande quanto a
+    observada, `(1 + extremas) / (1 + n_reamostras)`. O intervalo de confiança é o dos
+    percentis das correlações bootstrap. Como os percentis das caudas só dependem dos
+    valores extremos, cada lote devolve apenas as correlações mais baixas e mais altas de
+    cada par, mescladas à medida que chegam. A memória guarda só essas caudas (cerca de
+    2,5% das reamostras em cada ponta, com `nivel=0.95`), e não todas as reamostras.
+
+    Cada lote recebe uma semente derivada de `semente`, de modo que o resultado não
+    depende do número de processos. Na correlação de Spearman, os postos são calculados
+    uma vez sobre a amostra original (exatos nas permutações; uma aproximação usual no
+    bootstrap, que não recalcula os postos de cada reamostra).
+
+    Args:
+        df (pd.DataFrame): Dados analisados; só as colunas numéricas entram.
+        metodo (str, opcional): 'pearson' ou 'spearman'. O padrão é 'pearson'.
+        n_reamostras (int, opcional): Reamostras bootstrap (e permutações). O padrão é 1000.
+        nivel (float, opcional): Nível de confiança do intervalo. O padrão é 0.95.
+        tamanho_lote (int, opcional): Reamostras por lote; limita a memória de cada
+            processo a cerca de `8 * tamanho_lote * linhas * colunas` bytes por matriz
+            temporária. O padrão é 50.
+        n_workers (int, opcional): Número de processos. O padrão é 1.
+        semente (int, opcional): Semente do gerador aleatório. O padrão é 0.
+
+    Returns:
+        pd.DataFrame: Um par por linha ('variavel_1', 'variavel_2'), com 'correlacao',
+        'p_valor', 'ic_inferior', 'ic_superior' e 'n' (linhas com ambas preenchidas),
+        do par mais ao menos correlacionado.
+
+    Raises:
+        ValueError: Se algum parâmetro for inválido.
+
+    Example:
+        >>> testar_correlacoes(df, n_reamostras=2000, n_workers=4).head()
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"❌ Método de correlação desconhecido: '{metodo}'. Use um de {METODOS}.")
+    if not isinstance(n_reamostras, int) or n_reamostras <= 0:
+        raise ValueError("❌ O número de reamostras deve ser um inteiro positivo.")
+    if not 0 < nivel < 1:
+        raise ValueError("❌ O nível de confiança deve estar entre 0 e 1.")
+    if not isinstance(tamanho_lote, int) or tamanho_lote <= 0:
+        raise ValueError("❌ O tamanho do lote deve ser um inteiro positivo.")
+    if not isinstance(n_workers, int) or n_workers <= 0:
+        raise ValueError("❌ O número de workers deve ser um inteiro positivo.")
+
+    numericas = df.select_dtypes(include='number')
+    if metodo == 'spearman':
+        numericas = numericas.rank(method='average')
+    valores = numericas.to_numpy(dtype=np.float64)
+    with warnings.catch_warnings():
+        # Colunas sem nenhum valor (ou pares sem reamostras válidas) resultam em NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        deslocamento = np.nan_to_num(np.nanmean(valores, axis=0))
+    observada = correlacoes_em_lote(valores[None], deslocamento)[0]
+
+    # Posições usadas pelo percentil da cauda (mais uma de folga para arredondamentos)
+    cauda = (1 - nivel) / 2
+    m = min(n_reamostras, int(np.floor((n_reamostras - 1) * cauda)) + 3)
+    tamanhos = [min(tamanho_lote, n_reamostras - inicio) for inicio in range(0, n_reamostras, tamanho_lote)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    tarefas = [(s, t, observada, deslocamento, m) for s, t in zip(sementes, tamanhos)]
+
+    i, j = np.triu_indices(len(numericas.columns), k=1)
+    menores = np.empty((0, len(i)))
+    maiores = np.empty((0, len(i)))
+    validas = extremas = 0
+    with contextlib.ExitStack() as pilha:
+        if n_workers > 1 and len(tarefas) > 1:
+            executor = pilha.enter_context(ProcessPoolExecutor(
+                max_workers=min(n_workers, len(tarefas)), initializer=_iniciar_processo, initargs=(valores,),
+            ))
+            resultados = executor.map(_reamostrar_lote, tarefas)
+        else:
+            _iniciar_processo(valores)
+            resultados = map(_reamostrar_lote, tarefas)
+        for menores_lote, maiores_lote, validas_lote, extremas_lote in resultados:
+            menores = _menores(np.concatenate([menores, menores_lote]), m)
+            maiores = _menores(np.concatenate([maiores, maiores_lote]), m)
+            validas = validas + validas_lote
+            extremas = extremas + extremas_lote
+
+    inferior = _percentil_inferior(menores, validas, cauda)
+    superior = -_percentil_inferior(maiores, validas, cauda)
+    validos = ~np.isnan(valores)
+    pares = validos.T.astype(np.int64) @ validos.astype(np.int64)
+
+    tabela = pd.DataFrame({
+        'variavel_1': numericas.columns[i], 'variavel_2': numericas.columns[j],
+        'correlacao': observada[i, j],
+        'p_valor': np.where(np.isnan(observada[i, j]), np.nan, (1 + extremas) / (1 + n_reamostras)),
+        'ic_inferior': inferior, 'ic_superior': superior, 'n': pares[i, j],
+    })
+    ordem = np.argsort(-np.abs(tabela['correlacao'].fillna(0).to_numpy()), kind='stable')
+    return tabela.iloc[ordem].reset_index(drop=True)
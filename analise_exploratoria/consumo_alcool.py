@@ -1,5 +1,6 @@
 import pandas as pd
 import plotly.express as px
+from pipeline.copia import copia_preguicosa
 
 class ConsumoAlcool:
     """
@@ -32,7 +33,7 @@ class ConsumoAlcool:
         if not required_columns.issubset(df.columns):
             raise KeyError(f"❌ O DataFrame deve conter as colunas {required_columns} para a visualização.")
 
-        self.df = df.copy()  # Mantém os dados originais intactos
+        self.df = copia_preguicosa(df)  # Mantém os dados originais intactos
 
     def visualizar_distribuicao_alcool(self, nbins: int = 30) -> None:
         """
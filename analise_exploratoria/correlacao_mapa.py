@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
+from pipeline.copia import copia_preguicosa
+from analise_exploratoria.bootstrap_correlacao import testar_correlacoes
+from analise_exploratoria.correlacao_streaming import METODOS, correlacionar
 
 class MatrizRelacao:
     """
@@ -11,30 +12,54 @@ class MatrizRelacao:
     e exibe um heatmap para facilitar a visualização.
 
     Funcionalidades:
-    - Calcular a matriz de correlação de Pearson para variáveis numéricas.
+    - Calcular a matriz de correlação (Pearson ou Spearman) para variáveis numéricas.
     - Filtrar apenas as correlações significativas (>0.5 ou <-0.5).
+    - Testar a estabilidade das correlações (p-valores por permutação e intervalos bootstrap).
     - Exibir um heatmap das correlações relevantes.
 
+    A matriz é calculada uma única vez por instância (co-momentos acumulados em blocos,
+    ver `correlacao_streaming`) e reaproveitada pelo filtro e pelo heatmap.
+
     Attributes:
         df (pd.DataFrame): O DataFrame contendo os dados a serem analisados.
+        metodo (str): Método de correlação, 'pearson' ou 'spearman'.
+        n_workers (int): Número de processos usados no cálculo da matriz.
     """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, metodo: str = 'pearson', n_workers: int = 1):
         """
         Inicializa a classe com um DataFrame.
 
         Args:
             df (pd.DataFrame): O DataFrame que será analisado.
+            metodo (str, opcional): 'pearson' ou 'spearman'. O padrão é 'pearson'.
+            n_workers (int, opcional): Número de processos usados no cálculo da matriz.
+                O padrão é 1.
+
+        Raises:
+            TypeError: Se `df` não for um DataFrame.
+            ValueError: Se o método for desconhecido ou `n_workers` não for um inteiro positivo.
         """
         if not isinstance(df, pd.DataFrame):
             raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
-
-        self.df = df.copy()  # Mantém os dados originais intactos
+        if metodo not in METODOS:
+            raise ValueError(f"❌ Método de correlação desconhecido: '{metodo}'. Use um de {METODOS}.")
+        if not isinstance(n_workers, int) or n_workers <= 0:
+            raise ValueError("❌ O número de workers deve ser um inteiro positivo.")
+
+        self.df = copia_preguicosa(df)  # Mantém os dados originais intactos
+        self.metodo = metodo
+        self.n_workers = n_workers
+        self._correlacoes = None
+        self._testes = None
     
     def calcular_correlacoes(self) -> pd.DataFrame:
         """
         Calcula a matriz de correlação entre as variáveis numéricas.
 
+        A matriz é calculada na primeira chamada e guardada; as chamadas seguintes (inclusive
+        as do filtro e do heatmap) devolvem a mesma matriz.
+
         Returns:
             pd.DataFrame: Matriz de correlação.
 
@@ -43,17 +68,50 @@ class MatrizRelacao:
             >>> correlation_matrix = analyzer.calcular_correlacoes()
         """
 
-        correlation_matrix = self.df.select_dtypes(include=['float', 'int']).corr()
-        print("\n📊 Matriz de Correlação Calculada:")
-        return correlation_matrix
+        if self._correlacoes is None:
+            self._correlacoes = correlacionar(self.df, self.metodo, n_workers=self.n_workers)
+            print("\n📊 Matriz de Correlação Calculada:")
+        return self._correlacoes
     
-    def obter_correlacoes_significativas(self, limiar: float = 0.5) -> pd.DataFrame:
+    def testar_correlacoes(self, n_reamostras: int = 1000, nivel: float = 0.95, semente: int = 0) -> pd.DataFrame:
+        """
+        Calcula p-valores (teste de permutação) e intervalos de confiança bootstrap para cada par.
+
+        As reamostras são processadas em lotes, com produtos de matrizes em 3D, e os lotes
+        divididos entre `n_workers` processos (ver `bootstrap_correlacao`). O resultado é
+        guardado e reaproveitado por `obter_correlacoes_significativas`.
+
+        Args:
+            n_reamostras (int, opcional): Reamostras bootstrap (e permutações). O padrão é 1000.
+            nivel (float, opcional): Nível de confiança dos intervalos. O padrão é 0.95.
+            semente (int, opcional): Semente do gerador aleatório. O padrão é 0.
+
+        Returns:
+            pd.DataFrame: Um par de variáveis por linha, com 'correlacao', 'p_valor',
+            'ic_inferior', 'ic_superior' e 'n'.
+
+        Example:
+            >>> analyzer = MatrizRelacao(df, n_workers=4)
+            >>> analyzer.testar_correlacoes(n_reamostras=2000).head()
+        """
+        if self._testes is None or self._testes[0] != (n_reamostras, nivel, semente):
+            tabela = testar_correlacoes(self.df, self.metodo, n_reamostras, nivel,
+                                        n_workers=self.n_workers, semente=semente)
+            self._testes = ((n_reamostras, nivel, semente), tabela)
+            print(f"\n🎲 Correlações testadas com {n_reamostras} reamostras "
+                  f"(intervalos de {100 * nivel:.0f}%):")
+        return self._testes[1]
+
+    def obter_correlacoes_significativas(self, limiar: float = 0.5, alfa: float = None) -> pd.DataFrame:
         """
         Filtra as correlações mais significativas com base em um limiar.
 
         Args:
             limiar (float, opcional): Valor mínimo absoluto para considerar uma correlação significativa.
                 O padrão é 0.5.
+            alfa (float, opcional): Se informado, mantém apenas os pares com p-valor menor que
+                `alfa` e cujo intervalo de confiança não contém zero (ver `testar_correlacoes`).
+                O padrão (None) aplica só o limiar.
 
         Returns:
             pd.DataFrame: Matriz contendo apenas as correlações fortes.
@@ -61,22 +119,35 @@ class MatrizRelacao:
         Example:
             >>> analyzer = MatrizRelacao(df)
             >>> high_corr = analyzer.obter_correlacoes_significativas(limiar=0.6)
+            >>> estaveis = analyzer.obter_correlacoes_significativas(limiar=0.6, alfa=0.01)
         """
 
         correlation_matrix = self.calcular_correlacoes()
+        if alfa is not None:
+            testes = self.testar_correlacoes()
+            estaveis = testes[(testes['p_valor'] < alfa) &
+                              (np.sign(testes['ic_inferior']) == np.sign(testes['ic_superior']))]
+            i = correlation_matrix.columns.get_indexer(estaveis['variavel_1'])
+            j = correlation_matrix.columns.get_indexer(estaveis['variavel_2'])
+            mascara = np.eye(len(correlation_matrix.columns), dtype=bool)
+            mascara[i, j] = mascara[j, i] = True
+            correlation_matrix = correlation_matrix.where(mascara)
         high_correlations = correlation_matrix[np.abs(correlation_matrix) > limiar]
         high_correlations = high_correlations[high_correlations < 1.0].dropna(how='all', axis=1).dropna(how='all', axis=0)
 
         print("\n🔥 Correlações Significativas (>|{:.2f}|):".format(limiar))
         return high_correlations
     
-    def visualizar_heatmap_correlacoes(self, limiar: float = 0.5) -> None:
+    def visualizar_heatmap_correlacoes(self, limiar: float = 0.5,
+                                       correlacoes_significativas: pd.DataFrame = None) -> None:
         """
         Gera um heatmap com as correlações mais relevantes.
 
         Args:
             limiar (float, opcional): Valor mínimo absoluto para considerar uma correlação significativa.
                 O padrão é 0.5.
+            correlacoes_significativas (pd.DataFrame, opcional): Resultado já calculado de
+                `obter_correlacoes_significativas(limiar)`. O padrão (None) o calcula.
 
         Returns:
             None: Apenas exibe o gráfico.
@@ -86,18 +157,24 @@ class MatrizRelacao:
             >>> analyzer.visualizar_heatmap_correlacoes()
         """
 
-        high_correlations = self.obter_correlacoes_significativas(limiar)
+        high_correlations = correlacoes_significativas
+        if high_correlations is None:
+            high_correlations = self.obter_correlacoes_significativas(limiar)
 
         if high_correlations.empty:
             print("✅ Nenhuma correlação significativa encontrada para o limiar definido.")
             return
 
+        # Importados só aqui: calcular as correlações não depende das bibliotecas de gráficos
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(10, 8))
         sns.heatmap(high_correlations, annot=True, cmap='coolwarm', fmt=".2f", linewidths=0.5)
         plt.title(f"Heatmap das Correlações Significativas (> |{limiar}|)")
         plt.show()
     
-    def executar_matriz_relacao(self, limiar: float = 0.5) -> None:
+    def executar_matriz_relacao(self, limiar: float = 0.5, alfa: float = None) -> None:
         """
         Executa o pipeline completo para análise da matriz de correlação.
 
@@ -109,6 +186,9 @@ class MatrizRelacao:
         Args:
             limiar (float, opcional): Valor mínimo absoluto para considerar uma correlação significativa.
                 O padrão é 0.5.
+            alfa (float, opcional): Se informado, a filtragem também exige p-valor menor que
+                `alfa` e intervalo de confiança sem o zero (ver `testar_correlacoes`).
+                O padrão (None) aplica só o limiar.
 
         Returns:
             None: Apenas exibe os resultados das análises.
@@ -118,5 +198,5 @@ class MatrizRelacao:
             >>> analyzer.executar_matriz_relacao(limiar=0.6)
         """
         self.calcular_correlacoes()
-        self.obter_correlacoes_significativas(limiar)
-        self.visualizar_heatmap_correlacoes(limiar)
+        significativas = self.obter_correlacoes_significativas(limiar, alfa)
+        self.visualizar_heatmap_correlacoes(limiar, significativas)
@@ -0,0 +1,231 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+METODOS = ('pearson', 'spearman')
+
+
+def pearson(n: np.ndarray, soma: np.ndarray, soma_quadrados: np.ndarray,
+            soma_produtos: np.ndarray) -> np.ndarray:
+    """
+    Correlação de Pearson a partir dos co-momentos par a par (ver `CoMomentos`).
+
+    Aceita matrizes (colunas x colunas) ou pilhas delas (..., colunas, colunas), como as
+    de várias reamostras calculadas de uma vez.
+
+    Returns:
+        np.ndarray: Correlações, com 1 na diagonal e NaN nos pares sem linhas em comum
+        ou em que uma das colunas é constante, como em `DataFrame.corr()`.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariancia = soma_produtos - soma * np.swapaxes(soma, -1, -2) / n
+        variancia = soma_quadrados - soma ** 2 / n
+        denominador = np.sqrt(variancia * np.swapaxes(variancia, -1, -2))
+        r = np.where((n > 0) & (denominador > 0), covariancia / denominador, np.nan)
+    r = np.clip((r + np.swapaxes(r, -1, -2)) / 2, -1.0, 1.0)
+    diagonal = np.einsum('...ii->...i', r)
+    diagonal[...] = np.where(np.einsum('...ii->...i', variancia) > 0, 1.0, np.nan)
+    return r
+
+
+class CoMomentos:
+    """
+    Co-momentos de um conjunto de colunas numéricas, acumulados bloco a bloco.
+
+    Para cada par de colunas (i, j) são somados, sobre as linhas em que ambas têm valor:
+    o número de linhas, a soma e a soma dos quadrados de cada coluna e a soma dos
+    produtos. Cada bloco contribui com quatro produtos de matrizes (colunas x colunas),
+    de modo que a memória não depende do número de linhas, e acumuladores de blocos ou
+    processos diferentes são combinados somando as matrizes (`mesclar`). A correlação de
+    Pearson resultante é a mesma de `DataFrame.corr()`, inclusive no tratamento par a
+    par dos valores ausentes.
+
+    Os valores são deslocados por uma estimativa da média de cada coluna antes de
+    somados, o que evita a perda de precisão de `soma_produtos - soma * soma / n` quando
+    as médias são grandes em relação ao desvio padrão (ex.: 'Population', 'GDP').
+
+    Attributes:
+        colunas (pd.Index): Colunas acumuladas.
+        deslocamento (np.ndarray): Valor subtraído de cada coluna, ou None antes do primeiro bloco.
+        n (np.ndarray): Linhas com ambas as colunas preenchidas, por par.
+        soma (np.ndarray): soma[i, j] = soma de x_i nas linhas com x_i e x_j preenchidos.
+        soma_quadrados (np.ndarray): Idem, para x_i².
+        soma_produtos (np.ndarray): soma_produtos[i, j] = soma de x_i * x_j.
+    """
+
+    def __init__(self, colunas, deslocamento: np.ndarray = None):
+        """
+        Inicializa acumuladores zerados.
+
+        Args:
+            colunas (list | pd.Index): Colunas acumuladas, na ordem dos blocos.
+            deslocamento (np.ndarray, opcional): Valor subtraído de cada coluna. O padrão
+                (None) usa a média de cada coluna no primeiro bloco.
+        """
+        self.colunas = pd.Index(colunas)
+        k = len(self.colunas)
+        self.deslocamento = None if deslocamento is None else np.asarray(deslocamento, dtype=np.float64)
+        self.n = np.zeros((k, k), dtype=np.float64)
+        self.soma = np.zeros((k, k), dtype=np.float64)
+        self.soma_quadrados = np.zeros((k, k), dtype=np.float64)
+        self.soma_produtos = np.zeros((k, k), dtype=np.float64)
+
+    def atualizar(self, bloco) -> 'CoMomentos':
+        """
+        Incorpora um bloco de linhas.
+
+        Args:
+            bloco (pd.DataFrame | np.ndarray): Linhas com as colunas acumuladas, na mesma ordem.
+
+        Returns:
+            CoMomentos: A própria instância.
+        """
+        valores = bloco[self.colunas].to_numpy(dtype=np.float64) if isinstance(bloco, pd.DataFrame) \
+            else np.asarray(bloco, dtype=np.float64)
+        if not valores.size:
+            return self
+        validos = ~np.isnan(valores)
+        if self.deslocamento is None:
+            contagem = validos.sum(axis=0)
+            self.deslocamento = np.where(contagem > 0, np.nansum(valores, axis=0) / np.maximum(contagem, 1), 0.0)
+
+        centrados = np.where(validos, valores - self.deslocamento, 0.0)
+        mascara = validos.astype(np.float64)
+        self.n += mascara.T @ mascara
+        self.soma += centrados.T @ mascara
+        self.soma_quadrados += (centrados * centrados).T @ mascara
+        self.soma_produtos += centrados.T @ centrados
+        return self
+
+    def mesclar(self, outro: 'CoMomentos') -> 'CoMomentos':
+        """
+        Combina com os co-momentos de outro bloco ou processo.
+
+        Args:
+            outro (CoMomentos): Acumulador das mesmas colunas.
+
+        Returns:
+            CoMomentos: A própria instância.
+
+        Raises:
+            ValueError: Se as colunas forem diferentes.
+        """
+        if not self.colunas.equals(outro.colunas):
+            raise ValueError("❌ Só é possível mesclar co-momentos das mesmas colunas.")
+        if outro.deslocamento is None:
+            return self
+        if self.deslocamento is None:
+            self.deslocamento = outro.deslocamento.copy()
+
+        # Reescreve as somas do outro com o deslocamento deste: x - a = (x - b) + (b - a)
+        d = (outro.deslocamento - self.deslocamento)[:, None]
+        soma = outro.soma + d * outro.n
+        self.soma_quadrados += outro.soma_quadrados + 2 * d * outro.soma + d * d * outro.n
+        self.soma_produtos += outro.soma_produtos + d * outro.soma.T + d.T * outro.soma + d * d.T * outro.n
+        self.soma += soma
+        self.n += outro.n
+        return self
+
+    def correlacao(self) -> pd.DataFrame:
+        """
+        Matriz de correlação de Pearson dos dados acumulados.
+
+        Returns:
+            pd.DataFrame: Matriz simétrica; NaN nos pares sem linhas em comum ou em que
+            uma das colunas é constante, como em `DataFrame.corr()`.
+        """
+        r = pearson(self.n, self.soma, self.soma_quadrados, self.soma_produtos)
+        return pd.DataFrame(r, index=self.colunas, columns=self.colunas)
+
+
+def _comomentos_bloco(tarefa: tuple) -> CoMomentos:
+    """Co-momentos de um bloco, dentro de um processo do pool."""
+    valores, colunas, deslocamento = tarefa
+    return CoMomentos(colunas, deslocamento).atualizar(valores)
+
+
+def correlacionar(df: pd.DataFrame, metodo: str = 'pearson', tamanho_bloco: int = 100_000,
+                  n_workers: int = 1) -> pd.DataFrame:
+    """
+    Calcula a matriz de correlação das colunas numéricas acumulando co-momentos por bloco.
+
+    Os blocos de linhas são processados em paralelo quando `n_workers > 1` e os
+    acumuladores parciais são mesclados no fim. A correlação de Spearman é a de Pearson
+    dos postos de cada coluna. Com valores ausentes, os postos são calculados uma vez por
+    coluna, e não para cada par de colunas como no `DataFrame.corr(method='spearman')`.
+
+    Args:
+        df (pd.DataFrame): Dados analisados; só as colunas numéricas entram na matriz.
+        metodo (str, opcional): 'pearson' ou 'spearman'. O padrão é 'pearson'.
+        tamanho_bloco (int, opcional): Linhas por bloco. O padrão é 100.000.
+        n_workers (int, opcional): Número de processos. O padrão é 1.
+
+    Returns:
+        pd.DataFrame: Matriz de correlação.
+
+    Raises:
+        ValueError: Se o método for desconhecido ou `tamanho_bloco`/`n_workers` não forem
+            inteiros positivos.
+
+    Example:
+        >>> correlacionar(df, metodo='spearman', n_workers=4)
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"❌ Método de correlação desconhecido: '{metodo}'. Use um de {METODOS}.")
+    if not isinstance(tamanho_bloco, int) or tamanho_bloco <= 0:
+        raise ValueError("❌ O tamanho do bloco deve ser um inteiro positivo.")
+    if not isinstance(n_workers, int) or n_workers <= 0:
+        raise ValueError("❌ O número de workers deve ser um inteiro positivo.")
+
+    numericas = df.select_dtypes(include='number')
+    if metodo == 'spearman':
+        # Postos vetorizados por coluna (média nos empates); ausentes continuam ausentes
+        numericas = numericas.rank(method='average')
+    valores = numericas.to_numpy(dtype=np.float64)
+
+    # Um deslocamento comum a todos os blocos dispensa a conversão ao mesclar
+    acumulado = CoMomentos(numericas.columns).atualizar(valores[:tamanho_bloco])
+    tarefas = [(valores[inicio:inicio + tamanho_bloco], numericas.columns, acumulado.deslocamento)
+               for inicio in range(tamanho_bloco, len(valores), tamanho_bloco)]
+    if n_workers > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tarefas))) as executor:
+            parciais = list(executor.map(_comomentos_bloco, tarefas))
+    else:
+        parciais = [_comomentos_bloco(tarefa) for tarefa in tarefas]
+
+    for parcial in parciais:
+        acumulado.mesclar(parcial)
+    return acumulado.correlacao()
+
+
+def correlacionar_arquivo(origem: str, tamanho_bloco: int = 100_000, esquema: dict = None,
+                          colunas: list = None) -> pd.DataFrame:
+    """
+    Calcula a matriz de correlação de Pearson de um CSV ou de partições, sem carregá-los inteiros.
+
+    Cada bloco lido atualiza os co-momentos e é descartado. A correlação de Spearman não
+    está disponível aqui, porque os postos dependem da coluna inteira.
+
+    Args:
+        origem (str): Arquivo CSV, diretório ou padrão glob das partições.
+        tamanho_bloco (int, opcional): Linhas lidas por bloco. O padrão é 100.000.
+        esquema (dict, opcional): Mapa coluna -> dtype usado na leitura.
+        colunas (list, opcional): Colunas numéricas correlacionadas. O padrão (None) usa as
+            colunas numéricas do primeiro bloco.
+
+    Returns:
+        pd.DataFrame: Matriz de correlação.
+    """
+    from dataset.ingestao_particionada import eh_particionado, listar_particoes
+
+    acumulado = None
+    for caminho in (listar_particoes(origem) if eh_particionado(origem) else [origem]):
+        cabecalho = pd.read_csv(caminho, nrows=0).columns
+        dtypes = None if esquema is None else {col: tipo for col, tipo in esquema.items() if col in cabecalho}
+        with pd.read_csv(caminho, chunksize=tamanho_bloco, usecols=colunas, dtype=dtypes) as leitor:
+            for bloco in leitor:
+                if acumulado is None:
+                    acumulado = CoMomentos(colunas or bloco.select_dtypes(include='number').columns)
+                acumulado.atualizar(bloco)
+    return acumulado.correlacao()
@@ -1,5 +1,6 @@
 import pandas as pd
 import plotly.express as px
+from pipeline.copia import copia_preguicosa
 
 class VisualizacaoScaterPlot:
     """
@@ -31,7 +32,7 @@ class VisualizacaoScaterPlot:
         if not required_columns.issubset(df.columns):
             raise KeyError(f"❌ O DataFrame deve conter as colunas {required_columns} para a visualização.")
 
-        self.df = df.copy()  # Mantém os dados originais intactos
+        self.df = copia_preguicosa(df)  # Mantém os dados originais intactos
     
     def visualizar_correlacao_bmi_vida(self) -> None:
         """
@@ -1,5 +1,6 @@
 import pandas as pd
 import plotly.express as px
+from pipeline.copia import copia_preguicosa
 
 
 class TendenciaVariasVariaveis:
@@ -34,7 +35,7 @@ class TendenciaVariasVariaveis:
         if not required_columns.issubset(df.columns):
             raise KeyError(f"❌ O DataFrame deve conter as colunas {required_columns} para a visualização.")
 
-        self.df = df.copy()  # Mantém os dados originais intactos
+        self.df = copia_preguicosa(df)  # Mantém os dados originais intactos
         self.cols_to_inspect = [
             'Adult Mortality', 'infant deaths', 'Alcohol', 'percentage expenditure', 
             'Life expectancy ', 'Schooling', 'Income composition of resources', 
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+VERSAO_CACHE = 1
+
+
+def hash_conteudo(caminho: str, tamanho_bloco: int = 1 << 20) -> str:
+    """
+    Calcula o hash BLAKE2b do conteúdo de um arquivo, lendo-o em blocos.
+
+    Args:
+        caminho (str): Caminho do arquivo.
+        tamanho_bloco (int, opcional): Bytes lidos por vez. O padrão é 1 MB.
+
+    Returns:
+        str: Hash hexadecimal do conteúdo.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def chave_leitura(esquema: dict = None, colunas: list = None) -> str:
+    """
+    Gera uma chave estável para os parâmetros de leitura (esquema de tipos e colunas).
+
+    Args:
+        esquema (dict, opcional): Mapa coluna -> dtype usado na leitura.
+        colunas (list, opcional): Colunas carregadas.
+
+    Returns:
+        str: Hash hexadecimal dos parâmetros.
+    """
+    descricao = json.dumps(
+        {
+            'versao': VERSAO_CACHE,
+            'esquema': {col: str(tipo) for col, tipo in (esquema or {}).items()},
+            'colunas': list(colunas) if colunas is not None else None,
+        },
+        sort_keys=True,
+    )
+    return hashlib.blake2b(descricao.encode(), digest_size=20).hexdigest()
+
+
+def _gravar_valores(valores, diretorio: str, arquivo: str) -> dict:
+    """
+    Grava uma coluna (ou índice) em `.npy`, codificando textos e categorias como inteiros.
+
+    Args:
+        valores (pd.Series | pd.Index): Valores a gravar.
+        diretorio (str): Diretório de destino.
+        arquivo (str): Nome do arquivo `.npy`.
+
+    Returns:
+        dict: Descrição da coluna usada por `ler_colunas`.
+    """
+    descricao = {'arquivo': arquivo}
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        dados = np.asarray(valores.codes if isinstance(valores, pd.CategoricalIndex) else valores.cat.codes)
+        descricao.update(tipo='category', categorias=valores.dtype.categories.tolist())
+    elif pd.api.types.is_object_dtype(valores.dtype) or pd.api.types.is_string_dtype(valores.dtype):
+        codigos, categorias = pd.factorize(valores)
+        dados = codigos.astype(np.int32)
+        descricao.update(tipo='object', categorias=list(categorias))
+    else:
+        dados = valores.to_numpy()
+        descricao.update(tipo=str(valores.dtype))
+    np.save(os.path.join(diretorio, arquivo), dados)
+    return descricao
+
+
+def _ler_valores(diretorio: str, descricao: dict):
+    """Lê uma coluna gravada por `_gravar_valores`, mapeando-a em memória."""
+    # `np.asarray` remove a subclasse `memmap`, mantendo a visão sobre o arquivo mapeado
+    valores = np.asarray(np.load(os.path.join(diretorio, descricao['arquivo']), mmap_mode='c'))
+    if descricao['tipo'] == 'category':
+        return pd.Categorical.from_codes(valores, descricao['categorias'])
+    if descricao['tipo'] == 'object':
+        categorias = np.array(descricao['categorias'] + [np.nan], dtype=object)
+        return categorias[valores]
+    return valores
+
+
+def gravar_colunas(df: pd.DataFrame, diretorio: str) -> dict:
+    """
+    Grava cada coluna de `df` em um `.npy` próprio dentro de `diretorio`.
+
+    O índice é gravado apenas se não for o `RangeIndex` padrão (0..n-1).
+
+    Args:
+        df (pd.DataFrame): Dados a gravar.
+        diretorio (str): Diretório de destino, já existente.
+
+    Returns:
+        dict: Metadados ('linhas', 'colunas', 'indice') usados por `ler_colunas`.
+    """
+    colunas = []
+    for i, col in enumerate(df.columns):
+        descricao = _gravar_valores(df[col], diretorio, f"{i}.npy")
+        descricao['nome'] = col
+        colunas.append(descricao)
+
+    indice = None
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        indice = _gravar_valores(df.index, diretorio, 'indice.npy')
+        indice['nome'] = df.index.name
+    return {'linhas': len(df), 'colunas': colunas, 'indice': indice}
+
+
+def ler_colunas(diretorio: str, meta: dict) -> pd.DataFrame:
+    """
+    Lê um DataFrame gravado por `gravar_colunas`, com as colunas mapeadas em memória.
+
+    Args:
+        diretorio (str): Diretório com os arquivos `.npy`.
+        meta (dict): Metadados retornados por `gravar_colunas`.
+
+    Returns:
+        pd.DataFrame: Dados gravados.
+    """
+    dados = {descricao['nome']: _ler_valores(diretorio, descricao) for descricao in meta['colunas']}
+    if meta.get('indice') is None:
+        indice = pd.RangeIndex(meta['linhas'])
+    else:
+        indice = pd.Index(_ler_valores(diretorio, meta['indice']), name=meta['indice']['nome'])
+    return pd.DataFrame(dados, index=indice, columns=[d['nome'] for d in meta['colunas']], copy=False)
+
+
+class CacheColunar:
+    """
+    Cache binário colunar de um CSV, guardado ao lado do arquivo de origem.
+
+    Cada coluna é salva em um arquivo `.npy` próprio e lida com `np.load(mmap_mode='c')`,
+    isto é, mapeada em memória com cópia na escrita: apenas as páginas acessadas são
+    lidas do disco e alterações no DataFrame não chegam ao cache. Colunas textuais e
+    categóricas são guardadas como códigos inteiros, com as categorias no `meta.json`.
+
+    Cada CSV e cada combinação de parâmetros de leitura (`chave_leitura`) têm seu próprio
+    diretório, validado pelo hash do conteúdo do CSV. O nome do diretório leva o nome do
+    arquivo e um hash do seu caminho absoluto, de modo que partições homônimas em pastas
+    diferentes (ex.: `ano=2000/regiao_A.csv` e `ano=2001/regiao_A.csv`) não compartilham
+    o cache quando `diretorio_cache` é comum a todas. Para não recalcular o hash a cada leitura, o tamanho e a data de modificação
+    do CSV também são guardados: se não mudaram, o cache é considerado válido; se mudaram,
+    o hash é recalculado e o cache é reconstruído apenas se o conteúdo mudou de fato.
+
+    Attributes:
+        caminho (str): Caminho do CSV de origem.
+        chave (str): Chave dos parâmetros de leitura.
+        diretorio (str): Diretório do cache deste CSV e destes parâmetros.
+    """
+
+    def __init__(self, caminho: str, chave: str, diretorio_cache: str = None):
+        """
+        Inicializa o cache de um CSV.
+
+        Args:
+            caminho (str): Caminho do CSV de origem.
+            chave (str): Chave dos parâmetros de leitura (`chave_leitura`).
+            diretorio_cache (str, opcional): Diretório base dos caches. O padrão (None)
+                usa a pasta `.cache` ao lado do CSV.
+        """
+        if not isinstance(caminho, str):
+            raise TypeError("❌ O caminho do arquivo deve ser uma string.")
+
+        self.caminho = caminho
+        self.chave = chave
+        base = diretorio_cache or os.path.join(os.path.dirname(os.path.abspath(caminho)), '.cache')
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        origem = hashlib.blake2b(os.path.abspath(caminho).encode(), digest_size=6).hexdigest()
+        self.diretorio = os.path.join(base, f"{nome}.{origem}.{chave[:16]}.colunar")
+
+    def _meta(self) -> dict:
+        """Lê o `meta.json` do cache, ou retorna None se não houver cache legível."""
+        try:
+            with open(os.path.join(self.diretorio, 'meta.json'), encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return None
+
+    def valido(self) -> bool:
+        """
+        Verifica se o cache corresponde ao conteúdo atual do CSV.
+
+        Returns:
+            bool: True se o cache pode ser usado.
+        """
+        meta = self._meta()
+        if meta is None or meta.get('versao') != VERSAO_CACHE or meta.get('chave') != self.chave:
+            return False
+
+        estado = os.stat(self.caminho)
+        if meta['tamanho'] == estado.st_size and meta['mtime_ns'] == estado.st_mtime_ns:
+            return True
+        if meta['tamanho'] != estado.st_size or hash_conteudo(self.caminho) != meta['hash']:
+            return False
+
+        # Conteúdo igual com data de modificação nova: só atualiza os metadados
+        meta['mtime_ns'] = estado.st_mtime_ns
+        self._gravar_meta(self.diretorio, meta)
+        return True
+
+    @staticmethod
+    def _gravar_meta(diretorio: str, meta: dict) -> None:
+        """Grava o `meta.json` de forma atômica."""
+        temporario = os.path.join(diretorio, 'meta.json.tmp')
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(meta, arquivo, ensure_ascii=False)
+        os.replace(temporario, os.path.join(diretorio, 'meta.json'))
+
+    def salvar(self, df: pd.DataFrame) -> None:
+        """
+        Grava o DataFrame no cache, substituindo o cache anterior.
+
+        A gravação é feita num diretório temporário, renomeado ao final, para que uma
+        interrupção não deixe um cache parcial.
+
+        Args:
+            df (pd.DataFrame): Dados lidos do CSV.
+        """
+        estado = os.stat(self.caminho)
+        temporario = f"{self.diretorio}.tmp{os.getpid()}"
+        shutil.rmtree(temporario, ignore_errors=True)
+        os.makedirs(temporario)
+
+        self._gravar_meta(temporario, {
+            'versao': VERSAO_CACHE,
+            'chave': self.chave,
+            'hash': hash_conteudo(self.caminho),
+            'tamanho': estado.st_size,
+            'mtime_ns': estado.st_mtime_ns,
+            **gravar_colunas(df, temporario),
+        })
+
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+        os.replace(temporario, self.diretorio)
+
+    def carregar(self) -> pd.DataFrame:
+        """
+        Lê o DataFrame do cache, com as colunas numéricas mapeadas em memória.
+
+        Returns:
+            pd.DataFrame: Dados equivalentes aos lidos do CSV.
+        """
+        return ler_colunas(self.diretorio, self._meta())
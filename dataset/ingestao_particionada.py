@@ -0,0 +1,224 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from dataset.cache_colunar import CacheColunar, chave_leitura
+from dataset.perfil_streaming import PerfilStreaming
+
+
+def ler_csv_tipado(caminho: str, esquema: dict = None, colunas: list = None) -> pd.DataFrame:
+    """
+    Lê um CSV aplicando o esquema de tipos e a seleção de colunas, se houver.
+
+    Args:
+        caminho (str): Caminho do arquivo CSV.
+        esquema (dict, opcional): Mapa coluna -> dtype. Entradas de colunas ausentes no
+            arquivo (ou fora de `colunas`) são ignoradas.
+        colunas (list, opcional): Colunas a carregar (`usecols`).
+
+    Returns:
+        pd.DataFrame: Dados carregados.
+    """
+    if esquema is None:
+        return pd.read_csv(caminho, usecols=colunas)
+
+    # Aplica apenas as entradas do esquema cujas colunas serão carregadas
+    cabecalho = pd.read_csv(caminho, nrows=0).columns
+    presentes = set(cabecalho if colunas is None else colunas)
+    dtypes = {col: tipo for col, tipo in esquema.items() if col in presentes}
+    return pd.read_csv(caminho, usecols=colunas, dtype=dtypes)
+
+
+def eh_particionado(origem: str) -> bool:
+    """
+    Indica se `origem` é um diretório ou um padrão glob, e não um único arquivo.
+
+    Args:
+        origem (str): Caminho ou padrão informado ao leitor.
+
+    Returns:
+        bool: True se `origem` descreve um conjunto de partições.
+    """
+    return os.path.isdir(origem) or glob.has_magic(origem)
+
+
+def listar_particoes(origem: str) -> list:
+    """
+    Lista, em ordem alfabética, os CSVs de um diretório ou de um padrão glob.
+
+    Args:
+        origem (str): Diretório (todos os `*.csv` dele) ou padrão glob.
+
+    Returns:
+        list: Caminhos das partições.
+
+    Raises:
+        FileNotFoundError: Se nenhuma partição for encontrada.
+    """
+    padrao = os.path.join(origem, '*.csv') if os.path.isdir(origem) else origem
+    caminhos = sorted(glob.glob(padrao))
+    if not caminhos:
+        raise FileNotFoundError(f"❌ Nenhuma partição encontrada em '{origem}'.")
+    return caminhos
+
+
+def _ler_particao(tarefa: tuple):
+    """
+    Lê uma partição dentro de um processo do pool.
+
+    Com cache, a partição é gravada (ou validada) no seu `CacheColunar` e nada é devolvido:
+    o processo principal a lê mapeada em memória, sem serializar o DataFrame entre
+    processos. Sem cache, o DataFrame lido é devolvido.
+
+    Args:
+        tarefa (tuple): (caminho, esquema, colunas, usar_cache, diretorio_cache).
+
+    Returns:
+        pd.DataFrame | None: Dados da partição, ou None quando o cache foi usado.
+    """
+    caminho, esquema, colunas, usar_cache, diretorio_cache = tarefa
+    if not usar_cache:
+        return ler_csv_tipado(caminho, esquema, colunas)
+
+    cache = CacheColunar(caminho, chave_leitura(esquema, colunas), diretorio_cache)
+    if not cache.valido():
+        cache.salvar(ler_csv_tipado(caminho, esquema, colunas))
+    return None
+
+
+def _perfilar_particao(tarefa: tuple) -> PerfilStreaming:
+    """
+    Monta o perfil em blocos de uma partição dentro de um processo do pool.
+
+    Args:
+        tarefa (tuple): (caminho, tamanho_bloco, esquema, colunas).
+
+    Returns:
+        PerfilStreaming: Perfil da partição.
+    """
+    caminho, tamanho_bloco, esquema, colunas = tarefa
+    return PerfilStreaming(caminho, tamanho_bloco, esquema, colunas).processar()
+
+
+def _mapear(funcao, tarefas: list, n_workers: int) -> list:
+    """Aplica `funcao` às tarefas, em um pool de processos quando `n_workers > 1`."""
+    if n_workers > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tarefas))) as executor:
+            return list(executor.map(funcao, tarefas))
+    return [funcao(tarefa) for tarefa in tarefas]
+
+
+def verificar_esquemas(partes: list, caminhos: list) -> None:
+    """
+    Confere se todas as partições têm as mesmas colunas, na mesma ordem, e tipos compatíveis.
+
+    Tipos numéricos diferentes (ex.: int64 numa partição e float64 noutra, quando só uma
+    tem valores ausentes) são compatíveis e são promovidos na concatenação.
+
+    Args:
+        partes (list): DataFrames das partições.
+        caminhos (list): Caminhos correspondentes, usados nas mensagens de erro.
+
+    Raises:
+        ValueError: Se alguma partição divergir da primeira.
+    """
+    referencia = partes[0]
+    for parte, caminho in zip(partes[1:], caminhos[1:]):
+        if list(parte.columns) != list(referencia.columns):
+            raise ValueError(f"❌ As colunas de '{caminho}' diferem das de '{caminhos[0]}': "
+                             f"{sorted(set(parte.columns) ^ set(referencia.columns))}.")
+        for col in referencia.columns:
+            tipo_ref, tipo = referencia[col].dtype, parte[col].dtype
+            numericos = pd.api.types.is_numeric_dtype(tipo_ref) and pd.api.types.is_numeric_dtype(tipo)
+            categoricos = isinstance(tipo_ref, pd.CategoricalDtype) and isinstance(tipo, pd.CategoricalDtype)
+            if tipo_ref != tipo and not numericos and not categoricos:
+                raise ValueError(f"❌ A coluna '{col}' de '{caminho}' tem tipo {tipo}, "
+                                 f"mas {tipo_ref} em '{caminhos[0]}'.")
+
+
+def concatenar_particoes(partes: list) -> pd.DataFrame:
+    """
+    Concatena as partições de uma só vez, unificando as categorias das colunas categóricas.
+
+    Args:
+        partes (list): DataFrames das partições, com o mesmo esquema.
+
+    Returns:
+        pd.DataFrame: Dados de todas as partições, com índice 0..n-1.
+    """
+    if len(partes) == 1:
+        return partes[0]
+
+    categoricas = [col for col in partes[0].columns if isinstance(partes[0][col].dtype, pd.CategoricalDtype)]
+    if categoricas:
+        partes = [parte.copy(deep=False) for parte in partes]
+        for col in categoricas:
+            categorias = union_categoricals([parte[col] for parte in partes]).categories
+            for parte in partes:
+                parte[col] = parte[col].cat.set_categories(categorias)
+    return pd.concat(partes, ignore_index=True)
+
+
+def ler_particoes(origem: str, esquema: dict = None, colunas: list = None, n_workers: int = 1,
+                  usar_cache: bool = False, diretorio_cache: str = None) -> pd.DataFrame:
+    """
+    Lê todas as partições de `origem` em paralelo e as concatena uma única vez.
+
+    Args:
+        origem (str): Diretório ou padrão glob das partições.
+        esquema (dict, opcional): Mapa coluna -> dtype aplicado a cada partição.
+        colunas (list, opcional): Colunas a carregar.
+        n_workers (int, opcional): Número de processos de leitura. O padrão é 1.
+        usar_cache (bool, opcional): Se True, cada partição tem seu `CacheColunar`, e
+            apenas as partições novas ou alteradas são lidas do CSV. O padrão é False.
+        diretorio_cache (str, opcional): Diretório base dos caches.
+
+    Returns:
+        pd.DataFrame: Dados concatenados na ordem alfabética das partições.
+
+    Raises:
+        FileNotFoundError: Se nenhuma partição for encontrada.
+        ValueError: Se os esquemas das partições divergirem ou se duas partições
+            resolverem para o mesmo diretório de cache.
+    """
+    caminhos = listar_particoes(origem)
+    if usar_cache:
+        chave = chave_leitura(esquema, colunas)
+        caches = [CacheColunar(caminho, chave, diretorio_cache) for caminho in caminhos]
+        # Duas partições no mesmo diretório de cache se sobrescreveriam em silêncio
+        if len({cache.diretorio for cache in caches}) != len(caches):
+            raise ValueError("❌ Partições diferentes resolveram para o mesmo diretório de cache.")
+
+    tarefas = [(caminho, esquema, colunas, usar_cache, diretorio_cache) for caminho in caminhos]
+    partes = _mapear(_ler_particao, tarefas, n_workers)
+    if usar_cache:
+        partes = [cache.carregar() for cache in caches]
+
+    verificar_esquemas(partes, caminhos)
+    return concatenar_particoes(partes)
+
+
+def perfilar_particoes(origem: str, tamanho_bloco: int = 100_000, esquema: dict = None,
+                       colunas: list = None, n_workers: int = 1) -> PerfilStreaming:
+    """
+    Monta o perfil em blocos de cada partição em paralelo e combina os perfis.
+
+    Args:
+        origem (str): Diretório ou padrão glob das partições.
+        tamanho_bloco (int, opcional): Linhas por bloco. O padrão é 100.000.
+        esquema (dict, opcional): Mapa coluna -> dtype aplicado a cada partição.
+        colunas (list, opcional): Colunas a ler.
+        n_workers (int, opcional): Número de processos. O padrão é 1.
+
+    Returns:
+        PerfilStreaming: Perfil combinado de todas as partições.
+    """
+    caminhos = listar_particoes(origem)
+    perfis = _mapear(_perfilar_particao, [(c, tamanho_bloco, esquema, colunas) for c in caminhos], n_workers)
+    perfil = perfis[0]
+    for outro in perfis[1:]:
+        perfil.mesclar(outro)
+    return perfil
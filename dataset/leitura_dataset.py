@@ -1,5 +1,72 @@
+import sys
+import time
+
+import numpy as np
 import pandas as pd
 
+from dataset.cache_colunar import CacheColunar, chave_leitura
+from dataset.ingestao_particionada import eh_particionado, ler_csv_tipado, ler_particoes, perfilar_particoes
+from dataset.painel_cubo import PainelCubo
+from dataset.perfil_streaming import PerfilStreaming
+
+# Esquema do dataset de expectativa de vida da OMS (nomes de colunas como no CSV original).
+# As chaves textuais viram categorias; os indicadores usam float32, cuja precisão (~7 dígitos
+# significativos) é suficiente para eles. 'Population' passa de 2^24 e permanece float64.
+# Contagens ficam em float32 (exatas até 16.777.216) para tolerar valores ausentes.
+ESQUEMA_OMS = {
+    'Country': 'category',
+    'Year': 'int16',
+    'Status': 'category',
+    'Life expectancy ': 'float32',
+    'Adult Mortality': 'float32',
+    'infant deaths': 'float32',
+    'Alcohol': 'float32',
+    'percentage expenditure': 'float32',
+    'Hepatitis B': 'float32',
+    'Measles ': 'float32',
+    ' BMI ': 'float32',
+    'under-five deaths ': 'float32',
+    'Polio': 'float32',
+    'Total expenditure': 'float32',
+    'Diphtheria ': 'float32',
+    ' HIV/AIDS': 'float32',
+    'GDP': 'float32',
+    'Population': 'float64',
+    ' thinness  1-19 years': 'float32',
+    ' thinness 5-9 years': 'float32',
+    'Income composition of resources': 'float32',
+    'Schooling': 'float32',
+}
+
+
+def estimar_memoria_sem_esquema(df: pd.DataFrame) -> int:
+    """
+    Estima, em bytes, a memória que o DataFrame ocuparia se lido sem esquema.
+
+    Sem esquema, o Pandas usa 8 bytes por valor numérico e um objeto `str` por valor textual.
+    Para colunas categóricas, o custo de cada categoria como string é multiplicado pelo
+    número de ocorrências, o que evita reler o arquivo apenas para medir.
+
+    Args:
+        df (pd.DataFrame): DataFrame carregado com esquema.
+
+    Returns:
+        int: Estimativa da memória, em bytes, incluindo o índice.
+    """
+    total = int(df.index.memory_usage(deep=True))
+    for col in df.columns:
+        serie = df[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            custo = np.array([sys.getsizeof(str(c)) for c in serie.cat.categories], dtype=np.int64)
+            codigos = serie.cat.codes.to_numpy()
+            total += int(custo[codigos[codigos >= 0]].sum()) + 8 * len(serie)
+        elif pd.api.types.is_numeric_dtype(serie.dtype):
+            total += 8 * len(serie)
+        else:
+            total += int(serie.memory_usage(deep=True, index=False))
+    return total
+
+
 class LeitorDataset:
     """
     Classe para leitura e análise exploratória de datasets CSV.
@@ -12,19 +79,32 @@ class LeitorDataset:
     - Identificação de valores ausentes.
     - Visualização das primeiras linhas do dataset para uma inspeção rápida.
 
+    A leitura pode seguir um esquema de tipos (ex.: `ESQUEMA_OMS`), com categorias para as
+    chaves textuais e float32 para os indicadores, e carregar apenas as colunas necessárias,
+    reduzindo a memória ocupada pelo DataFrame.
+
     Attributes:
-        caminho (str): Caminho do arquivo CSV.
+        caminho (str): Caminho do arquivo CSV, ou diretório/padrão glob de partições.
         df (pd.DataFrame): DataFrame Pandas contendo os dados carregados.
+        esquema (dict): Mapa coluna -> dtype usado na leitura, ou None.
+        colunas (list): Colunas carregadas, ou None para todas.
+        cache (CacheColunar): Cache colunar em disco do CSV, ou None se desativado.
+        perfil (PerfilStreaming): Perfil calculado em blocos, no modo streaming, ou None.
+        particionado (bool): Indica se `caminho` descreve um conjunto de partições.
+        n_workers (int): Número de processos usados para ler partições.
 
     Methods:
-        __init__(caminho): Inicializa a classe e carrega o arquivo CSV.
+        __init__(caminho, esquema=None, colunas=None, usar_cache=False, diretorio_cache=None,
+                 streaming=False, tamanho_bloco=100_000, n_workers=1): Inicializa a classe e carrega o arquivo CSV.
         informacoes(): Exibe detalhes sobre o número de linhas, colunas e tipos de dados do dataset.
         estatisticas(): Retorna estatísticas descritivas das colunas numéricas.
         registros_faltantes(): Identifica valores ausentes no dataset.
         primeiras_linhas(linhas=5): Exibe as primeiras linhas do dataset para uma visualização inicial.
     """
 
-    def __init__(self, caminho: str) -> None:
+    def __init__(self, caminho: str, esquema: dict = None, colunas: list = None,
+                 usar_cache: bool = False, diretorio_cache: str = None, streaming: bool = False,
+                 tamanho_bloco: int = 100_000, n_workers: int = 1) -> None:
         """
         Inicializa a classe e carrega um arquivo CSV em um DataFrame do Pandas.
 
@@ -33,8 +113,37 @@ class LeitorDataset:
         mensagem de confirmação é exibida. Caso ocorra um erro, a exceção é capturada
         e uma mensagem de erro é exibida.
 
+        Quando `esquema` é informado, cada coluna é lida diretamente no dtype declarado
+        (colunas fora do esquema seguem a inferência do Pandas) e a memória antes e depois
+        do esquema é exibida.
+
+        `caminho` também pode ser um diretório (todos os `*.csv` dele) ou um padrão glob
+        (ex.: "dados/ano=*/regiao_*.csv"), para dados entregues em partições por ano e
+        região. As partições são lidas em paralelo por `n_workers` processos, seus esquemas
+        são conferidos entre si e o resultado é concatenado uma única vez, na ordem
+        alfabética dos arquivos. Com `usar_cache`, cada partição tem seu próprio cache, e
+        apenas as partições novas ou alteradas voltam a ser lidas do CSV.
+
         Args:
-            caminho (str): Caminho do arquivo CSV que será carregado.
+            caminho (str): Caminho do arquivo CSV que será carregado, ou diretório/padrão
+                glob das partições.
+            esquema (dict, opcional): Mapa coluna -> dtype, como `ESQUEMA_OMS`. O padrão
+                (None) mantém a inferência de tipos do Pandas.
+            colunas (list, opcional): Colunas a carregar (`usecols`). O padrão (None)
+                carrega todas.
+            usar_cache (bool, opcional): Se True, mantém um cache binário colunar do CSV
+                (`CacheColunar`), identificado pelo hash do conteúdo e pelos parâmetros de
+                leitura. As leituras seguintes usam o cache, mapeado em memória, e ele é
+                reconstruído automaticamente quando o CSV muda. O padrão é False.
+            diretorio_cache (str, opcional): Diretório base do cache. O padrão (None) usa
+                a pasta `.cache` ao lado do CSV.
+            streaming (bool, opcional): Se True, o arquivo não é carregado: ele é lido em
+                blocos de `tamanho_bloco` linhas para montar um `PerfilStreaming`, e
+                `executar_leitura` exibe o mesmo relatório a partir dele. Útil para
+                perfilar arquivos maiores que a memória. O padrão é False.
+            tamanho_bloco (int, opcional): Linhas por bloco no modo streaming. O padrão é 100.000.
+            n_workers (int, opcional): Número de processos usados para ler (ou perfilar)
+                partições. O padrão é 1.
 
         Returns:
             None: O método apenas inicializa a instância da classe.
@@ -43,30 +152,148 @@ class LeitorDataset:
             FileNotFoundError: Se o arquivo especificado não for encontrado.
             pd.errors.EmptyDataError: Se o arquivo CSV estiver vazio.
             pd.errors.ParserError: Se houver erro ao interpretar o arquivo CSV.
+            ValueError: Se as partições tiverem esquemas divergentes.
             Exception: Para qualquer outro erro inesperado.
 
         Example:
             >>> leitor = LeitorDataset("dados.csv")
             ✅ Arquivo 'dados.csv' carregado com sucesso!
 
+        Com esquema de tipos:
+
+            >>> leitor = LeitorDataset("dataset_LE.csv", esquema=ESQUEMA_OMS)
+            ✅ Arquivo 'dataset_LE.csv' carregado com sucesso!
+            💾 Memória: 0.82 MB sem esquema -> 0.25 MB com esquema (redução de 69.1%).
+
         Se o arquivo não for encontrado:
 
             >>> leitor = CSVReader("arquivo_inexistente.csv")
             ❌ Erro ao carregar o arquivo: [Errno 2] No such file or directory: 'arquivo_inexistente.csv'
         """
         self.caminho = caminho
+        self.esquema = esquema
+        self.colunas = colunas
+        self.particionado = eh_particionado(caminho)
+        self.n_workers = n_workers
+        self.usar_cache = usar_cache
+        self.diretorio_cache = diretorio_cache
+        self.cache = None
+        if usar_cache and not self.particionado:
+            self.cache = CacheColunar(caminho, chave_leitura(esquema, colunas), diretorio_cache)
+        self.df = None
+        self.perfil = None
         try:
-            self.df = pd.read_csv(caminho)
+            if streaming:
+                if self.particionado:
+                    self.perfil = perfilar_particoes(caminho, tamanho_bloco, esquema, colunas, n_workers)
+                else:
+                    self.perfil = PerfilStreaming(caminho, tamanho_bloco, esquema, colunas).processar()
+                print(f"✅ Arquivo '{caminho}' perfilado em blocos de {tamanho_bloco} linhas!")
+                return
+            self.df = self._carregar()
             print(f"✅ Arquivo '{caminho}' carregado com sucesso!")
+            if esquema is not None:
+                self.relatorio_memoria()
         except FileNotFoundError:
             print(f"❌ Erro: O arquivo '{caminho}' não foi encontrado.")
         except pd.errors.EmptyDataError:
             print(f"❌ Erro: O arquivo '{caminho}' está vazio.")
         except pd.errors.ParserError:
             print(f"❌ Erro: O arquivo '{caminho}' não pôde ser interpretado corretamente.")
+        except ValueError as e:
+            # Ex.: partições com esquemas divergentes
+            print(e)
         except Exception as e:
             print(f"❌ Erro ao carregar o arquivo: {e}")
 
+    def _carregar(self) -> pd.DataFrame:
+        """
+        Carrega os dados do cache colunar, se válido, ou do CSV, atualizando o cache.
+
+        Returns:
+            pd.DataFrame: Dados carregados.
+        """
+        if self.particionado:
+            inicio = time.perf_counter()
+            df = ler_particoes(self.caminho, self.esquema, self.colunas, self.n_workers,
+                               self.usar_cache, self.diretorio_cache)
+            print(f"🧩 Partições lidas com {self.n_workers} processo(s) em "
+                  f"{1000 * (time.perf_counter() - inicio):.1f} ms.")
+            return df
+
+        if self.cache is None:
+            return self._ler_csv()
+
+        inicio = time.perf_counter()
+        if self.cache.valido():
+            df = self.cache.carregar()
+            print(f"⚡ Dados lidos do cache colunar em {1000 * (time.perf_counter() - inicio):.1f} ms.")
+            return df
+
+        df = self._ler_csv()
+        self.cache.salvar(df)
+        print(f"💾 CSV lido e cache colunar reconstruído em {1000 * (time.perf_counter() - inicio):.1f} ms.")
+        return df
+
+    def _ler_csv(self) -> pd.DataFrame:
+        """
+        Lê o CSV aplicando o esquema de tipos e a seleção de colunas, se houver.
+
+        Returns:
+            pd.DataFrame: Dados carregados.
+        """
+        return ler_csv_tipado(self.caminho, self.esquema, self.colunas)
+
+    def relatorio_memoria(self) -> dict:
+        """
+        Exibe e retorna a memória do DataFrame carregado e a estimativa sem esquema.
+
+        Returns:
+            dict: {'sem_esquema_mb': float, 'com_esquema_mb': float, 'reducao_pct': float}.
+
+        Raises:
+            AttributeError: Se o DataFrame (`self.df`) não estiver carregado corretamente.
+
+        Example:
+            >>> leitor = LeitorDataset("dataset_LE.csv", esquema=ESQUEMA_OMS)
+            >>> leitor.relatorio_memoria()
+            💾 Memória: 0.82 MB sem esquema -> 0.25 MB com esquema (redução de 69.1%).
+        """
+        if not hasattr(self, 'df') or self.df is None:
+            raise AttributeError("❌ O DataFrame não foi carregado. Certifique-se de que o arquivo CSV foi lido corretamente.")
+
+        antes = estimar_memoria_sem_esquema(self.df) / 1024 ** 2
+        depois = self.df.memory_usage(deep=True).sum() / 1024 ** 2
+        reducao = 100 * (1 - depois / antes) if antes else 0.0
+        print(f"💾 Memória: {antes:.2f} MB sem esquema -> {depois:.2f} MB com esquema (redução de {reducao:.1f}%).")
+        return {'sem_esquema_mb': antes, 'com_esquema_mb': depois, 'reducao_pct': reducao}
+
+    def construir_painel(self, caminho: str = None) -> PainelCubo:
+        """
+        Constrói o painel país × ano × indicador mapeado em memória a partir dos dados lidos.
+
+        Args:
+            caminho (str, opcional): Arquivo `.f32` do painel. O padrão (None) usa um
+                arquivo temporário, removido quando o painel é coletado.
+
+        Returns:
+            PainelCubo: Painel com um array float32 (países, anos, indicadores).
+
+        Raises:
+            AttributeError: Se o DataFrame (`self.df`) não estiver carregado corretamente.
+
+        Example:
+            >>> leitor = LeitorDataset("dataset_LE.csv", esquema=ESQUEMA_OMS)
+            >>> painel = leitor.construir_painel("dataset/.cache/painel.f32")
+            🧊 Painel 193 países × 16 anos × 19 indicadores gravado em 'dataset/.cache/painel.f32'.
+            >>> painel.por_indicador('Life expectancy ').shape
+            (193, 16)
+        """
+        if not hasattr(self, 'df') or self.df is None:
+            raise AttributeError("❌ O DataFrame não foi carregado. Certifique-se de que o arquivo CSV foi lido corretamente.")
+
+        return PainelCubo.de_dataframe(self.df, caminho)
+
     def informacoes(self) -> None:
         """
         Exibe informações gerais sobre o dataset, incluindo número de linhas, colunas e tipos de dados.
@@ -250,6 +477,8 @@ class LeitorDataset:
         3. Identifica e exibe valores ausentes (`registros_faltantes()`).
         4. Apresenta uma amostra inicial do dataset (`primeiras_linhas()`).
 
+        No modo streaming, o relatório vem do `PerfilStreaming` e nenhum DataFrame é retornado.
+
         Returns:
             None: O método apenas exibe as informações no console.
 
@@ -281,6 +510,10 @@ class LeitorDataset:
             0  João     28       SP   4000.0
             1  Maria    34       RJ   3500.0
         """
+        if self.perfil is not None:
+            self.perfil.executar_perfil()
+            return None
+
         # Verifica se o DataFrame foi carregado corretamente antes de executar os métodos
         if not hasattr(self, 'df') or self.df is None:
             raise AttributeError("❌ O DataFrame não foi carregado. Certifique-se de que o arquivo CSV foi lido corretamente.")
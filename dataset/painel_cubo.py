@@ -0,0 +1,240 @@
+import json
+import os
+import tempfile
+import weakref
+
+import numpy as np
+import pandas as pd
+
+
+def _remover_arquivos(*caminhos: str) -> None:
+    """Remove arquivos, ignorando os que já não existem ou não podem ser removidos."""
+    for caminho in caminhos:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+
+class PainelCubo:
+    """
+    Painel denso país × ano × indicador, em float32 e mapeado em memória.
+
+    O DataFrame em formato longo é reorganizado uma única vez num array
+    `(países, anos, indicadores)`, gravado em disco com `np.memmap`; combinações
+    (país, ano) ausentes no DataFrame ficam NaN. Os mapas de índice (países, anos e
+    indicadores) ficam num arquivo JSON ao lado do array, de modo que o painel pode ser
+    reaberto por outros processos com `PainelCubo.abrir`, sem reler o CSV.
+
+    As fatias por país, ano ou indicador devolvem visões do array mapeado (sem cópia),
+    evitando reordenar e reagrupar o DataFrame a cada etapa.
+
+    Attributes:
+        caminho (str): Caminho do arquivo `.f32` com os dados do cubo.
+        paises (list): Países, na ordem do primeiro eixo.
+        anos (list): Anos, na ordem do segundo eixo.
+        indicadores (list): Indicadores, na ordem do terceiro eixo.
+        dados (np.memmap): Array `(len(paises), len(anos), len(indicadores))`.
+    """
+
+    def __init__(self, caminho: str, paises: list, anos: list, indicadores: list, modo: str = 'r'):
+        """
+        Abre um cubo já gravado em disco.
+
+        Prefira `PainelCubo.de_dataframe` para criar o cubo e `PainelCubo.abrir` para
+        reabri-lo a partir do arquivo de metadados.
+
+        Args:
+            caminho (str): Caminho do arquivo `.f32` com os dados.
+            paises (list): Países, na ordem do primeiro eixo.
+            anos (list): Anos, na ordem do segundo eixo.
+            indicadores (list): Indicadores, na ordem do terceiro eixo.
+            modo (str, opcional): Modo do `np.memmap` ('r', 'r+' ou 'c'). O padrão é 'r'.
+        """
+        self.caminho = caminho
+        self.paises = list(paises)
+        self.anos = [int(ano) for ano in anos]
+        self.indicadores = list(indicadores)
+        self._pos_pais = {pais: i for i, pais in enumerate(self.paises)}
+        self._pos_ano = {ano: i for i, ano in enumerate(self.anos)}
+        self._pos_indicador = {nome: i for i, nome in enumerate(self.indicadores)}
+        self.dados = np.memmap(caminho, dtype=np.float32, mode=modo,
+                               shape=(len(self.paises), len(self.anos), len(self.indicadores)))
+
+    @classmethod
+    def de_dataframe(cls, df: pd.DataFrame, caminho: str = None, indicadores: list = None,
+                     coluna_pais: str = 'Country', coluna_ano: str = 'Year') -> 'PainelCubo':
+        """
+        Constrói o cubo a partir de um DataFrame em formato longo.
+
+        Args:
+            df (pd.DataFrame): Dados com uma linha por (país, ano).
+            caminho (str, opcional): Arquivo `.f32` de destino. O padrão (None) cria um
+                arquivo temporário, que vive enquanto o cubo devolvido existir: ele e o
+                JSON de metadados são removidos quando o cubo é coletado ou ao fim do
+                processo. Informe `caminho` para manter o painel em disco e reabri-lo
+                com `PainelCubo.abrir`.
+            indicadores (list, opcional): Colunas que formam o terceiro eixo. O padrão
+                (None) usa todas as colunas numéricas, exceto a de ano.
+            coluna_pais (str, opcional): Coluna com o país. O padrão é 'Country'.
+            coluna_ano (str, opcional): Coluna com o ano. O padrão é 'Year'.
+
+        Returns:
+            PainelCubo: Cubo gravado em disco e aberto para leitura.
+
+        Raises:
+            TypeError: Se `df` não for um DataFrame.
+            KeyError: Se as colunas de país ou ano não existirem.
+            ValueError: Se houver mais de uma linha para o mesmo (país, ano).
+
+        Example:
+            >>> cubo = PainelCubo.de_dataframe(df, "dataset/.cache/painel.f32")
+            >>> cubo.serie('Brazil', 'Life expectancy ')
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
+        for col in (coluna_pais, coluna_ano):
+            if col not in df.columns:
+                raise KeyError(f"❌ O DataFrame deve conter a coluna '{col}' para montar o painel.")
+
+        if indicadores is None:
+            indicadores = [col for col in df.select_dtypes(include='number').columns if col != coluna_ano]
+
+        validas = (df[coluna_pais].notna() & df[coluna_ano].notna()).to_numpy()
+        codigos_pais, paises = pd.factorize(df.loc[validas, coluna_pais], sort=True)
+        codigos_ano, anos = pd.factorize(df.loc[validas, coluna_ano], sort=True)
+
+        celula = codigos_pais.astype(np.int64) * len(anos) + codigos_ano
+        if np.unique(celula).size != celula.size:
+            raise ValueError(f"❌ Há mais de uma linha para o mesmo ({coluna_pais}, {coluna_ano}).")
+
+        temporario = caminho is None
+        if temporario:
+            descritor, caminho = tempfile.mkstemp(suffix='.f32', prefix='painel_')
+            os.close(descritor)
+        forma = (len(paises), len(anos), len(indicadores))
+        dados = np.memmap(caminho, dtype=np.float32, mode='w+', shape=forma)
+        dados[:] = np.nan
+        # Uma única escrita vetorizada: cada linha do DataFrame vai para a sua célula (país, ano)
+        dados.reshape(-1, len(indicadores))[celula] = df.loc[validas, indicadores].to_numpy(dtype=np.float32)
+        dados.flush()
+        del dados
+
+        cubo = cls(caminho, [str(p) for p in paises], anos.tolist(), indicadores)
+        cubo.salvar_metadados()
+        if temporario:
+            # Visões já devolvidas seguem válidas: o mapeamento sobrevive à remoção do arquivo
+            weakref.finalize(cubo, _remover_arquivos, caminho, cls.caminho_metadados(caminho))
+        print(f"🧊 Painel {forma[0]} países × {forma[1]} anos × {forma[2]} indicadores gravado em '{caminho}'.")
+        return cubo
+
+    @staticmethod
+    def caminho_metadados(caminho: str) -> str:
+        """Retorna o caminho do JSON de metadados de um cubo."""
+        return os.path.splitext(caminho)[0] + '.json'
+
+    def salvar_metadados(self) -> None:
+        """Grava os mapas de índice do cubo ao lado do arquivo de dados."""
+        with open(self.caminho_metadados(self.caminho), 'w', encoding='utf-8') as arquivo:
+            json.dump({'paises': self.paises, 'anos': self.anos, 'indicadores': self.indicadores},
+                      arquivo, ensure_ascii=False)
+
+    @classmethod
+    def abrir(cls, caminho: str, modo: str = 'r') -> 'PainelCubo':
+        """
+        Reabre um cubo gravado por `de_dataframe`.
+
+        Args:
+            caminho (str): Caminho do arquivo `.f32`.
+            modo (str, opcional): Modo do `np.memmap`. O padrão é 'r'.
+
+        Returns:
+            PainelCubo: Cubo mapeado em memória.
+        """
+        with open(cls.caminho_metadados(caminho), encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+        return cls(caminho, meta['paises'], meta['anos'], meta['indicadores'], modo)
+
+    def _posicoes(self, valores, mapa: dict, eixo: str):
+        """Converte rótulos em posições; None seleciona o eixo inteiro."""
+        if valores is None:
+            return slice(None)
+        if np.isscalar(valores):
+            valores = [valores]
+        try:
+            return np.array([mapa[valor] for valor in valores], dtype=np.intp)
+        except KeyError as erro:
+            raise KeyError(f"❌ {eixo} não encontrado no painel: {erro.args[0]!r}.") from None
+
+    def serie(self, pais: str, indicador: str) -> np.ndarray:
+        """
+        Série temporal de um indicador num país (visão, sem cópia).
+
+        Args:
+            pais (str): País.
+            indicador (str): Indicador.
+
+        Returns:
+            np.ndarray: Valores por ano, na ordem de `anos`.
+        """
+        return self.dados[self._posicoes(pais, self._pos_pais, 'País')[0], :,
+                          self._posicoes(indicador, self._pos_indicador, 'Indicador')[0]]
+
+    def por_pais(self, pais: str) -> np.ndarray:
+        """Matriz anos × indicadores de um país (visão, sem cópia)."""
+        return self.dados[self._posicoes(pais, self._pos_pais, 'País')[0]]
+
+    def por_ano(self, ano: int) -> np.ndarray:
+        """Matriz países × indicadores de um ano (visão, sem cópia)."""
+        return self.dados[:, self._posicoes(ano, self._pos_ano, 'Ano')[0]]
+
+    def por_indicador(self, indicador: str) -> np.ndarray:
+        """Matriz países × anos de um indicador (visão, sem cópia)."""
+        return self.dados[:, :, self._posicoes(indicador, self._pos_indicador, 'Indicador')[0]]
+
+    def fatia(self, paises: list = None, anos: list = None, indicadores: list = None) -> np.ndarray:
+        """
+        Sub-cubo para listas de países, anos e indicadores.
+
+        Eixos omitidos (None) são mantidos inteiros. Sem nenhum filtro, o resultado é o
+        próprio array mapeado; eixos filtrados por listas usam indexação avançada, e o
+        NumPy copia os elementos selecionados. Para visões sem cópia, use `serie`,
+        `por_pais`, `por_ano` e `por_indicador`.
+
+        Args:
+            paises (list, opcional): Países selecionados.
+            anos (list, opcional): Anos selecionados.
+            indicadores (list, opcional): Indicadores selecionados.
+
+        Returns:
+            np.ndarray: Array `(países, anos, indicadores)` com a seleção.
+        """
+        eixos = [
+            self._posicoes(paises, self._pos_pais, 'País'),
+            self._posicoes(anos, self._pos_ano, 'Ano'),
+            self._posicoes(indicadores, self._pos_indicador, 'Indicador'),
+        ]
+        resultado = self.dados
+        for eixo, posicoes in enumerate(eixos):
+            if not isinstance(posicoes, slice):
+                resultado = np.take(resultado, posicoes, axis=eixo)
+        return resultado
+
+    def para_dataframe(self, indicadores: list = None) -> pd.DataFrame:
+        """
+        Reconstrói o formato longo (uma linha por país e ano com algum valor observado).
+
+        Args:
+            indicadores (list, opcional): Indicadores incluídos. O padrão (None) inclui todos.
+
+        Returns:
+            pd.DataFrame: Colunas 'Country', 'Year' e os indicadores.
+        """
+        nomes = self.indicadores if indicadores is None else list(indicadores)
+        valores = self.fatia(indicadores=nomes).reshape(-1, len(nomes))
+        observadas = ~np.isnan(self.dados).all(axis=2).ravel()
+        pais, ano = np.divmod(np.flatnonzero(observadas), len(self.anos))
+        df = pd.DataFrame(valores[observadas], columns=nomes)
+        df.insert(0, 'Year', np.asarray(self.anos)[ano])
+        df.insert(0, 'Country', pd.Categorical.from_codes(pais, self.paises))
+        return df
@@ -0,0 +1,408 @@
+import numpy as np
+import pandas as pd
+
+
+class EsbocoQuantis:
+    """
+    Esboço de quantis aproximados, de memória limitada e combinável.
+
+    Os valores entram no nível 0. Quando um nível passa de `capacidade` itens, ele é
+    ordenado e metade dos itens (posições pares ou ímpares, escolhidas ao acaso) sobe para o
+    nível seguinte, onde cada item passa a representar o dobro de observações. O erro de
+    posição de um quantil fica em torno de log2(n / capacidade) / capacidade. Enquanto
+    nenhuma compactação acontece, os quantis são exatos e iguais aos do `describe()`.
+
+    Attributes:
+        capacidade (int): Número máximo de itens por nível.
+        niveis (list): Itens de cada nível; itens do nível i pesam 2**i.
+    """
+
+    def __init__(self, capacidade: int = 4096, semente: int = 0):
+        """
+        Inicializa um esboço vazio.
+
+        Args:
+            capacidade (int, opcional): Número máximo de itens por nível. O padrão é 4096.
+            semente (int, opcional): Semente do sorteio das compactações. O padrão é 0.
+        """
+        if not isinstance(capacidade, int) or capacidade < 2:
+            raise ValueError("❌ A capacidade do esboço deve ser um inteiro maior que 1.")
+
+        self.capacidade = capacidade
+        self.niveis = [np.empty(0)]
+        self._rng = np.random.default_rng(semente)
+
+    def adicionar(self, valores: np.ndarray) -> None:
+        """
+        Adiciona valores (sem NaN) ao esboço.
+
+        Args:
+            valores (np.ndarray): Valores observados.
+        """
+        self.niveis[0] = np.concatenate([self.niveis[0], np.asarray(valores, dtype=np.float64)])
+        self._compactar()
+
+    def mesclar(self, outro: 'EsbocoQuantis') -> None:
+        """
+        Incorpora os itens de outro esboço, nível a nível.
+
+        Args:
+            outro (EsbocoQuantis): Esboço construído sobre outra parte dos dados.
+        """
+        for nivel, itens in enumerate(outro.niveis):
+            if nivel == len(self.niveis):
+                self.niveis.append(np.empty(0))
+            self.niveis[nivel] = np.concatenate([self.niveis[nivel], itens])
+        self._compactar()
+
+    def _compactar(self) -> None:
+        """Promove metade dos itens de cada nível cheio para o nível seguinte."""
+        nivel = 0
+        while nivel < len(self.niveis):
+            itens = self.niveis[nivel]
+            if itens.size > self.capacidade:
+                itens = np.sort(itens)
+                resto = np.empty(0)
+                if itens.size % 2:
+                    # Um item sorteado permanece no nível para que a contagem feche
+                    sorteado = self._rng.integers(itens.size)
+                    resto = itens[sorteado:sorteado + 1]
+                    itens = np.delete(itens, sorteado)
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append(np.empty(0))
+                promovidos = itens[self._rng.integers(2)::2]
+                self.niveis[nivel + 1] = np.concatenate([self.niveis[nivel + 1], promovidos])
+                self.niveis[nivel] = resto
+            nivel += 1
+
+    def quantis(self, qs) -> np.ndarray:
+        """
+        Estima quantis dos valores adicionados.
+
+        Args:
+            qs (list): Quantis desejados, entre 0 e 1.
+
+        Returns:
+            np.ndarray: Estimativas, ou NaN se o esboço estiver vazio.
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if len(self.niveis) == 1:
+            if self.niveis[0].size == 0:
+                return np.full(qs.shape, np.nan)
+            return np.quantile(self.niveis[0], qs)
+
+        valores = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(itens.size, 2.0 ** nivel) for nivel, itens in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind='stable')
+        valores, pesos = valores[ordem], pesos[ordem]
+        # Cada item ocupa o centro do intervalo de posições que representa
+        centros = np.cumsum(pesos) - pesos / 2
+        return np.interp(qs * pesos.sum(), centros, valores)
+
+
+class AcumuladorColuna:
+    """
+    Estatísticas de uma coluna acumuladas bloco a bloco e combináveis entre partes.
+
+    Média e variância são combinadas pela fórmula de Chan et al., numericamente estável;
+    os quartis vêm de um `EsbocoQuantis`.
+
+    Attributes:
+        dtype (np.dtype): Tipo combinado dos blocos, como o Pandas inferiria no arquivo inteiro.
+        nao_nulos (int): Número de valores não nulos.
+        nulos (int): Número de valores nulos.
+        media (float): Média dos valores numéricos.
+        m2 (float): Soma dos quadrados dos desvios em relação à média.
+        minimo (float): Menor valor numérico.
+        maximo (float): Maior valor numérico.
+        esboco (EsbocoQuantis): Esboço dos quantis.
+    """
+
+    def __init__(self, capacidade_esboco: int = 4096):
+        """
+        Inicializa um acumulador vazio.
+
+        Args:
+            capacidade_esboco (int, opcional): Capacidade do esboço de quantis. O padrão é 4096.
+        """
+        self.dtype = None
+        self.nao_nulos = 0
+        self.nulos = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self.esboco = EsbocoQuantis(capacidade_esboco)
+
+    @property
+    def numerica(self) -> bool:
+        """Indica se a coluna é numérica (exclui booleanos, como o `describe()`)."""
+        return self.dtype is not None and self.dtype.kind in 'iuf'
+
+    def _combinar_dtype(self, dtype) -> None:
+        """Combina o tipo de um bloco com o tipo acumulado."""
+        if self.dtype is None or self.dtype == dtype:
+            self.dtype = dtype
+        elif isinstance(dtype, pd.CategoricalDtype) and isinstance(self.dtype, pd.CategoricalDtype):
+            # Cada bloco tem suas próprias categorias; a coluna continua categórica
+            self.dtype = pd.CategoricalDtype()
+        elif isinstance(dtype, np.dtype) and isinstance(self.dtype, np.dtype) \
+                and self.dtype.kind in 'iuf' and dtype.kind in 'iuf':
+            self.dtype = np.result_type(self.dtype, dtype)
+        else:
+            self.dtype = np.dtype(object)
+
+    def _combinar_momentos(self, n: int, media: float, m2: float, minimo: float, maximo: float) -> None:
+        """Combina os momentos de uma parte dos dados com os acumulados."""
+        if n == 0:
+            return
+        total = self.nao_nulos + n
+        delta = media - self.media
+        self.m2 += m2 + delta ** 2 * self.nao_nulos * n / total
+        self.media += delta * n / total
+        self.nao_nulos = total
+        self.minimo = min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+
+    def atualizar(self, serie: pd.Series) -> None:
+        """
+        Incorpora um bloco da coluna.
+
+        Args:
+            serie (pd.Series): Valores da coluna no bloco.
+        """
+        self._combinar_dtype(serie.dtype)
+        ausentes = int(serie.isna().sum())
+        self.nulos += ausentes
+
+        if not (isinstance(serie.dtype, np.dtype) and serie.dtype.kind in 'iuf'):
+            self.nao_nulos += len(serie) - ausentes
+            return
+
+        valores = serie.to_numpy(dtype=np.float64)
+        valores = valores[~np.isnan(valores)]
+        if valores.size:
+            media = valores.mean()
+            self._combinar_momentos(valores.size, media, float(((valores - media) ** 2).sum()),
+                                    valores.min(), valores.max())
+            self.esboco.adicionar(valores)
+
+    def mesclar(self, outro: 'AcumuladorColuna') -> None:
+        """
+        Incorpora o acumulador de outra parte dos dados.
+
+        Args:
+            outro (AcumuladorColuna): Acumulador da mesma coluna em outra parte.
+        """
+        if outro.dtype is not None:
+            self._combinar_dtype(outro.dtype)
+        self.nulos += outro.nulos
+        if outro.numerica:
+            self._combinar_momentos(outro.nao_nulos, outro.media, outro.m2, outro.minimo, outro.maximo)
+            self.esboco.mesclar(outro.esboco)
+        else:
+            self.nao_nulos += outro.nao_nulos
+
+    def descrever(self) -> list:
+        """
+        Retorna as estatísticas na ordem do `describe()`.
+
+        Returns:
+            list: [count, mean, std, min, 25%, 50%, 75%, max].
+        """
+        if self.nao_nulos == 0:
+            return [0.0] + [np.nan] * 7
+        std = np.sqrt(self.m2 / (self.nao_nulos - 1)) if self.nao_nulos > 1 else np.nan
+        q1, q2, q3 = self.esboco.quantis([0.25, 0.5, 0.75])
+        return [float(self.nao_nulos), self.media, std, self.minimo, q1, q2, q3, self.maximo]
+
+
+class PerfilStreaming:
+    """
+    Perfil de um CSV construído em uma única passada, lendo o arquivo em blocos.
+
+    Gera o mesmo relatório de `LeitorDataset.executar_leitura` (informações, estatísticas
+    descritivas, valores ausentes e primeiras linhas) sem manter o arquivo inteiro em
+    memória: cada bloco atualiza acumuladores combináveis (`AcumuladorColuna`) e é
+    descartado. Contagens, média, desvio padrão, mínimo e máximo são exatos; os quartis
+    são aproximados (`EsbocoQuantis`) quando a coluna tem mais valores que a capacidade
+    do esboço. Perfis de partes diferentes podem ser combinados com `mesclar`.
+
+    Attributes:
+        caminho (str): Caminho do arquivo CSV.
+        tamanho_bloco (int): Número de linhas lidas por bloco.
+        linhas (int): Número total de linhas lidas.
+        memoria_bytes (int): Soma da memória dos blocos, como o DataFrame completo ocuparia.
+        acumuladores (dict): Acumulador de cada coluna, na ordem do arquivo.
+        amostra (pd.DataFrame): Primeiras linhas do arquivo.
+    """
+
+    def __init__(self, caminho: str, tamanho_bloco: int = 100_000, esquema: dict = None,
+                 colunas: list = None, capacidade_esboco: int = 4096, linhas_amostra: int = 20):
+        """
+        Inicializa o perfil de um CSV.
+
+        Args:
+            caminho (str): Caminho do arquivo CSV.
+            tamanho_bloco (int, opcional): Linhas lidas por bloco. O padrão é 100.000.
+            esquema (dict, opcional): Mapa coluna -> dtype usado na leitura.
+            colunas (list, opcional): Colunas a ler (`usecols`). O padrão (None) lê todas.
+            capacidade_esboco (int, opcional): Capacidade dos esboços de quantis. O padrão é 4096.
+            linhas_amostra (int, opcional): Linhas guardadas para `primeiras_linhas`. O padrão é 20.
+        """
+        if not isinstance(tamanho_bloco, int) or tamanho_bloco <= 0:
+            raise ValueError("❌ O tamanho do bloco deve ser um inteiro positivo.")
+
+        self.caminho = caminho
+        self.tamanho_bloco = tamanho_bloco
+        self.esquema = esquema
+        self.colunas = colunas
+        self.capacidade_esboco = capacidade_esboco
+        self.linhas_amostra = linhas_amostra
+        self.linhas = 0
+        self.memoria_bytes = 0
+        self.acumuladores = {}
+        self.amostra = None
+
+    def processar(self) -> 'PerfilStreaming':
+        """
+        Lê o CSV em blocos e atualiza os acumuladores.
+
+        Returns:
+            PerfilStreaming: A própria instância.
+        """
+        leitor = pd.read_csv(self.caminho, chunksize=self.tamanho_bloco, usecols=self.colunas,
+                             dtype=self.esquema)
+        with leitor:
+            for bloco in leitor:
+                self.atualizar(bloco)
+        return self
+
+    def atualizar(self, bloco: pd.DataFrame) -> None:
+        """
+        Incorpora um bloco de linhas ao perfil.
+
+        Args:
+            bloco (pd.DataFrame): Linhas consecutivas do arquivo.
+        """
+        if self.amostra is None:
+            self.amostra = bloco.head(self.linhas_amostra).copy()
+        elif len(self.amostra) < self.linhas_amostra:
+            self.amostra = pd.concat([self.amostra, bloco.head(self.linhas_amostra - len(self.amostra))],
+                                     ignore_index=True)
+
+        self.linhas += len(bloco)
+        self.memoria_bytes += int(bloco.memory_usage(deep=True, index=False).sum())
+        for col in bloco.columns:
+            if col not in self.acumuladores:
+                self.acumuladores[col] = AcumuladorColuna(self.capacidade_esboco)
+            self.acumuladores[col].atualizar(bloco[col])
+
+    def mesclar(self, outro: 'PerfilStreaming') -> None:
+        """
+        Incorpora o perfil de outra parte dos dados (lida depois desta).
+
+        Args:
+            outro (PerfilStreaming): Perfil de outra parte dos dados.
+        """
+        self.linhas += outro.linhas
+        self.memoria_bytes += outro.memoria_bytes
+        if self.amostra is None:
+            self.amostra = outro.amostra
+        for col, acumulador in outro.acumuladores.items():
+            if col not in self.acumuladores:
+                self.acumuladores[col] = AcumuladorColuna(self.capacidade_esboco)
+            self.acumuladores[col].mesclar(acumulador)
+
+    def tabela_estatisticas(self) -> pd.DataFrame:
+        """
+        Monta a tabela de estatísticas descritivas das colunas numéricas.
+
+        Returns:
+            pd.DataFrame: Tabela no formato do `describe()`.
+        """
+        numericas = {col: ac.descrever() for col, ac in self.acumuladores.items() if ac.numerica}
+        return pd.DataFrame(numericas, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+    def contagem_ausentes(self) -> pd.Series:
+        """
+        Retorna a contagem de valores ausentes por coluna.
+
+        Returns:
+            pd.Series: Número de valores nulos de cada coluna.
+        """
+        return pd.Series({col: ac.nulos for col, ac in self.acumuladores.items()}, dtype='int64')
+
+    def informacoes(self) -> None:
+        """
+        Exibe número de linhas, colunas, contagens de não nulos, tipos e memória estimada.
+        """
+        print("\n📌 Informações do Dataset (leitura em blocos):")
+        print(f"RangeIndex: {self.linhas} entries, 0 to {self.linhas - 1}")
+        print(f"Data columns (total {len(self.acumuladores)} columns):")
+        tabela = pd.DataFrame({
+            'Column': list(self.acumuladores),
+            'Non-Null Count': [f"{ac.nao_nulos} non-null" for ac in self.acumuladores.values()],
+            'Dtype': [str(ac.dtype) for ac in self.acumuladores.values()],
+        })
+        print(tabela.to_string())
+        tipos = tabela['Dtype'].value_counts().sort_index()
+        print("dtypes: " + ", ".join(f"{tipo}({n})" for tipo, n in tipos.items()))
+        print(f"memory usage: {self.memoria_bytes / 1024 ** 2:.1f} MB")
+
+    def estatisticas(self) -> None:
+        """
+        Exibe as estatísticas descritivas das colunas numéricas.
+        """
+        print("\n📊 Estatísticas Descritivas:")
+        tabela = self.tabela_estatisticas()
+        if tabela.empty:
+            print("❌ Nenhuma coluna numérica encontrada no dataset.")
+        else:
+            print(tabela)
+
+    def registros_faltantes(self) -> None:
+        """
+        Exibe a contagem de valores ausentes das colunas que os possuem.
+        """
+        print("\n🔍 Valores Ausentes:")
+        ausentes = self.contagem_ausentes()
+        if ausentes.any():
+            print(ausentes[ausentes > 0])
+        else:
+            print("✅ Nenhum valor ausente encontrado!")
+
+    def primeiras_linhas(self, linhas: int = 5) -> None:
+        """
+        Exibe as primeiras linhas guardadas durante a leitura.
+
+        Args:
+            linhas (int, opcional): Número de linhas a exibir (até `linhas_amostra`). O padrão é 5.
+
+        Raises:
+            ValueError: Se o número de linhas for menor que 1 ou maior que `linhas_amostra`.
+        """
+        if linhas < 1 or linhas > self.linhas_amostra:
+            raise ValueError(f"❌ O número de linhas deve estar entre 1 e {self.linhas_amostra}.")
+
+        print(f"\n Visualização das {linhas} primeiras linhas do dataset:")
+        print(self.amostra.head(linhas))
+
+    def executar_perfil(self) -> 'PerfilStreaming':
+        """
+        Lê o CSV em blocos e exibe o relatório completo.
+
+        Returns:
+            PerfilStreaming: A própria instância, com os acumuladores preenchidos.
+
+        Example:
+            >>> perfil = PerfilStreaming("exportacao_grande.csv", tamanho_bloco=500_000)
+            >>> perfil.executar_perfil()
+        """
+        if not self.acumuladores:
+            self.processar()
+        self.informacoes()
+        self.estatisticas()
+        self.registros_faltantes()
+        self.primeiras_linhas()
+        return self
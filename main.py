@@ -1,149 +1,465 @@
+import argparse
+import sys
+
 from dataset.leitura_dataset import LeitorDataset
-from modelos.modelagaem_expectativa_vida import ExpectativaVidaMLP
-from analise_exploratoria.consumo_alcool import ConsumoAlcool
-from analise_exploratoria.correlacao_mapa import MatrizRelacao
-from analise_exploratoria.expectativa_scaterplot import VisualizacaoScaterPlot
-from analise_exploratoria.tendencia_varias_variaveis import TendenciaVariasVariaveis
-from analise_exploratoria.visualizacao_expectativa_vida import VisualizadorExpectativaVida
-from preprocessamento.analise.dataframe_final import DataFrameFinal
-from preprocessamento.analise.duplicatas import Duplicatas
-from preprocessamento.analise.valores_ausentes import AnaliseValoresAusentes
-from preprocessamento.limpeza.colunas_redundantes import RemovendoColunas
-from preprocessamento.limpeza.limpeza_dataset import PreenchendoKNN
-from preprocessamento.outliers.outliers import Outlier
+from pipeline.agendador import Agendador, Etapa, GrafoEtapas
+from pipeline.checkpoint import CacheEtapas
+from pipeline.copia import ativar_copy_on_write
+from pipeline.instrumentacao import Instrumentador
+
+# As classes das etapas são importadas dentro dos métodos que as usam: TensorFlow, Plotly,
+# seaborn, matplotlib, SciPy e scikit-learn só são carregados quando a etapa que precisa
+# deles roda. Assim, um job só de pré-processamento ou só de análise exploratória começa
+# sem esperar pelas bibliotecas das outras etapas (ver `pipeline/tempo_importacao.py`).
+
+
+CAMINHO_PADRAO = "OMS/dataset/dataset_LE.csv"
+
+
+CAMINHO_PROJECAO = ".cache/modelos/projecao_pca.npz"
 
+# Maior lacuna, em anos, interpolada antes do KNN; lacunas maiores ficam para o KNN
+LACUNA_MAXIMA_PADRAO = 3
 
 
 class Principal:
-    def __init__(self):
-        leitor_df = LeitorDataset("OMS/dataset/dataset_LE.csv")
+    def __init__(self, caminho: str = CAMINHO_PADRAO, ler: bool = True, variancia_pca: float = None,
+                 lacuna_maxima: int = LACUNA_MAXIMA_PADRAO, fundido: bool = False):
+        # Com o Copy-on-Write, as etapas compartilham as versões do DataFrame e só copiam
+        # as colunas que alteram (ver `pipeline/copia.py`)
+        ativar_copy_on_write()
+        self.caminho = caminho
+        # Fração da variância mantida pela projeção PCA antes da rede neural (None: sem PCA)
+        self.variancia_pca = variancia_pca
+        # Com lacunas interpoladas antes do KNN, os outliers não interpolam os ausentes
+        # originais (0: comportamento anterior, tudo interpolado no tratamento de outliers)
+        self.lacuna_maxima = lacuna_maxima
+        # Se True, outliers e imputação rodam numa única etapa (`TratamentoFundido`)
+        self.fundido = fundido
+        self.df = None
+        if ler:
+            self.ler_dados()
+
+    def ler_dados(self):
+        leitor_df = LeitorDataset(self.caminho, usar_cache=True)
         self.df = leitor_df.executar_leitura()
-    
-    def duplicatas(self):
-        dupli = Duplicatas(self.df)
+        return self.df
+
+    # As etapas recebem o DataFrame que devem ler. Sem argumento, usam e atualizam `self.df`,
+    # como antes; com argumento (uso pelo agendador), apenas retornam o resultado.
+
+    def duplicatas(self, df=None):
+        from preprocessamento.analise.duplicatas import Duplicatas
+        dupli = Duplicatas(self.df if df is None else df)
         dupli.executar_analise_duplicatas()
     
-    def valores_nulos(self):
-        valor_n = AnaliseValoresAusentes(self.df)
+    def valores_nulos(self, df=None):
+        from preprocessamento.analise.valores_ausentes import AnaliseValoresAusentes
+        valor_n = AnaliseValoresAusentes(self.df if df is None else df)
         valor_n.executar_analise_valores_ausentes()
 
-    def outliers(self):
-        outli = Outlier(self.df)
-        self.df = outli.executar_outliers()
+    def outliers(self, df=None):
+        from preprocessamento.outliers.outliers import Outlier
+        outli = Outlier(self.df if df is None else df, interpolar_ausentes=self.lacuna_maxima == 0)
+        resultado = outli.executar_outliers()
+        if df is None:
+            self.df = resultado
+        return resultado
     
-    def preencher_valor_ausente(self):
-        valor_ause = PreenchendoKNN(self.df)
-        self.df = valor_ause.executar_limpeza_dados()
+    def preencher_valor_ausente(self, df=None):
+        from preprocessamento.limpeza.limpeza_dataset import PreenchendoKNN
+        valor_ause = PreenchendoKNN(self.df if df is None else df, lacuna_maxima=self.lacuna_maxima)
+        resultado = valor_ause.executar_limpeza_dados()
+        if df is None:
+            self.df = resultado
+        return resultado
     
-    def dataframefinal(self):
-        final = DataFrameFinal(self.df)
-        self.df = final.executar_analise_dataframe_final()
+    def outliers_e_valores_ausentes(self, df=None):
+        from preprocessamento.limpeza.tratamento_fundido import TratamentoFundido
+        fundido = TratamentoFundido(self.df if df is None else df, lacuna_maxima=self.lacuna_maxima)
+        resultado = fundido.executar_tratamento_fundido()
+        if df is None:
+            self.df = resultado
+        return resultado
+
+    def dataframefinal(self, df=None):
+        from preprocessamento.analise.dataframe_final import DataFrameFinal
+        final = DataFrameFinal(self.df if df is None else df)
+        resultado = final.executar_analise_dataframe_final()
+        if df is None:
+            self.df = resultado
+        return resultado
 
-    def visualizar_expectativa_vida(self):
-        visualizar = VisualizadorExpectativaVida(self.df)
+    def visualizar_expectativa_vida(self, df=None):
+        from analise_exploratoria.visualizacao_expectativa_vida import VisualizadorExpectativaVida
+        visualizar = VisualizadorExpectativaVida(self.df if df is None else df)
         visualizar.executar_visualizacao_tendencia_vida()
     
-    def tendencia_variavel(self):
-        tendencia = TendenciaVariasVariaveis(self.df)
+    def tendencia_variavel(self, df=None):
+        from analise_exploratoria.tendencia_varias_variaveis import TendenciaVariasVariaveis
+        tendencia = TendenciaVariasVariaveis(self.df if df is None else df)
         tendencia.executar_visualizacao_varias_variaveis()
     
-    def consumo_alcool(self):
-        alcool = ConsumoAlcool(self.df)
+    def consumo_alcool(self, df=None):
+        from analise_exploratoria.consumo_alcool import ConsumoAlcool
+        alcool = ConsumoAlcool(self.df if df is None else df)
         alcool.executar_visualizacao_consumo_alcool()
     
-    def scatter_plot(self):
-        scatter = VisualizacaoScaterPlot(self.df)
+    def scatter_plot(self, df=None):
+        from analise_exploratoria.expectativa_scaterplot import VisualizacaoScaterPlot
+        scatter = VisualizacaoScaterPlot(self.df if df is None else df)
         scatter.executar_visualizar_correlacao_bmi_vida()
     
-    def matriz_relacao(self):
-        matriz = MatrizRelacao(self.df)
+    def matriz_relacao(self, df=None):
+        from analise_exploratoria.correlacao_mapa import MatrizRelacao
+        matriz = MatrizRelacao(self.df if df is None else df)
         matriz.executar_matriz_relacao()
     
-    def colunas_redundantes(self):
-        colunas = RemovendoColunas(self.df)
-        self.df = colunas.executar_remover_colunas()
+    def colunas_redundantes(self, df=None):
+        from preprocessamento.limpeza.colunas_redundantes import RemovendoColunas
+        colunas = RemovendoColunas(self.df if df is None else df)
+        resultado = colunas.executar_remover_colunas()
+        if df is None:
+            self.df = resultado
+        return resultado
     
-    def rede_neural(self):
-        rede = ExpectativaVidaMLP(self.df)
+    def rede_neural(self, df=None):
+        from modelos.modelagaem_expectativa_vida import ExpectativaVidaMLP
+        rede = ExpectativaVidaMLP(self.df if df is None else df, reducao=self.variancia_pca,
+                                  caminho_projecao=CAMINHO_PROJECAO if self.variancia_pca else None)
         rede.executar_pipeline()
 
-    def executar_tudo(self):
+    def etapas(self) -> list:
+        """
+        Declara as etapas do pipeline e as versões do DataFrame que cada uma lê e produz.
+
+        Versões: 'bruto' (dados lidos) -> 'sem_outliers' -> 'imputado' -> 'final'
+        -> 'sem_redundantes'. As análises de 'bruto' rodam em paralelo com o tratamento de
+        outliers, e as cinco visualizações rodam em paralelo assim que 'final' fica pronta.
+
+        Por padrão, o tratamento de outliers e a imputação KNN são duas etapas ('outliers' e
+        'preencher_valor_ausente'), o que permite inspecionar ou retomar a partir de
+        'sem_outliers'. Com `fundido=True`, ambas dão lugar à etapa
+        'outliers_e_valores_ausentes' (`TratamentoFundido`), que produz 'imputado' direto de
+        'bruto' com uma única cópia das colunas numéricas; a versão 'sem_outliers' deixa de
+        existir.
+
+        Returns:
+            list: Lista de `Etapa`, na ordem de apresentação.
+        """
+        if self.fundido:
+            tratamento = [
+                Etapa('outliers_e_valores_ausentes', self.outliers_e_valores_ausentes, le='bruto', produz='imputado',
+                      codigo=('preprocessamento.limpeza.tratamento_fundido', 'preprocessamento.outliers.detectores'),
+                      parametros={'lacuna_maxima': self.lacuna_maxima},
+                      descricao="🚀 Tratando outliers e preenchendo valores ausentes numa única etapa..."),
+            ]
+        else:
+            tratamento = [
+                Etapa('outliers', self.outliers, le='bruto', produz='sem_outliers', codigo=('preprocessamento.outliers.outliers',),
+                      parametros={'interpolar_ausentes': self.lacuna_maxima == 0},
+                      descricao="🚀 Detectando e tratando outliers..."),
+                Etapa('preencher_valor_ausente', self.preencher_valor_ausente, le='sem_outliers', produz='imputado',
+                      codigo=('preprocessamento.limpeza.limpeza_dataset',), parametros={'lacuna_maxima': self.lacuna_maxima},
+                      descricao="🛠️ Preenchendo valores ausentes com KNN..."),
+            ]
+        return [
+            Etapa('duplicatas', self.duplicatas, le='bruto',
+                  descricao="🔍 Analisando duplicatas..."),
+            Etapa('valores_nulos', self.valores_nulos, le='bruto',
+                  descricao="📊 Analisando valores nulos..."),
+            *tratamento,
+            # Relatório que repassa o DataFrame: um acerto de cache não exibiria nada
+            Etapa('dataframefinal', self.dataframefinal, le='imputado', produz='final', memorizar=False,
+                  codigo=('preprocessamento.analise.dataframe_final',), descricao="✅ Exibindo análise final do DataFrame..."),
+            Etapa('visualizar_expectativa_vida', self.visualizar_expectativa_vida, le='final',
+                  descricao="📈 Visualizando tendência da expectativa de vida..."),
+            Etapa('tendencia_variavel', self.tendencia_variavel, le='final',
+                  descricao="📊 Analisando tendências de múltiplas variáveis..."),
+            Etapa('consumo_alcool', self.consumo_alcool, le='final',
+                  descricao="🥂 Visualizando consumo de álcool e impacto na expectativa de vida..."),
+            Etapa('scatter_plot', self.scatter_plot, le='final',
+                  descricao="📉 Gerando Scatter Plot (Correlação BMI vs Expectativa de Vida)..."),
+            # O heatmap usa matplotlib, que não é seguro entre threads
+            Etapa('matriz_relacao', self.matriz_relacao, le='final', principal=True,
+                  descricao="📊 Criando Matriz de Correlação..."),
+            Etapa('colunas_redundantes', self.colunas_redundantes, le='final', produz='sem_redundantes',
+                  codigo=('preprocessamento.limpeza.colunas_redundantes', 'preprocessamento.limpeza.selecao_colunas'),
+                  descricao="🗑️ Removendo colunas redundantes..."),
+            Etapa('rede_neural', self.rede_neural, le='sem_redundantes',
+                  descricao="🤖 Iniciando treinamento da Rede Neural para previsão de Expectativa de Vida..."),
+        ]
+
+    def planejar(self, etapas: list = None, de: str = None, ate: str = None, retomar_de: str = None,
+                 usar_cache: bool = True, diretorio_cache: str = '.cache/etapas') -> tuple:
+        """
+        Valida a seleção de etapas e monta o grafo executado, sem executar nenhuma etapa.
+
+        Com `retomar_de`, confere também que os checkpoints das etapas anteriores
+        necessárias existem, para que o erro apareça antes de qualquer processamento.
+        Os parâmetros são os de `executar_tudo`.
+
+        Returns:
+            tuple: (grafo, etapas selecionadas ou None no pipeline completo, dependências
+            incluídas automaticamente).
+
+        Raises:
+            ValueError: Se a seleção de etapas for inválida, ou se `retomar_de` for usado
+                sem cache ou sem os checkpoints das etapas anteriores.
+        """
+        if de is not None and retomar_de is not None:
+            raise ValueError("❌ Use `de` ou `retomar_de`, não ambos.")
+        if retomar_de is not None and not usar_cache:
+            raise ValueError("❌ Retomar o pipeline exige o cache de checkpoints.")
+
+        grafo = GrafoEtapas(self.etapas())
+        if etapas is None and de is None and ate is None and retomar_de is None:
+            return grafo, None, []
+
+        selecionadas = grafo.intervalo(retomar_de or de, ate)
+        if etapas is not None:
+            grafo.validar_nomes(etapas)
+            selecionadas = [nome for nome in selecionadas if nome in etapas]
+        if not selecionadas:
+            raise ValueError("❌ Nenhuma etapa selecionada.")
+        grafo = grafo.subgrafo(selecionadas)
+        dependencias = [nome for nome in grafo.ordem if nome not in selecionadas]
+
+        if retomar_de is not None:
+            agendador = Agendador(grafo, cache=CacheEtapas(diretorio_cache), apenas_cache=dependencias)
+            ausentes = agendador.checkpoints_ausentes({'bruto': self.df})
+            if ausentes:
+                raise ValueError(f"❌ Não há checkpoint das etapas {ausentes} para estes dados, parâmetros e "
+                                 f"código; execute-as antes de retomar o pipeline a partir de '{retomar_de}'.")
+        return grafo, selecionadas, dependencias
+
+    def executar_tudo(self, interativo: bool = False, n_workers: int = 4, usar_cache: bool = True,
+                      diretorio_cache: str = '.cache/etapas', tamanho_cache_mb: float = 1024,
+                      diretorio_relatorio: str = 'relatorios', rastrear_alocacoes: bool = False,
+                      perfilar: bool = False, etapas: list = None, de: str = None, ate: str = None,
+                      retomar_de: str = None, memoria_maxima_mb: float = None) -> dict:
         """
-        Executa todo o pipeline de processamento, análise e modelagem da expectativa de vida,
-        permitindo que o usuário pressione ENTER para avançar para cada etapa.
-
-        Este método encapsula todas as etapas do pipeline, incluindo:
-        1. Leitura e carregamento do dataset.
-        2. Análise de duplicatas e valores ausentes.
-        3. Detecção e tratamento de outliers.
-        4. Preenchimento de valores ausentes usando KNN.
-        5. Análise do DataFrame final após a limpeza.
-        6. Visualizações exploratórias da expectativa de vida e outras variáveis.
-        7. Análise do consumo de álcool e sua relação com expectativa de vida.
-        8. Geração de scatter plots e análise de correlação.
-        9. Remoção de colunas redundantes.
-        10. Treinamento e avaliação da rede neural.
+        Executa todo o pipeline de processamento, análise e modelagem da expectativa de vida.
+
+        As etapas são declaradas em `etapas()` e executadas pelo `Agendador`: sem interação,
+        etapas independentes rodam ao mesmo tempo (ex.: as visualizações, assim que o
+        DataFrame final fica pronto). Com `interativo=True`, as etapas rodam uma a uma e o
+        usuário pressiona ENTER para avançar, como na versão original.
+
+        Com `usar_cache`, as saídas das etapas de tratamento ficam memorizadas em disco
+        (`CacheEtapas`): se nem os dados, nem os parâmetros, nem o código de uma etapa
+        mudaram, ela é reaproveitada em vez de recalculada. Assim, iterar na etapa de
+        modelagem não repete o tratamento de outliers e a imputação KNN.
+
+        Cada etapa, e os laços internos de tratamento de outliers e imputação, são medidos
+        pelo `Instrumentador` (tempo de parede e de CPU, memória residente, linhas por
+        segundo). Ao final, um resumo é exibido e o relatório da execução é gravado em
+        JSON e CSV em `diretorio_relatorio`, mesmo que alguma etapa falhe.
+
+        É possível executar só parte do pipeline, com `etapas` e/ou o intervalo `de`–`ate`
+        (na ordem de execução). As etapas que produzem as versões lidas pelas selecionadas
+        entram automaticamente, reaproveitadas do cache quando possível. Com `retomar_de`,
+        o pipeline começa na etapa indicada e essas dependências precisam vir do cache:
+        nada anterior a ela é recalculado.
+
+        O pipeline inclui:
+        1. Análise de duplicatas e valores ausentes.
+        2. Detecção e tratamento de outliers.
+        3. Preenchimento de valores ausentes usando KNN.
+        4. Análise do DataFrame final após a limpeza.
+        5. Visualizações exploratórias da expectativa de vida e outras variáveis.
+        6. Análise do consumo de álcool, scatter plots e matriz de correlação.
+        7. Remoção de colunas redundantes.
+        8. Treinamento e avaliação da rede neural.
+
+        Args:
+            interativo (bool, opcional): Se True, executa passo a passo. O padrão é False.
+            n_workers (int, opcional): Número máximo de etapas simultâneas. O padrão é 4.
+            usar_cache (bool, opcional): Se True, reaproveita checkpoints das etapas. O padrão é True.
+            diretorio_cache (str, opcional): Diretório dos checkpoints. O padrão é '.cache/etapas'.
+            tamanho_cache_mb (float, opcional): Tamanho máximo dos checkpoints; os menos
+                usados recentemente são removidos. O padrão é 1024.
+            diretorio_relatorio (str, opcional): Diretório dos relatórios de desempenho.
+                O padrão é 'relatorios'.
+            rastrear_alocacoes (bool, opcional): Se True, mede também as alocações com
+                `tracemalloc` (mais lento). O padrão é False.
+            perfilar (bool, opcional): Se True, grava um perfil cProfile por etapa em
+                `diretorio_relatorio/perfis`. O padrão é False.
+            etapas (list, opcional): Nomes das etapas a executar. O padrão (None) executa todas.
+            de (str, opcional): Primeira etapa do intervalo executado.
+            ate (str, opcional): Última etapa do intervalo executado.
+            retomar_de (str, opcional): Como `de`, mas exigindo que as etapas anteriores
+                necessárias sejam reaproveitadas do cache. Não pode ser usado com `de`.
+            memoria_maxima_mb (float, opcional): Orçamento de memória residente; acima
+                dele, nenhuma etapa nova começa enquanto outra estiver rodando. O padrão
+                (None) não limita.
 
         Returns:
-            None: Apenas exibe os resultados das análises e modelagens.
+            dict: Versões do DataFrame produzidas (no pipeline completo, 'bruto',
+            'sem_outliers', 'imputado', 'final' e 'sem_redundantes').
+
+        Raises:
+            ValueError: Se a seleção de etapas for inválida, ou se `retomar_de` for usado
+                sem cache ou sem os checkpoints das etapas anteriores.
 
         Example:
             >>> pipeline = Principal()
             >>> pipeline.executar_tudo()
+            >>> pipeline.executar_tudo(interativo=True)
+            >>> pipeline.executar_tudo(retomar_de='colunas_redundantes')  # só a modelagem em diante
         """
+        grafo, selecionadas, dependencias = self.planejar(etapas, de, ate, retomar_de, usar_cache,
+                                                          diretorio_cache)
+        apenas_cache = dependencias if retomar_de is not None else ()
+        if selecionadas is not None:
+            if dependencias:
+                origem = "do cache" if retomar_de is not None else "como dependências"
+                print(f"🔗 Etapas incluídas {origem}: {dependencias}")
+            print(f"\n📌 **Iniciando Pipeline Parcial:** {selecionadas}")
+        else:
+            print("\n📌 **Iniciando Pipeline Completo...**")
+
+        cache = CacheEtapas(diretorio_cache, tamanho_cache_mb) if usar_cache else None
+        instrumentador = Instrumentador(diretorio_relatorio, rastrear_alocacoes, perfilar)
+        agendador = Agendador(grafo, n_workers=n_workers, interativo=interativo, cache=cache,
+                              instrumentador=instrumentador, memoria_maxima_mb=memoria_maxima_mb,
+                              apenas_cache=apenas_cache)
+        try:
+            versoes = agendador.executar({'bruto': self.df})
+        finally:
+            instrumentador.exibir_resumo()
+            instrumentador.salvar_relatorio()
+        # Mantém em `self.df` a versão mais tratada que foi produzida
+        produzidas = [grafo.etapas[nome].produz for nome in grafo.ordem if grafo.etapas[nome].produz]
+        if produzidas:
+            self.df = versoes[produzidas[-1]]
 
-        def aguardar_usuario():
-            input("\n🔹 Pressione ENTER para continuar...")
+        print("\n🎉 **Pipeline Finalizado com Sucesso!** ✅")
+        return versoes
 
-        print("\n📌 **Iniciando Pipeline Completo...**")
-        
-        print("\n🔍 1. Analisando duplicatas...")
-        self.duplicatas()
-        aguardar_usuario()
 
-        print("\n📊 2. Analisando valores nulos...")
-        self.valores_nulos()
-        aguardar_usuario()
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser da linha de comando do pipeline.
 
-        print("\n🚀 3. Detectando e tratando outliers...")
-        self.outliers()
-        aguardar_usuario()
+    Returns:
+        argparse.ArgumentParser: Parser com as opções de `executar_cli`.
+    """
+    parser = argparse.ArgumentParser(
+        description="Pipeline de análise e modelagem da expectativa de vida (OMS).",
+        epilog="Use --listar para ver as etapas na ordem de execução.",
+    )
+    parser.add_argument('--dataset', default=CAMINHO_PADRAO, metavar='CAMINHO',
+                        help=f"CSV, diretório ou padrão glob de partições (padrão: {CAMINHO_PADRAO}).")
+    parser.add_argument('--listar', action='store_true', help="Lista as etapas e sai.")
 
-        print("\n🛠️ 4. Preenchendo valores ausentes com KNN...")
-        self.preencher_valor_ausente()
-        aguardar_usuario()
+    selecao = parser.add_argument_group('seleção de etapas')
+    selecao.add_argument('--etapas', nargs='+', metavar='ETAPA', help="Executa apenas estas etapas.")
+    inicio = selecao.add_mutually_exclusive_group()
+    inicio.add_argument('--de', metavar='ETAPA', help="Primeira etapa do intervalo executado.")
+    inicio.add_argument('--retomar-de', metavar='ETAPA',
+                        help="Começa nesta etapa, reaproveitando as anteriores do cache de checkpoints.")
+    selecao.add_argument('--ate', metavar='ETAPA', help="Última etapa do intervalo executado.")
 
-        print("\n✅ 5. Exibindo análise final do DataFrame...")
-        self.dataframefinal()
-        aguardar_usuario()
+    execucao = parser.add_argument_group('execução')
+    execucao.add_argument('--workers', type=int, default=4, help="Etapas simultâneas (padrão: 4).")
+    execucao.add_argument('--memoria-mb', type=float, metavar='MB',
+                          help="Orçamento de memória residente; acima dele as etapas não rodam em paralelo.")
+    execucao.add_argument('--interativo', action='store_true', help="Executa passo a passo, com ENTER.")
+    execucao.add_argument('--sem-cache', action='store_true', help="Não usa o cache de checkpoints.")
+    execucao.add_argument('--diretorio-cache', default='.cache/etapas', metavar='DIR',
+                          help="Diretório dos checkpoints (padrão: .cache/etapas).")
+    execucao.add_argument('--tamanho-cache-mb', type=float, default=1024, metavar='MB',
+                          help="Tamanho máximo dos checkpoints (padrão: 1024).")
 
-        print("\n📈 6. Visualizando tendência da expectativa de vida...")
-        self.visualizar_expectativa_vida()
-        aguardar_usuario()
+    modelagem = parser.add_argument_group('modelagem')
+    modelagem.add_argument('--pca', type=float, metavar='VARIANCIA',
+                           help="Reduz as entradas da rede aos componentes principais que explicam "
+                                f"esta fração da variância (ex.: 0.95); a projeção é salva em {CAMINHO_PROJECAO}.")
 
-        print("\n📊 7. Analisando tendências de múltiplas variáveis...")
-        self.tendencia_variavel()
-        aguardar_usuario()
+    limpeza = parser.add_argument_group('limpeza')
+    limpeza.add_argument('--fundido', action='store_true',
+                         help="Trata outliers e imputa os ausentes numa única etapa (outliers_e_valores_ausentes), "
+                              "em vez das etapas separadas outliers e preencher_valor_ausente (padrão).")
+    limpeza.add_argument('--lacuna-maxima', type=int, default=LACUNA_MAXIMA_PADRAO, metavar='ANOS',
+                         help="Interpola, antes do KNN, lacunas de até ANOS anos consecutivos em cada país "
+                              f"(padrão: {LACUNA_MAXIMA_PADRAO}); 0 deixa o tratamento de outliers "
+                              "interpolar todas as lacunas, como antes.")
 
-        print("\n🥂 8. Visualizando consumo de álcool e impacto na expectativa de vida...")
-        self.consumo_alcool()
-        aguardar_usuario()
+    desempenho = parser.add_argument_group('desempenho')
+    desempenho.add_argument('--profile', '--perfilar', dest='perfilar', action='store_true',
+                            help="Grava um perfil cProfile por etapa.")
+    desempenho.add_argument('--rastrear-alocacoes', action='store_true',
+                            help="Mede as alocações com tracemalloc (mais lento).")
+    desempenho.add_argument('--diretorio-relatorio', default='relatorios', metavar='DIR',
+                            help="Diretório dos relatórios de desempenho (padrão: relatorios).")
+    return parser
 
-        print("\n📉 9. Gerando Scatter Plot (Correlação BMI vs Expectativa de Vida)...")
-        self.scatter_plot()
-        aguardar_usuario()
 
-        print("\n📊 10. Criando Matriz de Correlação...")
-        self.matriz_relacao()
-        aguardar_usuario()
+def executar_cli(argv: list = None) -> int:
+    """
+    Ponto de entrada da linha de comando.
 
-        print("\n🗑️ 11. Removendo colunas redundantes...")
-        self.colunas_redundantes()
-        aguardar_usuario()
+    Args:
+        argv (list, opcional): Argumentos; o padrão (None) usa `sys.argv`.
 
-        print("\n🤖 12. Iniciando treinamento da Rede Neural para previsão de Expectativa de Vida...")
-        self.rede_neural()
-        aguardar_usuario()
+    Returns:
+        int: Código de saída (0 em caso de sucesso).
+
+    Example:
+        $ python main.py --dataset dataset/dataset_LE.csv --ate dataframefinal --workers 8
+        $ python main.py --retomar-de rede_neural --profile
+        $ python main.py --retomar-de rede_neural --pca 0.95
+        $ python main.py --fundido --ate dataframefinal
+    """
+    args = criar_parser().parse_args(argv)
+
+    if args.listar:
+        grafo = GrafoEtapas(Principal(args.dataset, ler=False, fundido=args.fundido).etapas())
+        for etapa in (grafo.etapas[nome] for nome in grafo.ordem):
+            versoes = f"{etapa.le} -> {etapa.produz}" if etapa.produz else etapa.le
+            print(f"   {etapa.nome:<30} {versoes}")
+        return 0
+
+    if args.pca is not None and not 0 < args.pca <= 1:
+        print("❌ A fração da variância do --pca deve estar entre 0 (exclusivo) e 1.")
+        return 1
+    if args.lacuna_maxima < 0:
+        print("❌ O valor de --lacuna-maxima deve ser um inteiro maior ou igual a zero.")
+        return 1
+    if args.workers <= 0:
+        print("❌ O número de --workers deve ser um inteiro positivo.")
+        return 1
+    if (args.memoria_mb is not None and args.memoria_mb <= 0) or args.tamanho_cache_mb <= 0:
+        print("❌ Os valores de --memoria-mb e --tamanho-cache-mb devem ser positivos.")
+        return 1
+
+    try:
+        pipeline = Principal(args.dataset, variancia_pca=args.pca, lacuna_maxima=args.lacuna_maxima,
+                             fundido=args.fundido)
+    except AttributeError as e:
+        # O leitor já informou o motivo (arquivo ausente, vazio ou inválido)
+        print(e)
+        return 1
+
+    try:
+        # Só os erros de seleção e de retomada são mensagens para o usuário; falhas das
+        # etapas seguem com o traceback completo
+        pipeline.planejar(etapas=args.etapas, de=args.de, ate=args.ate, retomar_de=args.retomar_de,
+                          usar_cache=not args.sem_cache, diretorio_cache=args.diretorio_cache)
+    except ValueError as e:
+        print(e)
+        return 1
+
+    pipeline.executar_tudo(
+        interativo=args.interativo, n_workers=args.workers, usar_cache=not args.sem_cache,
+        diretorio_cache=args.diretorio_cache, tamanho_cache_mb=args.tamanho_cache_mb,
+        diretorio_relatorio=args.diretorio_relatorio, rastrear_alocacoes=args.rastrear_alocacoes,
+        perfilar=args.perfilar, etapas=args.etapas, de=args.de, ate=args.ate,
+        retomar_de=args.retomar_de, memoria_maxima_mb=args.memoria_mb,
+    )
+    return 0
 
-        print("\n🎉 **Pipeline Finalizado com Sucesso!** ✅")
 
+if __name__ == '__main__':
+    sys.exit(executar_cli())
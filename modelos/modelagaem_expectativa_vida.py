@@ -7,6 +7,8 @@ from sklearn.model_selection import train_test_split,KFold
 from sklearn.preprocessing import LabelEncoder, MinMaxScaler
 from sklearn.metrics import mean_absolute_error, r2_score
 from modelos.avaliacao_modelo import Avaliacao
+from modelos.reducao_dimensional import ProjecaoPCA
+from pipeline.copia import copia_preguicosa
 
 class ExpectativaVidaMLP:
     """
@@ -14,26 +16,36 @@ class ExpectativaVidaMLP:
 
     Esta classe realiza:
     - Pré-processamento dos dados (normalização e encoding).
+    - Redução opcional de dimensionalidade (PCA) antes da rede, ajustada só no treino.
     - Construção de um modelo de rede neural `Sequential` com camadas densas.
     - Treinamento, avaliação e predição do modelo.
 
     Attributes:
         df (pd.DataFrame): O DataFrame contendo os dados para modelagem.
         model (Sequential): O modelo de Rede Neural criado.
+        projecao (ProjecaoPCA): Projeção aplicada às entradas, ou None sem redução.
+        escalonador (MinMaxScaler): Normalização ajustada no treino.
     """
 
-    def __init__(self, df: pd.DataFrame, k_folds=5):
+    def __init__(self, df: pd.DataFrame, k_folds=5, reducao=None, caminho_projecao: str = None):
         """
         Inicializa a classe, realizando a preparação dos dados.
 
         Args:
             df (pd.DataFrame): O DataFrame com os dados originais.
+            reducao (float | ProjecaoPCA, opcional): Fração da variância que a projeção PCA
+                deve explicar (ex.: 0.95), ou uma `ProjecaoPCA` já configurada. O padrão
+                (None) treina a rede com todas as colunas.
+            caminho_projecao (str, opcional): Arquivo em que a projeção ajustada é salva,
+                com a normalização incorporada, para transformar novos dados brutos na predição.
         """
         if not isinstance(df, pd.DataFrame):
             raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
 
-        self.df = df.copy()
+        self.df = copia_preguicosa(df)
         self.k_folds = k_folds
+        self.projecao = ProjecaoPCA(reducao) if isinstance(reducao, (int, float)) else reducao
+        self.caminho_projecao = caminho_projecao
         self.label_cols = ['Country', 'Status']
         self.scale_cols = [col for col in df.columns if col not in self.label_cols + ['Life expectancy ']]
         
@@ -49,6 +61,7 @@ class ExpectativaVidaMLP:
         )
 
         self.normalizar_dados()
+        self.reduzir_dimensionalidade()
 
         self.model = self.modelando(input_shape=(self.X_train.shape[1],))
     
@@ -80,13 +93,39 @@ class ExpectativaVidaMLP:
             None (modifica os atributos X_train e X_test in-place).
         """
         
-        mm = MinMaxScaler()
+        self.escalonador = MinMaxScaler()
 
 
-        self.X_train = mm.fit_transform(self.X_train)
-        self.X_val = mm.transform(self.X_val)
-        self.X_test = mm.transform(self.X_test)
+        self.X_train = self.escalonador.fit_transform(self.X_train)
+        self.X_val = self.escalonador.transform(self.X_val)
+        self.X_test = self.escalonador.transform(self.X_test)
     
+    def reduzir_dimensionalidade(self):
+        """
+        Projeta as entradas normalizadas nos componentes principais, se houver redução configurada.
+
+        A projeção é ajustada apenas em `X_train`, como a normalização, e aplicada com os
+        mesmos parâmetros à validação e ao teste. A primeira camada da rede passa a receber
+        só os componentes mantidos.
+
+        Returns:
+            None (modifica os atributos X_train, X_val e X_test in-place).
+        """
+        if self.projecao is None:
+            return
+
+        n_colunas = self.X_train.shape[1]
+        self.X_train = self.projecao.ajustar_transformar(self.X_train)
+        self.X_val = self.projecao.transformar(self.X_val)
+        self.X_test = self.projecao.transformar(self.X_test)
+        print(f"\n📉 PCA: {n_colunas} colunas → {self.projecao.n_componentes} componentes "
+              f"({100 * self.projecao.razao_variancia.sum():.1f}% da variância do treino)")
+
+        if self.caminho_projecao is not None:
+            # A normalização vai junto, para que o arquivo transforme os dados brutos
+            self.projecao.salvar(self.caminho_projecao, escalonador=self.escalonador)
+            print(f"💾 Projeção salva em '{self.caminho_projecao}'.")
+
     def modelando(self, input_shape: tuple) -> Sequential:
         """
         Constrói um modelo de Rede Neural `Sequential`.
@@ -0,0 +1,209 @@
+import json
+import os
+
+import numpy as np
+
+SOLVERS = ('auto', 'exato', 'aleatorio')
+
+
+class ProjecaoPCA:
+    """
+    Projeção em componentes principais, ajustada só no conjunto de treino.
+
+    Mantém o menor número de componentes cuja variância explicada acumulada atinge
+    `variancia_explicada`. A decomposição é a SVD exata da matriz centrada ou, em dados
+    largos, uma SVD aleatorizada (esboço gaussiano com iterações de potência), que só
+    calcula os primeiros componentes. A fração explicada é medida sobre a variância total
+    exata dos dados, então o alvo é respeitado nos dois casos; se os componentes do
+    esboço não bastarem, o esboço é dobrado até atingi-lo.
+
+    A projeção (média e matriz de componentes) pode ser salva e recarregada, para
+    transformar novos dados na hora de servir o modelo sem reajustar. A normalização
+    aplicada antes da projeção pode ser incorporada ao arquivo salvo, que então
+    transforma diretamente os dados brutos.
+
+    Attributes:
+        variancia_explicada (float): Fração da variância que os componentes devem explicar.
+        n_componentes_max (int): Limite de componentes, ou None.
+        solver (str): 'auto', 'exato' ou 'aleatorio'.
+        media (np.ndarray): Média de cada coluna no treino (após `ajustar`).
+        componentes (np.ndarray): Matriz (componentes x colunas) da projeção (após `ajustar`).
+        razao_variancia (np.ndarray): Fração da variância explicada por componente (após `ajustar`).
+    """
+
+    # A partir de quantas colunas o modo 'auto' usa a SVD aleatorizada
+    COLUNAS_ALEATORIO = 100
+
+    def __init__(self, variancia_explicada: float = 0.95, n_componentes_max: int = None,
+                 solver: str = 'auto', semente: int = 123):
+        """
+        Inicializa a projeção, ainda não ajustada.
+
+        Args:
+            variancia_explicada (float, opcional): Fração da variância a explicar, em (0, 1].
+                O padrão é 0.95.
+            n_componentes_max (int, opcional): Limite de componentes. O padrão (None) não limita.
+            solver (str, opcional): 'exato' (SVD completa), 'aleatorio' (SVD aleatorizada) ou
+                'auto' (aleatorizada a partir de 100 colunas). O padrão é 'auto'.
+            semente (int, opcional): Semente da SVD aleatorizada. O padrão é 123.
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido.
+        """
+        if not 0 < variancia_explicada <= 1:
+            raise ValueError("❌ A variância explicada deve estar entre 0 (exclusivo) e 1.")
+        if n_componentes_max is not None and (not isinstance(n_componentes_max, int) or n_componentes_max <= 0):
+            raise ValueError("❌ O número máximo de componentes deve ser um inteiro positivo.")
+        if solver not in SOLVERS:
+            raise ValueError(f"❌ Solver desconhecido: '{solver}'. Use um de {SOLVERS}.")
+
+        self.variancia_explicada = variancia_explicada
+        self.n_componentes_max = n_componentes_max
+        self.solver = solver
+        self.semente = semente
+        self.media = None
+        self.componentes = None
+        self.razao_variancia = None
+
+    @property
+    def n_componentes(self) -> int:
+        """Número de componentes mantidos (0 antes de `ajustar`)."""
+        return 0 if self.componentes is None else int(self.componentes.shape[0])
+
+    def _svd_aleatoria(self, centrados: np.ndarray, posto: int, n_iteracoes: int = 4) -> tuple:
+        """
+        Primeiros `posto` valores singulares e vetores singulares à direita (Halko et al., 2011).
+
+        Returns:
+            tuple: (valores singulares, matriz (posto x colunas) de vetores à direita).
+        """
+        gerador = np.random.default_rng(self.semente)
+        esboco = centrados @ gerador.normal(size=(centrados.shape[1], min(posto + 10, min(centrados.shape))))
+        for _ in range(n_iteracoes):
+            # Reortogonaliza a cada iteração para não perder os componentes menores
+            esboco, _ = np.linalg.qr(esboco)
+            esboco, _ = np.linalg.qr(centrados.T @ esboco)
+            esboco = centrados @ esboco
+        base, _ = np.linalg.qr(esboco)
+        _, valores, direita = np.linalg.svd(base.T @ centrados, full_matrices=False)
+        return valores[:posto], direita[:posto]
+
+    def ajustar(self, X: np.ndarray) -> 'ProjecaoPCA':
+        """
+        Ajusta a projeção aos dados de treino.
+
+        Args:
+            X (np.ndarray): Matriz (linhas x colunas) de treino, já normalizada.
+
+        Returns:
+            ProjecaoPCA: A própria instância.
+
+        Raises:
+            ValueError: Se `X` não for uma matriz com pelo menos duas linhas.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[0] < 2:
+            raise ValueError("❌ A projeção precisa de uma matriz com pelo menos duas linhas.")
+
+        self.media = X.mean(axis=0)
+        centrados = X - self.media
+        total = float((centrados ** 2).sum())
+        limite = min(self.n_componentes_max or X.shape[1], *X.shape)
+
+        aleatorio = self.solver == 'aleatorio' or (self.solver == 'auto' and X.shape[1] >= self.COLUNAS_ALEATORIO)
+        if aleatorio:
+            posto = min(limite, 32)
+            while True:
+                valores, direita = self._svd_aleatoria(centrados, posto)
+                explicada = (valores ** 2).sum() / total if total > 0 else 1.0
+                if explicada >= self.variancia_explicada or posto >= limite:
+                    break
+                posto = min(2 * posto, limite)
+        else:
+            _, valores, direita = np.linalg.svd(centrados, full_matrices=False)
+            valores, direita = valores[:limite], direita[:limite]
+
+        razao = valores ** 2 / total if total > 0 else np.zeros_like(valores)
+        n = min(int(np.searchsorted(np.cumsum(razao), self.variancia_explicada - 1e-12)) + 1, len(razao))
+        # Sinal determinístico: a maior carga (em módulo) de cada componente é positiva
+        direita = direita[:n]
+        sinais = np.sign(direita[np.arange(n), np.abs(direita).argmax(axis=1)])
+        self.componentes = direita * np.where(sinais == 0, 1.0, sinais)[:, None]
+        self.razao_variancia = razao[:n]
+        return self
+
+    def transformar(self, X: np.ndarray) -> np.ndarray:
+        """
+        Projeta dados nos componentes ajustados.
+
+        Args:
+            X (np.ndarray): Matriz (linhas x colunas), com as colunas do treino.
+
+        Returns:
+            np.ndarray: Matriz (linhas x componentes).
+
+        Raises:
+            ValueError: Se a projeção ainda não tiver sido ajustada.
+        """
+        if self.componentes is None:
+            raise ValueError("❌ A projeção ainda não foi ajustada. Chame `ajustar` primeiro.")
+        return (np.asarray(X, dtype=np.float64) - self.media) @ self.componentes.T
+
+    def ajustar_transformar(self, X: np.ndarray) -> np.ndarray:
+        """Ajusta a projeção a `X` e devolve `X` projetado."""
+        return self.ajustar(X).transformar(X)
+
+    def salvar(self, caminho: str, escalonador=None) -> None:
+        """
+        Grava a projeção em disco (um `.npz`), de forma atômica.
+
+        Com `escalonador`, a normalização `z = x * scale_ + min_` que precede a projeção é
+        incorporada à média e aos componentes gravados:
+
+            (x * scale_ + min_ - media) @ C.T = (x - (media - min_) / scale_) @ (C * scale_).T
+
+        de modo que a projeção recarregada recebe os dados brutos, sem o escalonador.
+
+        Args:
+            caminho (str): Arquivo de destino.
+            escalonador (MinMaxScaler, opcional): Normalização ajustada aplicada aos dados
+                antes de `transformar`. O padrão (None) grava a projeção como está.
+
+        Raises:
+            ValueError: Se a projeção ou o escalonador ainda não tiverem sido ajustados.
+        """
+        if self.componentes is None:
+            raise ValueError("❌ A projeção ainda não foi ajustada. Chame `ajustar` primeiro.")
+        media, componentes = self.media, self.componentes
+        if escalonador is not None:
+            if not hasattr(escalonador, 'scale_'):
+                raise ValueError("❌ O escalonador ainda não foi ajustado.")
+            # O MinMaxScaler troca amplitudes nulas por 1, então `scale_` nunca é zero
+            media = (media - escalonador.min_) / escalonador.scale_
+            componentes = componentes * escalonador.scale_
+        meta = {'variancia_explicada': self.variancia_explicada, 'n_componentes_max': self.n_componentes_max,
+                'solver': self.solver, 'semente': self.semente}
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        temporario = f"{caminho}.tmp{os.getpid()}"
+        with open(temporario, 'wb') as arquivo:
+            np.savez(arquivo, media=media, componentes=componentes,
+                     razao_variancia=self.razao_variancia, meta=np.array(json.dumps(meta)))
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> 'ProjecaoPCA':
+        """
+        Reabre uma projeção gravada por `salvar`.
+
+        Args:
+            caminho (str): Arquivo da projeção.
+
+        Returns:
+            ProjecaoPCA: Projeção pronta para `transformar`.
+        """
+        with np.load(caminho) as dados:
+            projecao = cls(**json.loads(str(dados['meta'])))
+            projecao.media = dados['media']
+            projecao.componentes = dados['componentes']
+            projecao.razao_variancia = dados['razao_variancia']
+        return projecao
@@ -0,0 +1,510 @@
+import contextlib
+import io
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pipeline.checkpoint import CacheEtapas, hash_dataframe, versao_codigo
+from pipeline.copia import entrada_protegida
+from pipeline.instrumentacao import Instrumentador, _rss_atual_mb, ativar
+
+
+class Etapa:
+    """
+    Etapa declarativa do pipeline.
+
+    Cada etapa lê uma versão nomeada do DataFrame (`le`) e, opcionalmente, produz uma
+    nova versão (`produz`). As versões são imutáveis: uma etapa nunca altera o DataFrame
+    que recebe, o que permite executar ao mesmo tempo todas as etapas que leem a mesma
+    versão.
+
+    Attributes:
+        nome (str): Nome único da etapa.
+        funcao (callable): Função que recebe o DataFrame lido e retorna o DataFrame
+            produzido (ou None, se a etapa não produz versão).
+        le (str): Versão do DataFrame lida pela etapa.
+        produz (str): Versão produzida pela etapa, ou None.
+        descricao (str): Mensagem exibida ao iniciar a etapa.
+        principal (bool): Se True, a etapa roda na thread principal (ex.: figuras do
+            matplotlib, que não são seguras entre threads).
+        parametros (dict): Parâmetros da etapa, que entram na chave do checkpoint.
+        codigo (tuple): Objetos (ou nomes de módulos) cujo código-fonte entra na versão
+            do checkpoint.
+        memorizar (bool): Se False, a saída nunca vem do cache e a etapa sempre roda.
+    """
+
+    def __init__(self, nome: str, funcao, le: str, produz: str = None, descricao: str = '',
+                 principal: bool = False, parametros: dict = None, codigo: tuple = (),
+                 memorizar: bool = True):
+        """
+        Inicializa a etapa.
+
+        Args:
+            nome (str): Nome único da etapa.
+            funcao (callable): Função `DataFrame -> DataFrame | None`.
+            le (str): Versão do DataFrame lida pela etapa.
+            produz (str, opcional): Versão produzida. O padrão (None) indica uma etapa
+                apenas de análise ou visualização.
+            descricao (str, opcional): Mensagem exibida ao iniciar a etapa.
+            principal (bool, opcional): Se True, roda na thread principal. O padrão é False.
+            parametros (dict, opcional): Parâmetros da etapa, incluídos na chave do
+                checkpoint (ver `CacheEtapas`). O padrão (None) equivale a {}.
+            codigo (tuple, opcional): Classes, funções ou nomes de módulos usados pela
+                etapa; o código dos seus pacotes, junto com o de `funcao`, forma a versão do
+                checkpoint. Nomes de módulos não são importados ao declarar a etapa.
+            memorizar (bool, opcional): Se False, a saída não é guardada nem reaproveitada
+                do cache, e a etapa roda sempre, mesmo ao retomar o pipeline depois dela.
+                Use para relatórios que apenas repassam o DataFrame, cujo valor está no que
+                exibem. O padrão é True.
+        """
+        if not callable(funcao):
+            raise TypeError(f"❌ A função da etapa '{nome}' deve ser chamável.")
+
+        self.nome = nome
+        self.funcao = funcao
+        self.le = le
+        self.produz = produz
+        self.descricao = descricao or f"Executando etapa '{nome}'..."
+        self.principal = principal
+        self.parametros = parametros or {}
+        self.codigo = tuple(codigo)
+        self.memorizar = memorizar
+
+    def __repr__(self) -> str:
+        return f"Etapa({self.nome!r}, le={self.le!r}, produz={self.produz!r})"
+
+
+class GrafoEtapas:
+    """
+    Grafo de dependências entre etapas, derivado das versões lidas e produzidas.
+
+    Uma etapa depende da etapa que produz a versão que ela lê. A ordem topológica é
+    estável: entre etapas prontas ao mesmo tempo, vale a ordem de declaração.
+
+    Attributes:
+        etapas (dict): Etapas por nome, na ordem de declaração.
+        versoes_iniciais (tuple): Versões fornecidas antes da execução.
+        produtores (dict): Etapa que produz cada versão.
+        dependencias (dict): Etapas das quais cada etapa depende.
+        dependentes (dict): Etapas que dependem de cada etapa.
+    """
+
+    def __init__(self, etapas: list, versoes_iniciais: tuple = ('bruto',)):
+        """
+        Monta e valida o grafo.
+
+        Args:
+            etapas (list): Lista de `Etapa`.
+            versoes_iniciais (tuple, opcional): Versões fornecidas antes da execução.
+                O padrão é ('bruto',).
+
+        Raises:
+            ValueError: Se houver nomes ou versões duplicadas, versões sem produtor ou ciclos.
+        """
+        self.etapas = {}
+        self.produtores = {}
+        self.versoes_iniciais = tuple(versoes_iniciais)
+        for etapa in etapas:
+            if etapa.nome in self.etapas:
+                raise ValueError(f"❌ Etapa duplicada: '{etapa.nome}'.")
+            self.etapas[etapa.nome] = etapa
+            if etapa.produz is not None:
+                if etapa.produz in self.produtores or etapa.produz in versoes_iniciais:
+                    raise ValueError(f"❌ A versão '{etapa.produz}' é produzida mais de uma vez.")
+                self.produtores[etapa.produz] = etapa.nome
+
+        self.dependencias = {nome: set() for nome in self.etapas}
+        self.dependentes = {nome: [] for nome in self.etapas}
+        for etapa in self.etapas.values():
+            if etapa.le in versoes_iniciais:
+                continue
+            if etapa.le not in self.produtores:
+                raise ValueError(f"❌ A etapa '{etapa.nome}' lê a versão '{etapa.le}', que nenhuma etapa produz.")
+            produtor = self.produtores[etapa.le]
+            self.dependencias[etapa.nome].add(produtor)
+            self.dependentes[produtor].append(etapa.nome)
+
+        self.ordem = self._ordenar()
+
+    def _ordenar(self) -> list:
+        """Ordem topológica estável (Kahn, respeitando a ordem de declaração)."""
+        pendentes = {nome: len(deps) for nome, deps in self.dependencias.items()}
+        ordem = []
+        prontas = [nome for nome in self.etapas if pendentes[nome] == 0]
+        while prontas:
+            nome = prontas.pop(0)
+            ordem.append(nome)
+            for dependente in self.dependentes[nome]:
+                pendentes[dependente] -= 1
+                if pendentes[dependente] == 0:
+                    prontas.append(dependente)
+            prontas.sort(key=list(self.etapas).index)
+        if len(ordem) != len(self.etapas):
+            ciclo = sorted(set(self.etapas) - set(ordem))
+            raise ValueError(f"❌ O grafo de etapas tem um ciclo envolvendo: {ciclo}.")
+        return ordem
+
+    def intervalo(self, de: str = None, ate: str = None) -> list:
+        """
+        Etapas da ordem topológica entre `de` e `ate`, inclusive.
+
+        Args:
+            de (str, opcional): Primeira etapa. O padrão (None) começa na primeira.
+            ate (str, opcional): Última etapa. O padrão (None) vai até a última.
+
+        Returns:
+            list: Nomes das etapas, na ordem de execução.
+
+        Raises:
+            ValueError: Se alguma etapa não existir ou se `de` vier depois de `ate`.
+        """
+        self.validar_nomes([nome for nome in (de, ate) if nome is not None])
+        inicio = 0 if de is None else self.ordem.index(de)
+        fim = len(self.ordem) - 1 if ate is None else self.ordem.index(ate)
+        if inicio > fim:
+            raise ValueError(f"❌ A etapa '{de}' vem depois de '{ate}' na ordem de execução.")
+        return self.ordem[inicio:fim + 1]
+
+    def validar_nomes(self, nomes: list) -> None:
+        """
+        Confere se todas as etapas de `nomes` existem no grafo.
+
+        Raises:
+            ValueError: Se alguma etapa não existir.
+        """
+        desconhecidas = [nome for nome in nomes if nome not in self.etapas]
+        if desconhecidas:
+            raise ValueError(f"❌ Etapas desconhecidas: {desconhecidas}. Disponíveis: {self.ordem}.")
+
+    def subgrafo(self, nomes: list) -> 'GrafoEtapas':
+        """
+        Grafo com as etapas de `nomes` e, transitivamente, as que produzem o que elas leem.
+
+        Args:
+            nomes (list): Etapas selecionadas.
+
+        Returns:
+            GrafoEtapas: Subgrafo, com as etapas na ordem de declaração original.
+
+        Raises:
+            ValueError: Se alguma etapa não existir.
+        """
+        self.validar_nomes(nomes)
+        incluidas = set()
+        pendentes = list(nomes)
+        while pendentes:
+            nome = pendentes.pop()
+            if nome not in incluidas:
+                incluidas.add(nome)
+                pendentes.extend(self.dependencias[nome])
+        return GrafoEtapas([etapa for nome, etapa in self.etapas.items() if nome in incluidas],
+                           self.versoes_iniciais)
+
+
+class _SaidaPorEtapa:
+    """
+    Substituto de `sys.stdout` que separa a saída das etapas executadas no pool.
+
+    `sys.stdout` é único no processo: sem isso, os prints de etapas simultâneas se
+    intercalam linha a linha. Dentro de `capturar`, a thread escreve num buffer próprio,
+    despejado de uma vez na saída original quando a etapa termina; as demais threads
+    (como a principal) escrevem direto na saída original.
+    """
+
+    def __init__(self, original):
+        self.original = original
+        self._buffers = {}
+        self._trava = threading.Lock()
+
+    @contextlib.contextmanager
+    def capturar(self):
+        """Acumula a saída da thread atual e a despeja ao sair, mesmo se houver erro."""
+        buffer = io.StringIO()
+        self._buffers[threading.get_ident()] = buffer
+        try:
+            yield buffer
+        finally:
+            del self._buffers[threading.get_ident()]
+            with self._trava:
+                self.original.write(buffer.getvalue())
+                self.original.flush()
+
+    def write(self, texto: str) -> int:
+        buffer = self._buffers.get(threading.get_ident())
+        if buffer is not None:
+            return buffer.write(texto)
+        with self._trava:
+            return self.original.write(texto)
+
+    def flush(self) -> None:
+        self.original.flush()
+
+    def __getattr__(self, nome):
+        return getattr(self.original, nome)
+
+
+class Agendador:
+    """
+    Executa um `GrafoEtapas`, sem interação ou passo a passo.
+
+    No modo sem interação, todas as etapas cujas dependências já terminaram são
+    executadas ao mesmo tempo num pool de threads (Pandas, NumPy e scikit-learn liberam o
+    GIL nas operações pesadas). Etapas marcadas como `principal` rodam na thread
+    principal, enquanto o pool segue com as demais. Se uma etapa falha, nenhuma etapa
+    nova é iniciada, as que estão em execução terminam e o erro é relançado. A saída
+    (`print`) de cada etapa do pool é acumulada e exibida de uma vez quando ela termina,
+    para que as mensagens de etapas simultâneas não se misturem.
+
+    No modo interativo, as etapas rodam uma a uma, na ordem topológica, aguardando ENTER
+    entre elas, como o antigo `Principal.executar_tudo`.
+
+    Com um `CacheEtapas`, a saída de cada etapa que produz uma versão é memorizada em
+    disco, sob uma chave formada pela identidade da entrada, pelos parâmetros e pela
+    versão do código da etapa, e reaproveitada automaticamente nas execuções seguintes.
+
+    Com um `Instrumentador`, cada etapa é medida (tempo, CPU, memória, linhas por
+    segundo) e os laços internos instrumentados com `pipeline.instrumentacao.medir`
+    registram suas próprias medições. Se o instrumentador perfila com cProfile, as
+    etapas do pool rodam uma de cada vez, para que os perfis não se misturem.
+
+    Cada etapa recebe a versão que lê por `pipeline.copia.entrada_protegida`: com o
+    Copy-on-Write do pandas ativo, uma cópia rasa, de modo que as versões são
+    compartilhadas entre as etapas sem cópias e nenhuma etapa altera a versão das outras.
+
+    Com `memoria_maxima_mb`, uma nova etapa só começa enquanto a memória residente do
+    processo estiver abaixo do orçamento; acima dele, o agendador espera as etapas em
+    execução terminarem (uma etapa sempre pode rodar sozinha). Etapas em `apenas_cache`
+    precisam ser reaproveitadas do cache, o que permite retomar o pipeline a partir de
+    uma etapa sem recalcular as anteriores; as que não são memorizadas (`memorizar=False`)
+    rodam mesmo assim.
+
+    Attributes:
+        grafo (GrafoEtapas): Grafo executado.
+        n_workers (int): Número máximo de etapas simultâneas.
+        interativo (bool): Se True, executa passo a passo.
+        duracoes (dict): Tempo de parede, em segundos, de cada etapa concluída.
+        cache (CacheEtapas): Cache de checkpoints, ou None.
+        instrumentador (Instrumentador): Instrumentador das medições, ou None.
+        memoria_maxima_mb (float): Orçamento de memória residente, em MB, ou None.
+        apenas_cache (set): Etapas que devem vir do cache, sem serem executadas.
+    """
+
+    def __init__(self, grafo: GrafoEtapas, n_workers: int = 4, interativo: bool = False,
+                 cache: CacheEtapas = None, instrumentador: Instrumentador = None,
+                 memoria_maxima_mb: float = None, apenas_cache: tuple = ()):
+        """
+        Inicializa o agendador.
+
+        Args:
+            grafo (GrafoEtapas): Grafo a executar.
+            n_workers (int, opcional): Número máximo de etapas simultâneas. O padrão é 4.
+            interativo (bool, opcional): Se True, executa passo a passo, aguardando ENTER
+                entre as etapas. O padrão é False.
+            cache (CacheEtapas, opcional): Cache de checkpoints das etapas. O padrão (None)
+                executa todas as etapas.
+            instrumentador (Instrumentador, opcional): Instrumentador das medições de
+                desempenho. O padrão (None) não mede.
+            memoria_maxima_mb (float, opcional): Memória residente, em MB, acima da qual
+                nenhuma etapa nova começa enquanto outra estiver rodando. O padrão (None)
+                não limita.
+            apenas_cache (tuple, opcional): Etapas que devem ser reaproveitadas do cache;
+                se o checkpoint de alguma não existir, a execução falha em vez de
+                calculá-la. Exige `cache`. O padrão é ().
+
+        Raises:
+            TypeError: Se `grafo` não for um GrafoEtapas.
+            ValueError: Se os parâmetros forem inválidos.
+        """
+        if not isinstance(grafo, GrafoEtapas):
+            raise TypeError("❌ O grafo deve ser uma instância de GrafoEtapas.")
+        if not isinstance(n_workers, int) or n_workers <= 0:
+            raise ValueError("❌ O número de workers deve ser um inteiro positivo.")
+        if memoria_maxima_mb is not None and memoria_maxima_mb <= 0:
+            raise ValueError("❌ O orçamento de memória deve ser positivo.")
+        if apenas_cache and cache is None:
+            raise ValueError("❌ Reaproveitar etapas do cache exige um CacheEtapas.")
+        grafo.validar_nomes(list(apenas_cache))
+        sem_saida = [nome for nome in apenas_cache if grafo.etapas[nome].produz is None]
+        if sem_saida:
+            raise ValueError(f"❌ Etapas sem versão produzida não têm checkpoint: {sem_saida}.")
+
+        self.grafo = grafo
+        self.n_workers = n_workers
+        self.interativo = interativo
+        self.cache = cache
+        self.instrumentador = instrumentador
+        self.memoria_maxima_mb = memoria_maxima_mb
+        self.apenas_cache = set(apenas_cache)
+        self.duracoes = {}
+        self._identidades = {}
+        self._trava = threading.Lock()
+
+    def _rodar(self, nome: str, versoes: dict, saida: _SaidaPorEtapa = None):
+        """
+        Executa uma etapa (ou reaproveita seu checkpoint) e registra sua duração.
+
+        Com `saida`, a saída da etapa é acumulada e exibida de uma vez ao final.
+        """
+        if saida is not None:
+            with saida.capturar():
+                return self._rodar(nome, versoes)
+
+        etapa = self.grafo.etapas[nome]
+        print(f"\n{etapa.descricao}")
+        inicio = time.perf_counter()
+        entrada = versoes[etapa.le]
+        medicao = contextlib.nullcontext({}) if self.instrumentador is None else \
+            self.instrumentador.medir(nome, linhas=len(entrada), perfilar=True, tipo='etapa')
+
+        with medicao as registro:
+            chave = None
+            if self.cache is not None and etapa.produz is not None:
+                chave = self._chave(etapa, self._identidades)
+                resultado = self.cache.obter(chave) if etapa.memorizar else None
+                registro['cache'] = 'desativado' if not etapa.memorizar else \
+                    'acerto' if resultado is not None else 'falta'
+                if resultado is not None:
+                    print(f"♻️ Etapa '{nome}' reaproveitada do cache de checkpoints.")
+            if chave is None or resultado is None:
+                if nome in self.apenas_cache and etapa.memorizar:
+                    raise ValueError(f"❌ Não há checkpoint da etapa '{nome}' para estes dados, parâmetros "
+                                     f"e código; execute-a antes de retomar o pipeline a partir dela.")
+                resultado = etapa.funcao(entrada_protegida(entrada))
+                if chave is not None and resultado is not None and etapa.memorizar:
+                    self.cache.guardar(chave, resultado)
+
+        with self._trava:
+            self.duracoes[nome] = time.perf_counter() - inicio
+            if chave is not None:
+                # A versão produzida é identificada pela chave da etapa que a produziu
+                self._identidades[etapa.produz] = chave
+        return resultado
+
+    @staticmethod
+    def _chave(etapa: Etapa, identidades: dict) -> str:
+        """Chave do checkpoint de uma etapa, a partir da identidade da versão que ela lê."""
+        codigo = versao_codigo(etapa.funcao, *etapa.codigo)
+        return CacheEtapas.chave(etapa.nome, identidades[etapa.le], etapa.parametros, codigo)
+
+    def checkpoints_ausentes(self, versoes_iniciais: dict) -> list:
+        """
+        Etapas de `apenas_cache` sem checkpoint, verificadas antes de executar qualquer etapa.
+
+        As chaves são encadeadas como na execução: a identidade de cada versão produzida
+        é a chave da etapa que a produz.
+
+        Args:
+            versoes_iniciais (dict): Versões disponíveis no início, ex.: {'bruto': df}.
+
+        Returns:
+            list: Nomes das etapas sem checkpoint, na ordem de execução.
+        """
+        if not self.apenas_cache:
+            return []
+        identidades = {versao: hash_dataframe(df) for versao, df in versoes_iniciais.items()}
+        ausentes = []
+        for nome in self.grafo.ordem:
+            etapa = self.grafo.etapas[nome]
+            if etapa.produz is None:
+                continue
+            identidades[etapa.produz] = self._chave(etapa, identidades)
+            if nome in self.apenas_cache and etapa.memorizar and not self.cache.contem(identidades[etapa.produz]):
+                ausentes.append(nome)
+        return ausentes
+
+    def _memoria_disponivel(self) -> bool:
+        """Indica se a memória residente está abaixo do orçamento (sempre, sem orçamento)."""
+        if self.memoria_maxima_mb is None:
+            return True
+        rss = _rss_atual_mb()
+        return rss is None or rss < self.memoria_maxima_mb
+
+    def _registrar(self, nome: str, resultado, versoes: dict) -> None:
+        """Guarda a versão produzida por uma etapa concluída."""
+        etapa = self.grafo.etapas[nome]
+        if etapa.produz is not None:
+            if resultado is None:
+                raise ValueError(f"❌ A etapa '{nome}' deveria produzir a versão '{etapa.produz}', mas retornou None.")
+            versoes[etapa.produz] = resultado
+
+    def executar(self, versoes_iniciais: dict) -> dict:
+        """
+        Executa todas as etapas do grafo.
+
+        Args:
+            versoes_iniciais (dict): Versões disponíveis no início, ex.: {'bruto': df}.
+
+        Returns:
+            dict: Todas as versões, iniciais e produzidas.
+
+        Example:
+            >>> agendador = Agendador(GrafoEtapas(etapas), n_workers=4)
+            >>> versoes = agendador.executar({'bruto': df})
+        """
+        contexto = contextlib.nullcontext() if self.instrumentador is None else ativar(self.instrumentador)
+        with contexto:
+            return self._executar(dict(versoes_iniciais))
+
+    def _executar(self, versoes: dict) -> dict:
+        """Executa as etapas, no modo interativo ou com o pool de threads."""
+        if self.cache is not None:
+            self._identidades = {versao: hash_dataframe(df) for versao, df in versoes.items()}
+        if self.interativo:
+            for nome in self.grafo.ordem:
+                self._registrar(nome, self._rodar(nome, versoes), versoes)
+                input("\n🔹 Pressione ENTER para continuar...")
+            return versoes
+
+        pendentes = {nome: len(deps) for nome, deps in self.grafo.dependencias.items()}
+        prontas = [nome for nome in self.grafo.ordem if pendentes[nome] == 0]
+        em_execucao = {}
+        erro = None
+
+        perfilando = self.instrumentador is not None and self.instrumentador.perfilar
+        saida = _SaidaPorEtapa(sys.stdout)
+        with contextlib.redirect_stdout(saida), \
+                ThreadPoolExecutor(max_workers=1 if perfilando else self.n_workers) as executor:
+            while prontas or em_execucao:
+                if erro is None:
+                    for nome in [n for n in prontas if not self.grafo.etapas[n].principal]:
+                        if em_execucao and not self._memoria_disponivel():
+                            break
+                        prontas.remove(nome)
+                        em_execucao[executor.submit(self._rodar, nome, versoes, saida)] = nome
+
+                concluidas = []
+                principal = next((n for n in prontas if self.grafo.etapas[n].principal), None)
+                if principal is not None and em_execucao and not self._memoria_disponivel():
+                    principal = None
+                if erro is None and principal is not None:
+                    # Roda a etapa da thread principal enquanto o pool trabalha nas demais
+                    prontas.remove(principal)
+                    try:
+                        concluidas.append((principal, self._rodar(principal, versoes), None))
+                    except Exception as e:
+                        concluidas.append((principal, None, e))
+                elif em_execucao:
+                    feitas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                    for futuro in feitas:
+                        excecao = futuro.exception()
+                        concluidas.append((em_execucao.pop(futuro), None if excecao else futuro.result(), excecao))
+                else:
+                    # Houve erro: as etapas prontas não são iniciadas
+                    break
+
+                for nome, resultado, excecao in concluidas:
+                    if excecao is not None:
+                        print(f"❌ A etapa '{nome}' falhou: {excecao}")
+                        erro = erro or excecao
+                        continue
+                    self._registrar(nome, resultado, versoes)
+                    for dependente in self.grafo.dependentes[nome]:
+                        pendentes[dependente] -= 1
+                        if pendentes[dependente] == 0:
+                            prontas.append(dependente)
+                    prontas.sort(key=self.grafo.ordem.index)
+
+        if erro is not None:
+            raise erro
+        return versoes
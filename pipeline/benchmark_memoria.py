@@ -0,0 +1,154 @@
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset.leitura_dataset import ESQUEMA_OMS
+from pipeline.tempo_importacao import RAIZ
+
+MODOS = ('copia_profunda', 'copy_on_write')
+
+
+def painel_sintetico(n_paises: int = 5000, n_anos: int = 200, fracao_ausente: float = 0.05,
+                     semente: int = 0) -> pd.DataFrame:
+    """
+    Gera um painel país × ano com as colunas e os tipos de `ESQUEMA_OMS`.
+
+    Os indicadores seguem uma tendência por país com ruído, alguns picos (outliers) e
+    uma fração de valores ausentes, para exercitar as etapas de tratamento.
+
+    Args:
+        n_paises (int, opcional): Número de países. O padrão é 5000.
+        n_anos (int, opcional): Anos por país. O padrão é 200.
+        fracao_ausente (float, opcional): Fração de valores ausentes nos indicadores.
+            O padrão é 0.05.
+        semente (int, opcional): Semente do gerador aleatório. O padrão é 0.
+
+    Returns:
+        pd.DataFrame: Painel com `n_paises * n_anos` linhas.
+    """
+    gerador = np.random.default_rng(semente)
+    n = n_paises * n_anos
+    paises = [f"Pais {i:05d}" for i in range(n_paises)]
+    df = pd.DataFrame({
+        'Country': pd.Categorical.from_codes(np.repeat(np.arange(n_paises), n_anos), paises),
+        'Year': np.tile(np.arange(2000 - n_anos + 1, 2001), n_paises).astype(np.int16),
+        'Status': pd.Categorical.from_codes(np.repeat(gerador.integers(0, 2, n_paises), n_anos),
+                                            ['Developed', 'Developing']),
+    })
+    for col, tipo in ESQUEMA_OMS.items():
+        if col in df.columns:
+            continue
+        nivel = np.repeat(gerador.uniform(1, 100, n_paises), n_anos)
+        valores = nivel + gerador.normal(0, 1, n)
+        valores[gerador.random(n) < 0.002] *= 50
+        valores[gerador.random(n) < fracao_ausente] = np.nan
+        df[col] = valores.astype(tipo)
+    return df
+
+
+def _executar_cenario(modo: str, n_paises: int, n_anos: int) -> dict:
+    """
+    Executa as etapas de tratamento sobre um painel sintético e mede a memória.
+
+    Roda dentro de um processo próprio (ver `comparar_memoria`), para que o pico de
+    memória residente seja só deste cenário.
+
+    Args:
+        modo (str): 'copia_profunda' reproduz o comportamento anterior, em que cada
+            etapa copiava o DataFrame inteiro no construtor; 'copy_on_write' ativa o
+            Copy-on-Write do pandas, e as cópias só duplicam os dados alterados.
+        n_paises (int): Número de países do painel.
+        n_anos (int): Anos por país.
+
+    Returns:
+        dict: 'modo', 'linhas', 'rss_base_mb' (após gerar o painel), 'pico_rss_mb',
+        'acrescimo_mb' (pico menos a base), 'retido_mb' (memória das versões produzidas,
+        acima da base), 'versoes' e 'tempo_s'.
+    """
+    from pipeline import copia
+    from pipeline.agendador import Agendador, Etapa, GrafoEtapas
+    from pipeline.instrumentacao import _pico_rss_mb, _rss_atual_mb
+    from analise_exploratoria.correlacao_mapa import MatrizRelacao
+    from preprocessamento.analise.dataframe_final import DataFrameFinal
+    from preprocessamento.limpeza.colunas_redundantes import RemovendoColunas
+    from preprocessamento.outliers.outliers import Outlier
+
+    if modo == 'copy_on_write':
+        copia.ativar_copy_on_write()
+    else:
+        copia.copy_on_write_ativo = lambda: False
+
+    df = painel_sintetico(n_paises, n_anos)
+    rss_base = _rss_atual_mb()
+    etapas = [
+        Etapa('outliers', lambda d: Outlier(d).executar_outliers(), le='bruto', produz='sem_outliers'),
+        Etapa('dataframefinal', lambda d: DataFrameFinal(d).executar_analise_dataframe_final(),
+              le='sem_outliers', produz='final'),
+        Etapa('correlacoes', lambda d: MatrizRelacao(d).calcular_correlacoes(), le='final'),
+        Etapa('colunas_redundantes', lambda d: RemovendoColunas(d).executar_remover_colunas(),
+              le='final', produz='sem_redundantes'),
+    ]
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        versoes = Agendador(GrafoEtapas(etapas), n_workers=1).executar({'bruto': df})
+    return {
+        'modo': modo,
+        'linhas': len(df),
+        'rss_base_mb': rss_base,
+        'pico_rss_mb': _pico_rss_mb(),
+        'acrescimo_mb': round(_pico_rss_mb() - rss_base, 1),
+        # Memória com todas as versões do DataFrame ainda vivas, como ao fim do pipeline
+        'retido_mb': round(_rss_atual_mb() - rss_base, 1),
+        'versoes': len(versoes),
+        'tempo_s': round(time.perf_counter() - inicio, 3),
+    }
+
+
+def comparar_memoria(n_paises: int = 5000, n_anos: int = 200) -> list:
+    """
+    Compara o pico de memória das etapas com cópias profundas e com Copy-on-Write.
+
+    Cada modo roda num processo novo, sobre o mesmo painel sintético.
+
+    Args:
+        n_paises (int, opcional): Número de países do painel. O padrão é 5000.
+        n_anos (int, opcional): Anos por país. O padrão é 200.
+
+    Returns:
+        list: Um dicionário por modo (ver `_executar_cenario`).
+
+    Example:
+        >>> comparar_memoria(2000, 100)
+    """
+    resultados = []
+    for modo in MODOS:
+        processo = subprocess.run(
+            [sys.executable, '-m', 'pipeline.benchmark_memoria', '--cenario', modo, str(n_paises), str(n_anos)],
+            cwd=RAIZ, capture_output=True, text=True, check=True,
+        )
+        resultados.append(json.loads(processo.stdout.strip().splitlines()[-1]))
+
+    print(f"\n🧠 Memória das etapas de tratamento ({resultados[0]['linhas']:,} linhas, "
+          f"base de {resultados[0]['rss_base_mb']:.0f} MB após gerar o painel):")
+    for resultado in resultados:
+        print(f"   {resultado['modo']:<16} pico {resultado['pico_rss_mb']:>8.0f} MB   "
+              f"acréscimo {resultado['acrescimo_mb']:>8.0f} MB   "
+              f"retido {resultado['retido_mb']:>8.0f} MB   {resultado['tempo_s']:>7.2f} s")
+    for campo, descricao in (('acrescimo_mb', 'do pico de memória'), ('retido_mb', 'da memória retida')):
+        antes, depois = resultados[0][campo], resultados[1][campo]
+        if antes > 0:
+            print(f"📉 Redução {descricao} acima da base: {100 * (antes - depois) / antes:.0f}%")
+    return resultados
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--cenario':
+        print(json.dumps(_executar_cenario(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))))
+    else:
+        comparar_memoria(*(int(arg) for arg in sys.argv[1:3]))
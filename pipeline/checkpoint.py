@@ -0,0 +1,206 @@
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+
+from dataset.cache_colunar import gravar_colunas, ler_colunas
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """
+    Calcula um hash do conteúdo de um DataFrame (valores, índice, nomes e tipos das colunas).
+
+    Args:
+        df (pd.DataFrame): Dados a identificar.
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(json.dumps([[str(col), str(tipo)] for col, tipo in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _arquivo_fonte(obj) -> str:
+    """Arquivo-fonte de um objeto, ou de um módulo informado pelo nome (sem importá-lo)."""
+    if isinstance(obj, str):
+        especificacao = importlib.util.find_spec(obj)
+        if especificacao is None or especificacao.origin is None:
+            raise ModuleNotFoundError(f"❌ Módulo '{obj}' não encontrado.")
+        return especificacao.origin
+    return inspect.getsourcefile(obj)
+
+
+def versao_codigo(*objetos) -> str:
+    """
+    Calcula um hash do código-fonte dos pacotes que definem `objetos`.
+
+    São considerados todos os arquivos `.py` do diretório de cada objeto, de modo que
+    módulos auxiliares (ex.: `detectores.py` ao lado de `outliers.py`) também entram na
+    versão. Qualquer alteração nesses arquivos invalida os checkpoints da etapa.
+
+    Módulos também podem ser informados pelo nome (ex.: 'preprocessamento.outliers.outliers');
+    nesse caso o arquivo é localizado sem importar o módulo, de modo que declarar uma etapa
+    não carrega as suas dependências pesadas.
+
+    Args:
+        *objetos: Funções, métodos, classes ou módulos usados pela etapa, ou nomes de módulos.
+
+    Returns:
+        str: Hash hexadecimal do código.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    diretorios = {os.path.dirname(os.path.abspath(_arquivo_fonte(obj))) for obj in objetos}
+    arquivos = sorted(
+        os.path.join(diretorio, nome)
+        for diretorio in diretorios for nome in os.listdir(diretorio) if nome.endswith('.py')
+    )
+    for arquivo in arquivos:
+        h.update(os.path.basename(arquivo).encode())
+        with open(arquivo, 'rb') as fonte:
+            h.update(fonte.read())
+    return h.hexdigest()
+
+
+class CacheEtapas:
+    """
+    Cache em disco das saídas das etapas, endereçado pelo conteúdo.
+
+    A chave de cada saída combina o nome da etapa, a identidade da entrada, os
+    parâmetros e a versão do código da etapa. A identidade de uma versão produzida pelo
+    pipeline é a própria chave da etapa que a produziu, então apenas os dados iniciais
+    precisam ter o conteúdo hasheado.
+
+    Cada saída é gravada no formato colunar de `dataset.cache_colunar` (um `.npy` por
+    coluna, lido mapeado em memória). Quando o tamanho total passa de
+    `tamanho_maximo_mb`, as entradas usadas há mais tempo são removidas (LRU).
+
+    Attributes:
+        diretorio (str): Diretório do cache.
+        tamanho_maximo_mb (float): Tamanho máximo do cache, em MB.
+        acertos (int): Número de saídas reaproveitadas.
+        faltas (int): Número de saídas calculadas e gravadas.
+    """
+
+    def __init__(self, diretorio: str = '.cache/etapas', tamanho_maximo_mb: float = 1024):
+        """
+        Inicializa o cache.
+
+        Args:
+            diretorio (str, opcional): Diretório do cache. O padrão é '.cache/etapas'.
+            tamanho_maximo_mb (float, opcional): Tamanho máximo, em MB. O padrão é 1024.
+        """
+        if tamanho_maximo_mb <= 0:
+            raise ValueError("❌ O tamanho máximo do cache deve ser positivo.")
+
+        self.diretorio = diretorio
+        self.tamanho_maximo_mb = tamanho_maximo_mb
+        self.acertos = 0
+        self.faltas = 0
+        self._trava = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    @staticmethod
+    def chave(etapa: str, entrada: str, parametros: dict, codigo: str) -> str:
+        """
+        Monta a chave de uma saída.
+
+        Args:
+            etapa (str): Nome da etapa.
+            entrada (str): Identidade da versão lida (hash do conteúdo ou chave anterior).
+            parametros (dict): Parâmetros da etapa (serializáveis em JSON).
+            codigo (str): Versão do código da etapa.
+
+        Returns:
+            str: Chave hexadecimal.
+        """
+        descricao = json.dumps([etapa, entrada, parametros, codigo], sort_keys=True, default=str)
+        return hashlib.blake2b(descricao.encode(), digest_size=20).hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave)
+
+    def contem(self, chave: str) -> bool:
+        """Indica se há uma saída guardada sob `chave`, sem lê-la nem marcá-la como usada."""
+        return os.path.exists(os.path.join(self._caminho(chave), 'meta.json'))
+
+    def obter(self, chave: str):
+        """
+        Retorna a saída guardada sob `chave`, ou None se não existir.
+
+        Args:
+            chave (str): Chave da saída.
+
+        Returns:
+            pd.DataFrame | None: Saída reaproveitada, com colunas mapeadas em memória.
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(os.path.join(caminho, 'meta.json'), encoding='utf-8') as arquivo:
+                meta = json.load(arquivo)
+            df = ler_colunas(caminho, meta)
+        except (OSError, ValueError):
+            return None
+
+        # A data de modificação do meta.json marca o último acesso (ordem do LRU)
+        os.utime(os.path.join(caminho, 'meta.json'))
+        with self._trava:
+            self.acertos += 1
+        return df
+
+    def guardar(self, chave: str, df: pd.DataFrame) -> None:
+        """
+        Grava uma saída e aplica o limite de tamanho.
+
+        Args:
+            chave (str): Chave da saída.
+            df (pd.DataFrame): Saída da etapa.
+        """
+        caminho = self._caminho(chave)
+        temporario = f"{caminho}.tmp{os.getpid()}_{threading.get_ident()}"
+        shutil.rmtree(temporario, ignore_errors=True)
+        os.makedirs(temporario)
+        meta = gravar_colunas(df, temporario)
+        meta['bytes'] = sum(os.path.getsize(os.path.join(temporario, nome)) for nome in os.listdir(temporario))
+        meta['criado_em'] = time.time()
+        with open(os.path.join(temporario, 'meta.json'), 'w', encoding='utf-8') as arquivo:
+            json.dump(meta, arquivo, ensure_ascii=False, default=str)
+
+        with self._trava:
+            shutil.rmtree(caminho, ignore_errors=True)
+            os.replace(temporario, caminho)
+            self.faltas += 1
+            self._despejar()
+
+    def _despejar(self) -> None:
+        """Remove as entradas usadas há mais tempo até o cache caber no limite."""
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            meta = os.path.join(self.diretorio, nome, 'meta.json')
+            if '.tmp' in nome or not os.path.exists(meta):
+                continue
+            with open(meta, encoding='utf-8') as arquivo:
+                tamanho = json.load(arquivo).get('bytes', 0)
+            entradas.append((os.path.getmtime(meta), tamanho, nome))
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        limite = self.tamanho_maximo_mb * 1024 ** 2
+        # Mantém ao menos a entrada mais recente, mesmo que sozinha passe do limite
+        for _, tamanho, nome in sorted(entradas)[:-1]:
+            if total <= limite:
+                break
+            shutil.rmtree(os.path.join(self.diretorio, nome), ignore_errors=True)
+            total -= tamanho
+
+    def limpar(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._trava:
+            shutil.rmtree(self.diretorio, ignore_errors=True)
+            os.makedirs(self.diretorio, exist_ok=True)
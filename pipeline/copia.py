@@ -0,0 +1,83 @@
+import pandas as pd
+
+# A partir do pandas 3.0 o Copy-on-Write está sempre ativo e a opção foi descontinuada
+_COW_SEMPRE_ATIVO = int(pd.__version__.split('.')[0]) >= 3
+
+
+def copy_on_write_ativo() -> bool:
+    """
+    Indica se o Copy-on-Write do pandas está ativo.
+
+    Returns:
+        bool: True se cópias e DataFrames derivados só duplicam dados quando alterados.
+    """
+    if _COW_SEMPRE_ATIVO:
+        return True
+    try:
+        # No pandas 2.2 a opção também aceita 'warn', que apenas avisa e não protege
+        return pd.get_option('mode.copy_on_write') is True
+    except pd.errors.OptionError:
+        return False
+
+
+def ativar_copy_on_write() -> bool:
+    """
+    Ativa o Copy-on-Write do pandas, se a versão instalada o suportar (pandas >= 2.0).
+
+    Com o Copy-on-Write, um DataFrame derivado de outro (cópia rasa, seleção de colunas,
+    `drop`, ...) compartilha os arrays com a origem até que um dos dois seja alterado;
+    só então os dados alterados são copiados. É o que permite às etapas do pipeline
+    receberem as versões do DataFrame sem duplicá-las.
+
+    Returns:
+        bool: True se o Copy-on-Write ficou ativo.
+    """
+    if copy_on_write_ativo():
+        return True
+    try:
+        pd.set_option('mode.copy_on_write', True)
+    except pd.errors.OptionError:
+        print(f"⚠️ O pandas {pd.__version__} não suporta Copy-on-Write; as etapas copiarão os dados.")
+        return False
+    return True
+
+
+def copia_preguicosa(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Retorna uma cópia de `df` que só duplica os dados quando (e onde) forem alterados.
+
+    Com o Copy-on-Write ativo, é uma cópia rasa: nenhuma coluna é duplicada até que a
+    cópia ou a origem seja modificada, e alterações numa nunca aparecem na outra. Sem o
+    Copy-on-Write, cai na cópia profunda, que mantém a mesma garantia.
+
+    É a forma de as classes de tratamento e visualização guardarem o DataFrame recebido
+    ("Mantém os dados originais intactos") sem copiar o dataset inteiro no construtor.
+
+    Args:
+        df (pd.DataFrame): DataFrame de origem.
+
+    Returns:
+        pd.DataFrame: Cópia independente de `df`.
+
+    Example:
+        >>> self.df = copia_preguicosa(df)  # no construtor de uma etapa
+    """
+    return df.copy(deep=not copy_on_write_ativo())
+
+
+def entrada_protegida(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versão de `df` entregue a uma etapa, protegida contra alterações da própria etapa.
+
+    Com o Copy-on-Write ativo, é uma cópia rasa (sem duplicar dados): se a etapa alterar
+    o DataFrame recebido, só ela vê a alteração, e a versão compartilhada com as demais
+    etapas fica intacta. Sem o Copy-on-Write, devolve o próprio `df`, como antes; nesse
+    caso a proteção fica a cargo das cópias feitas nos construtores (`copia_preguicosa`).
+
+    Args:
+        df (pd.DataFrame): Versão compartilhada do DataFrame.
+
+    Returns:
+        pd.DataFrame: DataFrame a entregar à etapa.
+    """
+    return df.copy(deep=False) if copy_on_write_ativo() else df
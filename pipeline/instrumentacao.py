@@ -0,0 +1,210 @@
+import contextlib
+import cProfile
+import csv
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_ATIVO = None
+
+
+def _rss_atual_mb() -> float:
+    """Memória residente atual do processo, em MB (None se indisponível)."""
+    try:
+        with open('/proc/self/statm') as arquivo:
+            return round(int(arquivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _pico_rss_mb() -> float:
+    """Pico de memória residente do processo desde o início, em MB (None se indisponível)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return round(pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024, 1)
+
+
+class Instrumentador:
+    """
+    Mede tempo, CPU e memória das etapas do pipeline e dos laços internos mais pesados.
+
+    Cada medição registra tempo de parede, tempo de CPU da thread, memória residente
+    (atual e pico do processo), linhas processadas por segundo e, opcionalmente, a
+    variação e o pico de alocações do `tracemalloc`. Com `perfilar=True`, cada etapa
+    também gera um arquivo `.prof` do cProfile. As medições são gravadas num relatório
+    JSON e CSV por execução, para comparar execuções e localizar gargalos.
+
+    Os laços internos são medidos pela função `medir` deste módulo, que não faz nada
+    quando não há instrumentador ativo (ver `ativar`).
+
+    Observação: RSS e `tracemalloc` são do processo inteiro; com etapas simultâneas,
+    as memórias de uma medição incluem as alocações das etapas concorrentes.
+
+    Attributes:
+        diretorio (str): Diretório dos relatórios.
+        rastrear_alocacoes (bool): Se True, usa o `tracemalloc` (mais lento).
+        perfilar (bool): Se True, grava um perfil cProfile por etapa.
+        id_execucao (str): Identificador da execução, usado nos nomes dos arquivos.
+        registros (list): Medições concluídas, como dicionários.
+    """
+
+    def __init__(self, diretorio: str = 'relatorios', rastrear_alocacoes: bool = False, perfilar: bool = False):
+        """
+        Inicializa o instrumentador.
+
+        Args:
+            diretorio (str, opcional): Diretório dos relatórios. O padrão é 'relatorios'.
+            rastrear_alocacoes (bool, opcional): Se True, mede alocações com `tracemalloc`,
+                o que deixa o código instrumentado sensivelmente mais lento. O padrão é False.
+            perfilar (bool, opcional): Se True, grava um perfil cProfile de cada etapa.
+                O padrão é False.
+        """
+        self.diretorio = diretorio
+        self.rastrear_alocacoes = rastrear_alocacoes
+        self.perfilar = perfilar
+        self.id_execucao = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.registros = []
+        self._trava = threading.Lock()
+        self._abertas = 0
+
+    @contextlib.contextmanager
+    def medir(self, nome: str, linhas: int = None, perfilar: bool = False, **extras):
+        """
+        Mede o bloco executado dentro do `with`.
+
+        Args:
+            nome (str): Nome da medição (ex.: 'outliers' ou 'Outlier.tratar_fatia').
+            linhas (int, opcional): Linhas processadas, para calcular linhas por segundo.
+            perfilar (bool, opcional): Se True (e `self.perfilar`), grava um perfil cProfile
+                do bloco. O padrão é False.
+            **extras: Campos adicionais guardados no registro.
+
+        Yields:
+            dict: Registro da medição; o bloco pode acrescentar campos a ele.
+        """
+        registro = {'execucao': self.id_execucao, 'nome': nome, 'linhas': linhas, **extras}
+        with self._trava:
+            if self.rastrear_alocacoes and self._abertas == 0:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+            self._abertas += 1
+        alocado_inicio = tracemalloc.get_traced_memory()[0] if self.rastrear_alocacoes else 0
+
+        perfil = cProfile.Profile() if perfilar and self.perfilar else None
+        if perfil is not None:
+            try:
+                perfil.enable()
+            except ValueError:
+                # Só um cProfile pode estar ativo por vez (ex.: etapa da thread principal
+                # concorrendo com uma do pool)
+                print(f"⚠️ Perfil de '{nome}' ignorado: outro perfil já está ativo.")
+                perfil = None
+        inicio_cpu = time.thread_time()
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            parede = time.perf_counter() - inicio
+            cpu = time.thread_time() - inicio_cpu
+            if perfil is not None:
+                perfil.disable()
+                os.makedirs(os.path.join(self.diretorio, 'perfis'), exist_ok=True)
+                registro['perfil'] = os.path.join(self.diretorio, 'perfis', f"{self.id_execucao}_{nome}.prof")
+                perfil.dump_stats(registro['perfil'])
+
+            registro.update(
+                tempo_parede_s=round(parede, 6),
+                tempo_cpu_s=round(cpu, 6),
+                linhas_por_s=round(linhas / parede, 1) if linhas and parede > 0 else None,
+                rss_mb=_rss_atual_mb(),
+                pico_rss_mb=_pico_rss_mb(),
+            )
+            if self.rastrear_alocacoes:
+                atual, pico = tracemalloc.get_traced_memory()
+                registro.update(alocado_mb=round((atual - alocado_inicio) / 1024 ** 2, 3),
+                                pico_alocado_mb=round((pico - alocado_inicio) / 1024 ** 2, 3))
+            with self._trava:
+                self._abertas -= 1
+                self.registros.append(registro)
+
+    def salvar_relatorio(self) -> tuple:
+        """
+        Grava as medições da execução em JSON e CSV.
+
+        Returns:
+            tuple: (caminho do JSON, caminho do CSV).
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        base = os.path.join(self.diretorio, f"execucao_{self.id_execucao}")
+        with open(base + '.json', 'w', encoding='utf-8') as arquivo:
+            json.dump(self.registros, arquivo, ensure_ascii=False, indent=2)
+
+        campos = list(dict.fromkeys(campo for registro in self.registros for campo in registro))
+        with open(base + '.csv', 'w', newline='', encoding='utf-8') as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(self.registros)
+
+        print(f"📝 Relatório de desempenho salvo em '{base}.json' e '{base}.csv'.")
+        return base + '.json', base + '.csv'
+
+    def exibir_resumo(self) -> None:
+        """
+        Exibe tempo de parede, CPU e memória de cada medição, da mais lenta à mais rápida.
+        """
+        print("\n⏱️ Resumo de desempenho:")
+        for registro in sorted(self.registros, key=lambda r: r['tempo_parede_s'], reverse=True):
+            rss = f"{registro['rss_mb']:.0f} MB" if registro.get('rss_mb') is not None else '-'
+            taxa = f"{registro['linhas_por_s']:.0f} linhas/s" if registro.get('linhas_por_s') else ''
+            print(f"   {registro['nome']:<40} {registro['tempo_parede_s']:>9.3f} s parede "
+                  f"{registro['tempo_cpu_s']:>9.3f} s CPU   RSS {rss:>8}   {taxa}")
+
+
+@contextlib.contextmanager
+def ativar(instrumentador: Instrumentador):
+    """
+    Torna `instrumentador` o destino das medições feitas com `medir` dentro do `with`.
+
+    Args:
+        instrumentador (Instrumentador): Instrumentador da execução.
+    """
+    global _ATIVO
+    anterior, _ATIVO = _ATIVO, instrumentador
+    try:
+        yield instrumentador
+    finally:
+        _ATIVO = anterior
+
+
+def medir(nome: str, linhas: int = None, **extras):
+    """
+    Mede um trecho com o instrumentador ativo, ou não faz nada se não houver um.
+
+    Usada nos laços internos das classes de tratamento, que não recebem o instrumentador.
+
+    Args:
+        nome (str): Nome da medição.
+        linhas (int, opcional): Linhas processadas no trecho.
+        **extras: Campos adicionais do registro.
+
+    Returns:
+        Gerenciador de contexto da medição.
+
+    Example:
+        >>> with medir('Outlier.tratar_fatia', linhas=len(bloco)):
+        ...     tratar_fatia(...)
+    """
+    if _ATIVO is None:
+        return contextlib.nullcontext({})
+    return _ATIVO.medir(nome, linhas, **extras)
@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos medidos por padrão: o ponto de entrada e o módulo de cada tipo de etapa
+MODULOS_PADRAO = (
+    'main',
+    'dataset.leitura_dataset',
+    'preprocessamento.analise.duplicatas',
+    'preprocessamento.analise.valores_ausentes',
+    'preprocessamento.outliers.outliers',
+    'preprocessamento.limpeza.limpeza_dataset',
+    'analise_exploratoria.visualizacao_expectativa_vida',
+    'analise_exploratoria.correlacao_mapa',
+    'modelos.modelagaem_expectativa_vida',
+)
+
+
+def _interpretar_importtime(saida: str) -> list:
+    """
+    Converte a saída de `python -X importtime` em registros.
+
+    Args:
+        saida (str): Saída de erro do interpretador.
+
+    Returns:
+        list: Tuplas (módulo, profundidade, tempo próprio em µs, tempo acumulado em µs).
+    """
+    registros = []
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha.split('|', 2)
+        proprio = int(proprio.rsplit(':', 1)[1])
+        acumulado = int(acumulado)
+        # O nome é precedido de um espaço e de dois espaços por nível de aninhamento
+        profundidade = (len(nome) - 1 - len(nome.lstrip())) // 2
+        registros.append((nome.strip(), profundidade, proprio, acumulado))
+    return registros
+
+
+def medir_importacao(modulo: str, repeticoes: int = 3, python: str = sys.executable) -> dict:
+    """
+    Mede o tempo de importação de `modulo` num interpretador novo.
+
+    Cada repetição importa o módulo com `python -X importtime` na raiz do projeto, de
+    modo que nada já importado pelo processo atual é reaproveitado. Vale a repetição mais
+    rápida, que desconta a primeira leitura dos arquivos do disco.
+
+    Args:
+        modulo (str): Nome do módulo (ex.: 'main').
+        repeticoes (int, opcional): Número de medições. O padrão é 3.
+        python (str, opcional): Interpretador usado. O padrão é o atual.
+
+    Returns:
+        dict: 'modulo', 'tempo_s', 'modulos_carregados', 'mais_pesados' (os cinco pacotes
+        que mais pesaram, com a soma do tempo próprio dos seus módulos, em segundos) e
+        'erro' (None, ou a última linha do erro se a importação falhar).
+
+    Raises:
+        ValueError: Se `repeticoes` for menor que 1.
+
+    Example:
+        >>> medir_importacao('main')['tempo_s']
+    """
+    if repeticoes < 1:
+        raise ValueError("❌ O número de repetições deve ser pelo menos 1.")
+
+    melhor = None
+    for _ in range(repeticoes):
+        processo = subprocess.run([python, '-X', 'importtime', '-c',
+                                   'import importlib, sys; importlib.import_module(sys.argv[1])', modulo],
+                                  cwd=RAIZ, capture_output=True, text=True)
+        if processo.returncode != 0:
+            linhas = processo.stderr.strip().splitlines()
+            return {'modulo': modulo, 'tempo_s': None, 'modulos_carregados': None,
+                    'mais_pesados': [], 'erro': linhas[-1] if linhas else 'erro desconhecido'}
+
+        registros = _interpretar_importtime(processo.stderr)
+        total = sum(proprio for _, _, proprio, _ in registros)
+        if melhor is None or total < melhor[0]:
+            melhor = (total, registros)
+
+    total, registros = melhor
+    # Soma o tempo próprio dos submódulos de cada pacote (ex.: 'pandas', 'sklearn')
+    por_pacote = {}
+    for nome, _, proprio, _ in registros:
+        pacote = nome.split('.')[0]
+        por_pacote[pacote] = por_pacote.get(pacote, 0) + proprio
+    mais_pesados = sorted(por_pacote.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'modulo': modulo,
+        'tempo_s': round(total / 1e6, 4),
+        'modulos_carregados': len(registros),
+        'mais_pesados': [(pacote, round(tempo / 1e6, 4)) for pacote, tempo in mais_pesados],
+        'erro': None,
+    }
+
+
+def medir_importacoes(modulos: tuple = MODULOS_PADRAO, repeticoes: int = 3) -> list:
+    """
+    Mede e exibe o tempo de importação de cada módulo.
+
+    Args:
+        modulos (tuple, opcional): Módulos medidos. O padrão é `MODULOS_PADRAO`.
+        repeticoes (int, opcional): Medições por módulo. O padrão é 3.
+
+    Returns:
+        list: Um dicionário por módulo (ver `medir_importacao`).
+    """
+    print("\n⏱️ Tempo de importação (interpretador novo, melhor de "
+          f"{repeticoes} {'medição' if repeticoes == 1 else 'medições'}):")
+    resultados = []
+    for modulo in modulos:
+        resultado = medir_importacao(modulo, repeticoes)
+        resultados.append(resultado)
+        if resultado['erro']:
+            print(f"   ❌ {modulo:<52} {resultado['erro']}")
+            continue
+        pesados = ', '.join(f"{nome} {tempo * 1000:.0f} ms" for nome, tempo in resultado['mais_pesados'][:3])
+        print(f"   {modulo:<54} {resultado['tempo_s'] * 1000:>8.0f} ms   "
+              f"{resultado['modulos_carregados']:>5} módulos   ({pesados})")
+    return resultados
+
+
+if __name__ == '__main__':
+    medir_importacoes(tuple(sys.argv[1:]) or MODULOS_PADRAO)
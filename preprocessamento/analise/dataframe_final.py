@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-from sklearn.impute import KNNImputer
+from pipeline.copia import copia_preguicosa
+from preprocessamento.analise.mapa_ausentes import MapaAusentes
 
 class DataFrameFinal:
     """
@@ -25,7 +26,7 @@ class DataFrameFinal:
         if not isinstance(df, pd.DataFrame):
             raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
 
-        self.df = df.copy()  # Mantém os dados originais intactos
+        self.df = copia_preguicosa(df)  # Mantém os dados originais intactos
     
     def verificar_valores_ausentes_por_pais(self) -> pd.Series:
         """
@@ -49,13 +50,7 @@ class DataFrameFinal:
         if 'Country' not in self.df.columns:
             raise KeyError("❌ O DataFrame deve conter a coluna 'Country' para segmentação dos dados.")
 
-        valores_faltantes = (
-            self.df.isnull()
-            .groupby(self.df['Country'])
-            .sum()
-            .sum(axis=1)
-            .sort_values(ascending=False)
-        )
+        valores_faltantes = MapaAusentes(self.df).total_por_grupo().sort_values(ascending=False)
 
         print("\n📉 Contagem de valores ausentes por país:")
         print(valores_faltantes)
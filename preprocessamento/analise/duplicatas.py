@@ -1,5 +1,9 @@
+import os
+
 import pandas as pd
 
+from preprocessamento.analise.indice_duplicatas import IndiceDuplicatas
+
 class Duplicatas:
     """
     Classe para análise e tratamento de registros duplicados em um DataFrame do Pandas.
@@ -9,6 +13,8 @@ class Duplicatas:
 
     Funcionalidades:
         - Verificar a existência de registros duplicados em colunas específicas.
+        - Verificar duplicatas em relação a entregas anteriores, com um índice salvo em disco.
+        - Identificar registros quase duplicados (valores numéricos iguais dentro de uma tolerância).
         - Contar valores únicos em colunas categóricas (excluindo colunas numéricas).
 
     Attributes:
@@ -33,7 +39,8 @@ class Duplicatas:
 
         Este método identifica e conta registros duplicados considerando as colunas
         especificadas no parâmetro `subset`. Ele retorna a contagem total de duplicatas
-        e imprime o resultado.
+        e imprime o resultado. A contagem é a mesma de `DataFrame.duplicated`, mas feita
+        sobre um hash de 64 bits por linha (`IndiceDuplicatas`).
 
         Args:
             subset (list): Lista de colunas a serem verificadas para duplicação.
@@ -54,9 +61,88 @@ class Duplicatas:
         if not isinstance(subset, list) or not all(col in self.df.columns for col in subset):
             raise ValueError("❌ O argumento 'subset' deve ser uma lista contendo colunas válidas do DataFrame.")
 
-        duplicatas = self.df.duplicated(subset=subset).sum()
+        duplicatas = IndiceDuplicatas(subset).atualizar(self.df)['duplicada'].sum()
         print(f"🔍 Total de registros duplicados considerando {subset}: {duplicatas}")
         return duplicatas
+
+    def verificar_duplicatas_indexadas(self, subset: list, caminho_indice: str, origem: str = None) -> pd.DataFrame:
+        """
+        Verifica duplicatas em relação a todas as entregas já indexadas e atualiza o índice.
+
+        O índice salvo em `caminho_indice` guarda um hash por chave já vista (e a entrega
+        de origem), e não os dados. A cada nova entrega, só ela é lida: as linhas cujas
+        chaves já constavam do índice, ou se repetem dentro da própria entrega, são
+        apontadas, e as chaves novas são acrescentadas ao índice.
+
+        Args:
+            subset (list): Colunas que identificam um registro (ex.: ['Country', 'Year']).
+            caminho_indice (str): Arquivo do índice. É criado se ainda não existir.
+            origem (str, opcional): Nome desta entrega no índice. O padrão (None) usa 'bloco N'.
+
+        Returns:
+            pd.DataFrame: Linhas duplicadas, com a coluna 'origem_anterior' indicando a
+            entrega em que a chave apareceu primeiro.
+
+        Raises:
+            ValueError: Se `subset` não for uma lista válida de colunas do DataFrame, ou se
+                não coincidir com as colunas-chave do índice salvo.
+
+        Example:
+            >>> bot = Duplicatas(df_2016)
+            >>> bot.verificar_duplicatas_indexadas(['Country', 'Year'], 'cache/duplicatas.npz', origem='2016')
+        """
+        if not isinstance(subset, list) or not all(col in self.df.columns for col in subset):
+            raise ValueError("❌ O argumento 'subset' deve ser uma lista contendo colunas válidas do DataFrame.")
+
+        if os.path.exists(caminho_indice):
+            indice = IndiceDuplicatas.carregar(caminho_indice)
+            if indice.colunas_chave != subset:
+                raise ValueError(f"❌ O índice em '{caminho_indice}' usa as colunas-chave {indice.colunas_chave}.")
+        else:
+            indice = IndiceDuplicatas(subset)
+
+        relatorio = indice.atualizar(self.df, origem=origem)
+        indice.salvar(caminho_indice)
+
+        repetidas = relatorio['duplicada'].to_numpy()
+        duplicadas = self.df[repetidas].assign(origem_anterior=relatorio['origem_anterior'].to_numpy()[repetidas])
+        print(f"🔍 Registros desta entrega já vistos considerando {subset}: {len(duplicadas)} "
+              f"(índice com {len(indice)} chaves de {len(indice.fontes)} entregas)")
+        return duplicadas
+
+    def verificar_quase_duplicatas(self, tolerancia, colunas: list = None, subset: list = None) -> pd.DataFrame:
+        """
+        Identifica registros cujos valores numéricos coincidem com os de outro dentro de uma tolerância.
+
+        Cada valor é arredondado para uma grade de passo `tolerancia` e as linhas são
+        comparadas por um hash dos valores arredondados, numa única passada. Pega, por
+        exemplo, o mesmo registro reenviado com outro ano ou com pequenas diferenças de
+        arredondamento. Valores muito próximos que caem em lados opostos de uma fronteira
+        da grade não são considerados iguais.
+
+        Args:
+            tolerancia (float | dict): Passo da grade, único ou por coluna.
+            colunas (list, opcional): Colunas numéricas comparadas. O padrão (None) usa todas
+                as numéricas fora de `subset`.
+            subset (list, opcional): Colunas-chave, excluídas da comparação. O padrão é
+                ['Country', 'Year'].
+
+        Returns:
+            pd.DataFrame: Linhas quase duplicadas (a primeira ocorrência de cada grupo fica de fora).
+
+        Raises:
+            ValueError: Se `subset` não for uma lista válida de colunas do DataFrame, ou se
+                alguma tolerância não for positiva.
+        """
+        subset = ['Country', 'Year'] if subset is None else subset
+        if not isinstance(subset, list) or not all(col in self.df.columns for col in subset):
+            raise ValueError("❌ O argumento 'subset' deve ser uma lista contendo colunas válidas do DataFrame.")
+
+        indice = IndiceDuplicatas(subset, colunas, tolerancia)
+        relatorio = indice.atualizar(self.df)
+        quase = self.df[relatorio['quase_duplicada'].to_numpy()]
+        print(f"🔍 Registros quase duplicados (tolerância {tolerancia}): {len(quase)}")
+        return quase
     
     def contar_valores_unicos(self) -> pd.Series:
         """
@@ -79,7 +165,7 @@ class Duplicatas:
             dtype: int64
         """
 
-        valores_unicos = self.df.select_dtypes(exclude=['float', 'int']).nunique()
+        valores_unicos = self.df.select_dtypes(exclude='number').nunique()
         print("\n📊 Contagem de valores únicos por coluna categórica:")
         print(valores_unicos)
         return valores_unicos
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+
+class MapaAusentes:
+    """
+    Índice de valores ausentes com uma máscara de bits compactada por linha.
+
+    Os dados são percorridos uma única vez, coluna a coluna. Cada linha recebe uma
+    máscara de `ceil(colunas / 8)` bytes, com um bit por coluna ausente (3 bytes por
+    linha no dataset da OMS, contra 22 da matriz booleana de `df.isnull()`). Na mesma
+    passada são acumuladas as contagens por coluna e por grupo (ex.: país), de modo que
+    as consultas por coluna, por grupo e por padrão de ausência não voltam a ler o
+    DataFrame.
+
+    Attributes:
+        colunas (pd.Index): Colunas indexadas; o bit `j` da máscara corresponde a `colunas[j]`.
+        coluna_grupo (str): Coluna que define os grupos, ou None.
+        mascara (np.ndarray): Matriz uint8 (linhas x bytes) com os bits de ausência.
+        contagem_por_coluna (np.ndarray): Valores ausentes de cada coluna.
+        grupos (pd.Index): Rótulos dos grupos, em ordem crescente (vazio sem grupo).
+        contagem_por_grupo (np.ndarray): Matriz (grupos x colunas) de valores ausentes.
+    """
+
+    def __init__(self, df: pd.DataFrame, coluna_grupo: str = 'Country'):
+        """
+        Constrói o índice numa única passada pelas colunas.
+
+        Args:
+            df (pd.DataFrame): Dados analisados.
+            coluna_grupo (str, opcional): Coluna usada nas consultas por grupo. Se não
+                existir no DataFrame, apenas as consultas por grupo ficam indisponíveis.
+                O padrão é 'Country'.
+
+        Raises:
+            TypeError: Se `df` não for um DataFrame.
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
+
+        self.colunas = df.columns
+        self.coluna_grupo = coluna_grupo if coluna_grupo in df.columns else None
+        n_linhas, n_colunas = df.shape
+
+        if self.coluna_grupo is not None:
+            # Linhas sem grupo (código -1) ficam fora das contagens por grupo, como no groupby
+            codigos, self.grupos = pd.factorize(df[self.coluna_grupo], sort=True)
+            self._codigos = codigos
+            self.grupos.name = self.coluna_grupo
+        else:
+            self._codigos = None
+            self.grupos = pd.Index([])
+        com_grupo = None if self._codigos is None else self._codigos >= 0
+
+        self.mascara = np.zeros((n_linhas, (n_colunas + 7) // 8), dtype=np.uint8)
+        self.contagem_por_coluna = np.zeros(n_colunas, dtype=np.int64)
+        self.contagem_por_grupo = np.zeros((len(self.grupos), n_colunas), dtype=np.int64)
+        for j, col in enumerate(self.colunas):
+            ausentes = df.iloc[:, j].isna().to_numpy()
+            self.contagem_por_coluna[j] = np.count_nonzero(ausentes)
+            if not self.contagem_por_coluna[j]:
+                continue
+            self.mascara[:, j >> 3] |= ausentes.view(np.uint8) << (j & 7)
+            if com_grupo is not None:
+                self.contagem_por_grupo[:, j] = np.bincount(
+                    self._codigos[ausentes & com_grupo], minlength=len(self.grupos)
+                )
+
+    def _exigir_grupo(self) -> None:
+        if self.coluna_grupo is None:
+            raise KeyError("❌ O DataFrame deve conter a coluna de grupo (ex.: 'Country') para segmentação dos dados.")
+
+    def _bits(self, colunas: list) -> np.ndarray:
+        """Máscara de bytes com os bits das colunas informadas."""
+        alvo = np.zeros(self.mascara.shape[1], dtype=np.uint8)
+        for col in colunas:
+            if col not in self.colunas:
+                raise KeyError(f"❌ A coluna '{col}' não está no índice de valores ausentes.")
+            j = self.colunas.get_loc(col)
+            alvo[j >> 3] |= np.uint8(1 << (j & 7))
+        return alvo
+
+    def por_coluna(self) -> pd.Series:
+        """
+        Quantidade de valores ausentes em cada coluna.
+
+        Returns:
+            pd.Series: Contagem por coluna, na ordem das colunas do DataFrame.
+        """
+        return pd.Series(self.contagem_por_coluna, index=self.colunas)
+
+    def por_grupo(self) -> pd.DataFrame:
+        """
+        Quantidade de valores ausentes de cada coluna em cada grupo.
+
+        Returns:
+            pd.DataFrame: Matriz grupos x colunas, com os grupos em ordem crescente.
+
+        Raises:
+            KeyError: Se o DataFrame não tiver a coluna de grupo.
+        """
+        self._exigir_grupo()
+        return pd.DataFrame(self.contagem_por_grupo, index=self.grupos, columns=self.colunas)
+
+    def total_por_grupo(self) -> pd.Series:
+        """
+        Quantidade total de valores ausentes em cada grupo (somando todas as colunas).
+
+        Returns:
+            pd.Series: Contagem por grupo, com os grupos em ordem crescente.
+
+        Raises:
+            KeyError: Se o DataFrame não tiver a coluna de grupo.
+        """
+        self._exigir_grupo()
+        return pd.Series(self.contagem_por_grupo.sum(axis=1), index=self.grupos)
+
+    def linhas_com_ausentes(self, colunas: list = None, todas: bool = True) -> np.ndarray:
+        """
+        Seleciona as linhas com valores ausentes.
+
+        Args:
+            colunas (list, opcional): Colunas consideradas. O padrão (None) considera todas.
+            todas (bool, opcional): Se True, exige ausência em todas as `colunas`; se
+                False, basta uma delas. O padrão é True.
+
+        Returns:
+            np.ndarray: Máscara booleana das linhas.
+
+        Example:
+            >>> mapa.linhas_com_ausentes(['GDP', 'Population'])  # sem PIB e sem população
+        """
+        if colunas is None:
+            return self.mascara.any(axis=1)
+        alvo = self._bits(colunas)
+        if todas:
+            return ((self.mascara & alvo) == alvo).all(axis=1)
+        return (self.mascara & alvo).any(axis=1)
+
+    def grupos_com_ausentes(self) -> list:
+        """
+        Grupos com pelo menos um valor ausente, na ordem em que aparecem nos dados.
+
+        Returns:
+            list: Rótulos dos grupos.
+
+        Raises:
+            KeyError: Se o DataFrame não tiver a coluna de grupo.
+        """
+        self._exigir_grupo()
+        codigos = self._codigos[self.linhas_com_ausentes()]
+        return [self.grupos[c] for c in pd.unique(codigos[codigos >= 0])]
+
+    def _chaves_padrao(self) -> np.ndarray:
+        """Uma chave por linha identificando seu padrão de ausência."""
+        if self.mascara.shape[1] <= 8:
+            # Até 64 colunas, o padrão cabe num único inteiro de 64 bits
+            completa = np.zeros((self.mascara.shape[0], 8), dtype=np.uint8)
+            completa[:, :self.mascara.shape[1]] = self.mascara
+            return completa.view(np.uint64).ravel()
+        return np.ascontiguousarray(self.mascara).view(np.dtype((np.void, self.mascara.shape[1]))).ravel()
+
+    def padroes(self) -> pd.DataFrame:
+        """
+        Padrões distintos de ausência e quantas linhas seguem cada um.
+
+        Returns:
+            pd.DataFrame: Uma linha por padrão, do mais ao menos frequente, com a coluna
+            'linhas', a coluna 'colunas_ausentes' (quantidade) e uma coluna booleana por
+            coluna do DataFrame indicando se ela está ausente no padrão.
+        """
+        _, primeira, contagens = np.unique(self._chaves_padrao(), return_index=True, return_counts=True)
+        ordem = np.argsort(-contagens, kind='stable')
+        bits = np.unpackbits(self.mascara[primeira[ordem]], axis=1, bitorder='little')[:, :len(self.colunas)]
+        tabela = pd.DataFrame(bits.astype(bool), columns=self.colunas)
+        tabela.insert(0, 'colunas_ausentes', bits.sum(axis=1))
+        tabela.insert(0, 'linhas', contagens[ordem])
+        return tabela
+
+    def contar_padroes(self) -> int:
+        """
+        Quantidade de padrões distintos de ausência (incluindo o de linhas completas).
+
+        Returns:
+            int: Número de padrões.
+        """
+        return int(np.unique(self._chaves_padrao()).size)
+
+    def memoria_bytes(self) -> int:
+        """Memória ocupada pela máscara de bits, em bytes."""
+        return int(self.mascara.nbytes)
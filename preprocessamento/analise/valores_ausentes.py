@@ -1,5 +1,7 @@
 import pandas as pd
 
+from preprocessamento.analise.mapa_ausentes import MapaAusentes
+
 class AnaliseValoresAusentes:
     """
     Classe para análise de valores ausentes em um DataFrame do Pandas.
@@ -8,9 +10,14 @@ class AnaliseValoresAusentes:
     - Contar a quantidade de valores ausentes por coluna.
     - Identificar quais países possuem valores ausentes.
     - Contar a quantidade total de valores ausentes por país e ordená-los.
+    - Resumir os padrões distintos de ausência (quais colunas faltam juntas).
+
+    Todas as consultas são respondidas por um `MapaAusentes`, construído numa única
+    passada pelos dados, em vez de recalcular `df.isnull()` a cada análise.
 
     Attributes:
         df (pd.DataFrame): O DataFrame que será analisado.
+        mapa (MapaAusentes): Índice de valores ausentes do DataFrame.
     """
 
     def __init__(self, df: pd.DataFrame):
@@ -24,6 +31,7 @@ class AnaliseValoresAusentes:
             raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
 
         self.df = df
+        self.mapa = MapaAusentes(df)
     
     def contar_valores_ausentes(self) -> pd.Series:
         """
@@ -42,7 +50,7 @@ class AnaliseValoresAusentes:
             dtype: int64
         """
 
-        valores_ausentes = self.df.isnull().sum()
+        valores_ausentes = self.mapa.por_coluna()
         print("\n📉 Contagem de valores ausentes por coluna:")
         print(valores_ausentes)
         return valores_ausentes
@@ -60,7 +68,7 @@ class AnaliseValoresAusentes:
             ['Brazil', 'India', 'USA']
         """
 
-        paises_faltantes = self.df[self.df.isnull().any(axis=1)]['Country'].unique().tolist()
+        paises_faltantes = self.mapa.grupos_com_ausentes()
         print("\n🌍 Países com valores ausentes:", paises_faltantes)
         return paises_faltantes
     
@@ -81,10 +89,42 @@ class AnaliseValoresAusentes:
             dtype: int64
         """
 
-        valores_por_pais = self.df.isnull().groupby(self.df['Country']).sum().sum(axis=1).sort_values(ascending=False)
+        valores_por_pais = self.mapa.total_por_grupo().sort_values(ascending=False)
         print("\n📊 Valores ausentes por país (ordenados):")
         print(valores_por_pais)
         return valores_por_pais
+
+    def padroes_valores_ausentes(self, n_padroes: int = 10) -> pd.DataFrame:
+        """
+        Resume os padrões distintos de ausência: quais colunas faltam juntas, e em quantas linhas.
+
+        Args:
+            n_padroes (int, opcional): Quantidade de padrões mais frequentes exibidos.
+                O padrão é 10.
+
+        Returns:
+            pd.DataFrame: Padrões, do mais ao menos frequente, com as colunas 'linhas' e
+            'colunas' (lista das colunas ausentes no padrão).
+
+        Example:
+            >>> bot = AnaliseValoresAusentes(df)
+            >>> bot.padroes_valores_ausentes(3)
+
+            🧩 40 padrões distintos de valores ausentes. Mais frequentes:
+             linhas            colunas
+               1649                 []
+                445      [Hepatitis B]
+                222  [GDP, Population]
+        """
+        tabela = self.mapa.padroes()
+        colunas = self.mapa.colunas
+        padroes = pd.DataFrame({
+            'linhas': tabela['linhas'],
+            'colunas': [list(colunas[linha]) for linha in tabela[colunas].to_numpy()],
+        })
+        print(f"\n🧩 {len(padroes)} padrões distintos de valores ausentes. Mais frequentes:")
+        print(padroes.head(n_padroes).to_string(index=False))
+        return padroes
     
     def executar_analise_valores_ausentes(self) -> None:
         """
@@ -95,6 +135,7 @@ class AnaliseValoresAusentes:
         1. Contagem de valores ausentes em cada coluna (`contar_valores_ausentes()`).
         2. Identificação dos países que possuem pelo menos um valor ausente (`paises_com_valores_ausentes()`).
         3. Contagem total de valores ausentes por país e ordenação em ordem decrescente (`valores_ausentes_por_pais()`).
+        4. Resumo dos padrões distintos de ausência (`padroes_valores_ausentes()`).
         
         Esse pipeline permite uma visão completa sobre a distribuição de valores ausentes no dataset.
 
@@ -119,6 +160,9 @@ class AnaliseValoresAusentes:
             Brazil     8
             USA        6
             France     4
+
+            🧩 40 padrões distintos de valores ausentes. Mais frequentes:
+            ...
         """
         # Verifica se o DataFrame foi carregado corretamente antes de executar os métodos
         if not hasattr(self, 'df') or self.df is None:
@@ -127,3 +171,4 @@ class AnaliseValoresAusentes:
         self.contar_valores_ausentes()
         self.paises_com_valores_ausentes()
         self.valores_ausentes_por_pais()
+        self.padroes_valores_ausentes()
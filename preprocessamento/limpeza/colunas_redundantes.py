@@ -1,4 +1,6 @@
 import pandas as pd
+from pipeline.copia import copia_preguicosa
+from preprocessamento.limpeza.selecao_colunas import SelecaoColunas
 
 class RemovendoColunas:
     """
@@ -7,26 +9,43 @@ class RemovendoColunas:
     Esta classe permite:
     - Identificar e remover colunas desnecessárias do DataFrame.
     - Armazenar o DataFrame processado para futuras análises.
+
+    Por padrão, as colunas são escolhidas automaticamente (`SelecaoColunas`): clusters de
+    colunas colineares, com um representante por cluster, seguidos da remoção das de VIF
+    alto. Uma lista explícita de colunas substitui a seleção automática.
     
     Attributes:
         df (pd.DataFrame): O DataFrame original contendo os dados antes da remoção de colunas.
         cols_to_remove (list): Lista de colunas que serão removidas.
+        selecao (SelecaoColunas): Seleção automática usada, ou None com lista explícita.
     """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, colunas: list = None, alvo: str = 'Life expectancy ',
+                 limiar_correlacao: float = 0.7, limiar_vif: float = 5.0):
         """
         Inicializa a classe com um DataFrame.
 
         Args:
             df (pd.DataFrame): O DataFrame que será processado.
+            colunas (list, opcional): Colunas a remover. O padrão (None) as escolhe
+                automaticamente.
+            alvo (str, opcional): Coluna prevista pelo modelo, que nunca é removida e guia a
+                escolha do representante de cada cluster. O padrão é 'Life expectancy '.
+            limiar_correlacao (float, opcional): Correlação mínima, em módulo, entre colunas
+                de um mesmo cluster. O padrão é 0.7.
+            limiar_vif (float, opcional): VIF máximo aceito entre as colunas mantidas.
+                O padrão é 5.0.
         """
         if not isinstance(df, pd.DataFrame):
             raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
 
-        self.df = df.copy()  # Mantém os dados originais intactos
-        self.cols_to_remove = [' thinness 5-9 years', 'percentage expenditure', 
-                               'under-five deaths ', 'Diphtheria ', 
-                               'Income composition of resources']
+        self.df = copia_preguicosa(df)  # Mantém os dados originais intactos
+        if colunas is None:
+            self.selecao = SelecaoColunas(self.df, alvo, limiar_correlacao, limiar_vif)
+            self.cols_to_remove = self.selecao.selecionar()
+        else:
+            self.selecao = None
+            self.cols_to_remove = list(colunas)
     
     def remover_colunas(self) -> pd.DataFrame:
         """
@@ -50,6 +69,10 @@ class RemovendoColunas:
         
         df_processado = self.df.drop(colunas_presentes, axis=1)
         print(f"✅ Removidas as colunas: {colunas_presentes}")
+        if self.selecao is not None:
+            removidas = self.selecao.relatorio[self.selecao.relatorio['situacao'] != 'mantida']
+            for coluna, motivo in removidas['situacao'].items():
+                print(f"   • {coluna.strip()}: {motivo}")
         return df_processado
     
     def executar_remover_colunas(self) -> pd.DataFrame:
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from preprocessamento.outliers.detectores import agrupar_linhas
+
+
+def preencher_lacunas_temporais(valores: np.ndarray, chaves: pd.Series, tempo: pd.Series,
+                                lacuna_maxima: int) -> tuple:
+    """
+    Preenche lacunas curtas de cada série por interpolação linear ao longo do tempo.
+
+    As linhas são ordenadas por (grupo, ano) e, para cada valor ausente, são localizadas
+    as observações válidas anterior e posterior do mesmo grupo. O valor é interpolado
+    linearmente pelo ano apenas quando ambas existem e a lacuna entre elas tem no máximo
+    `lacuna_maxima` anos consecutivos. Ausentes no início ou no fim da série, ou em
+    lacunas maiores, permanecem NaN para a etapa KNN.
+
+    Args:
+        valores (np.ndarray): Matriz numérica (linhas x colunas) com NaN nos ausentes.
+        chaves (pd.Series): Coluna que identifica cada série (ex.: 'Country').
+        tempo (pd.Series): Coluna temporal (ex.: 'Year').
+        lacuna_maxima (int): Maior número de anos consecutivos ausentes a interpolar.
+
+    Returns:
+        tuple: (nova matriz com as lacunas preenchidas, número de células preenchidas).
+
+    Example:
+        >>> valores, n = preencher_lacunas_temporais(X, df['Country'], df['Year'], 2)
+    """
+    preenchido = np.array(valores, dtype=np.float64)
+    ordem, grupo_por_linha, inicios, fins = agrupar_linhas(chaves, tempo)
+    if ordem.size == 0 or lacuna_maxima <= 0:
+        return preenchido, 0
+
+    bloco = preenchido[ordem]
+    anos = tempo.to_numpy(dtype=np.float64)[ordem]
+    ausentes = np.isnan(bloco)
+    if not ausentes.any():
+        return preenchido, 0
+
+    n_linhas = bloco.shape[0]
+    posicoes = np.arange(n_linhas)[:, None]
+    anterior = np.maximum.accumulate(np.where(ausentes, -1, posicoes), axis=0)
+    posterior = np.minimum.accumulate(np.where(ausentes, n_linhas, posicoes)[::-1], axis=0)[::-1]
+
+    internos = (
+        ausentes
+        & (anterior >= inicios[grupo_por_linha][:, None])
+        & (posterior < fins[grupo_por_linha][:, None])
+    )
+    linhas, colunas = np.nonzero(internos)
+    p = anterior[linhas, colunas]
+    q = posterior[linhas, colunas]
+
+    # Anos ausentes entre as duas observações válidas que cercam a lacuna
+    curtas = (anos[q] - anos[p] - 1) <= lacuna_maxima
+    linhas, colunas, p, q = linhas[curtas], colunas[curtas], p[curtas], q[curtas]
+
+    inclinacao = (bloco[q, colunas] - bloco[p, colunas]) / (anos[q] - anos[p])
+    bloco[linhas, colunas] = bloco[p, colunas] + inclinacao * (anos[linhas] - anos[p])
+
+    preenchido[ordem] = bloco
+    return preenchido, int(linhas.size)
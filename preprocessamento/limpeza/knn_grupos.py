@@ -0,0 +1,101 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def _imputar_grupos(tarefa: tuple) -> list:
+    """
+    Imputa um lote de grupos, cada um com sua própria cópia do imputador.
+
+    Colunas sem nenhum valor observado no grupo ficam fora do ajuste (o imputador
+    descartaria essas colunas) e permanecem NaN, para serem preenchidas pelo pool global.
+
+    Args:
+        tarefa (tuple): (prototipo, blocos), onde `prototipo` é o imputador ainda não
+            ajustado e `blocos` a lista de matrizes de cada grupo.
+
+    Returns:
+        list: Matrizes imputadas, na mesma ordem de `blocos`.
+    """
+    prototipo, blocos = tarefa
+    resultados = []
+    for bloco in blocos:
+        resultado = bloco.copy()
+        com_dados = ~np.isnan(bloco).all(axis=0)
+        if np.isnan(bloco[:, com_dados]).any():
+            imputer = copy.deepcopy(prototipo)
+            resultado[:, com_dados] = imputer.fit_transform(bloco[:, com_dados])
+        resultados.append(resultado)
+    return resultados
+
+
+def imputar_por_grupo(X: np.ndarray, chaves: pd.DataFrame, prototipo, min_doadores: int,
+                      n_workers: int = 1) -> tuple:
+    """
+    Imputa `X` restringindo a busca de doadoras às linhas do mesmo grupo.
+
+    Cada grupo é imputado de forma independente. Os valores de uma coluna num grupo com
+    menos de `min_doadores` linhas observadas nessa coluna, bem como as linhas com chave
+    nula, são imputados com o pool global (o imputador ajustado em todo `X`).
+
+    Args:
+        X (np.ndarray): Matriz numérica (linhas x colunas) com NaN nos valores ausentes.
+        chaves (pd.DataFrame): Colunas que definem os grupos, alinhadas às linhas de `X`.
+        prototipo: Imputador ainda não ajustado (`KNNImputer` ou `ImputadorKNNIndexado`),
+            copiado para cada grupo.
+        min_doadores (int): Número mínimo de doadoras por coluna para imputar no grupo.
+        n_workers (int, opcional): Número de processos usados para imputar os grupos.
+            O padrão é 1.
+
+    Returns:
+        tuple: (matriz imputada, número de células preenchidas pelo pool global).
+    """
+    X = np.array(X, dtype=np.float64)
+    ausentes = np.isnan(X)
+    codigos = (
+        chaves.groupby(list(chaves.columns), sort=False, dropna=True, observed=True)
+        .ngroup()
+        .fillna(-1)
+        .to_numpy(dtype=np.intp)
+    )
+
+    validas = np.flatnonzero(codigos >= 0)
+    ordem = validas[np.argsort(codigos[validas], kind='stable')]
+    cortes = np.flatnonzero(np.diff(codigos[ordem])) + 1
+    grupos = np.split(ordem, cortes) if ordem.size else []
+
+    # Apenas grupos com algum valor ausente precisam ser imputados
+    grupos = [linhas for linhas in grupos if ausentes[linhas].any()]
+    blocos = [X[linhas] for linhas in grupos]
+
+    n_lotes = max(1, min(n_workers, len(blocos)))
+    lotes = [(prototipo, blocos[i::n_lotes]) for i in range(n_lotes)]
+    if n_workers > 1 and len(blocos) > 1:
+        with ProcessPoolExecutor(max_workers=n_lotes) as executor:
+            resultados_lotes = list(executor.map(_imputar_grupos, lotes))
+    else:
+        resultados_lotes = [_imputar_grupos(lote) for lote in lotes]
+
+    # Desfaz a distribuição round-robin dos grupos entre os lotes
+    resultados = [None] * len(blocos)
+    for i, resultados_lote in enumerate(resultados_lotes):
+        resultados[i::n_lotes] = resultados_lote
+
+    global_ = np.zeros(X.shape, dtype=bool)
+    global_[np.flatnonzero(codigos < 0)] = True
+    imputado = X.copy()
+    for linhas, resultado in zip(grupos, resultados):
+        imputado[linhas] = resultado
+        poucas_doadoras = (~ausentes[linhas]).sum(axis=0) < min_doadores
+        global_[np.ix_(linhas, poucas_doadoras)] = True
+
+    global_ &= ausentes
+    linhas_globais = np.flatnonzero(global_.any(axis=1))
+    if linhas_globais.size:
+        imputer_global = copy.deepcopy(prototipo).fit(X)
+        preenchido = imputer_global.transform(X[linhas_globais])
+        imputado[linhas_globais] = np.where(global_[linhas_globais], preenchido, imputado[linhas_globais])
+
+    return imputado, int(global_.sum())
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+
+class ImputadorKNNIndexado:
+    """
+    Imputador KNN com busca de vizinhos indexada, alternativo ao `sklearn.impute.KNNImputer`.
+
+    O `KNNImputer` calcula a distância nan-euclidiana de cada linha incompleta para todas as
+    linhas candidatas, o que cresce quadraticamente com o número de linhas. Este imputador
+    agrupa as linhas incompletas pelo seu padrão de valores ausentes e, para cada padrão e
+    coluna a imputar, constrói uma KD-Tree sobre as doadoras que possuem todas as colunas
+    observadas do padrão e a coluna alvo. As consultas são feitas em lotes limitados por
+    um orçamento de memória.
+
+    Para essas doadoras, a distância nan-euclidiana é proporcional à distância euclidiana
+    nas colunas observadas, então os vizinhos e a média uniforme imputada coincidem com os
+    do `KNNImputer`. A diferença é que doadoras com alguma coluna observada do padrão
+    ausente não são consideradas.
+
+    Attributes:
+        n_neighbors (int): Número de vizinhos considerados.
+        memoria_maxima_mb (float): Memória máxima de trabalho por lote de consultas, em MB.
+        leaf_size (int): Tamanho das folhas das KD-Trees.
+        dados_ (np.ndarray): Linhas usadas como conjunto de doadoras (definido em `fit`).
+        medias_ (np.ndarray): Médias das colunas, usadas quando não há doadoras elegíveis
+            (definido em `fit`).
+    """
+
+    def __init__(self, n_neighbors: int = 20, memoria_maxima_mb: float = 256, leaf_size: int = 40):
+        """
+        Inicializa o imputador.
+
+        Args:
+            n_neighbors (int, opcional): Número de vizinhos considerados. O padrão é 20.
+            memoria_maxima_mb (float, opcional): Memória máxima de trabalho por lote de
+                consultas, em MB. O padrão é 256.
+            leaf_size (int, opcional): Tamanho das folhas das KD-Trees. O padrão é 40.
+        """
+        if not isinstance(n_neighbors, int) or n_neighbors <= 0:
+            raise ValueError("❌ O número de vizinhos deve ser um inteiro positivo.")
+        if memoria_maxima_mb <= 0:
+            raise ValueError("❌ A memória máxima deve ser positiva.")
+
+        self.n_neighbors = n_neighbors
+        self.memoria_maxima_mb = memoria_maxima_mb
+        self.leaf_size = leaf_size
+        self._indices = OrderedDict()
+        self._bytes_indices = 0
+
+    def fit(self, X: np.ndarray) -> 'ImputadorKNNIndexado':
+        """
+        Guarda `X` como conjunto de doadoras e calcula as médias das colunas.
+
+        Args:
+            X (np.ndarray): Matriz numérica (linhas x colunas) com NaN nos valores ausentes.
+
+        Returns:
+            ImputadorKNNIndexado: A própria instância.
+        """
+        self.dados_ = np.array(X, dtype=np.float64)
+        self._observados = ~np.isnan(self.dados_)
+        with np.errstate(invalid='ignore'):
+            self.medias_ = np.nanmean(self.dados_, axis=0) if self.dados_.size else np.zeros(self.dados_.shape[1])
+        self._indices = OrderedDict()
+        self._bytes_indices = 0
+        return self
+
+    def _indice(self, observadas: np.ndarray, alvo: int) -> tuple:
+        """
+        Retorna o índice das doadoras de uma coluna alvo, construindo-o sob demanda.
+
+        As doadoras elegíveis têm todas as colunas `observadas` e a coluna `alvo` preenchidas.
+        Colunas alvo com o mesmo conjunto de doadoras compartilham a mesma KD-Tree. As
+        árvores ficam em cache (reaproveitadas entre chamadas de `transform` e persistidas
+        junto com o imputador), descartando as menos usadas quando o tamanho dos dados
+        indexados passa de `memoria_maxima_mb`.
+
+        Args:
+            observadas (np.ndarray): Máscara booleana das colunas observadas no padrão.
+            alvo (int): Coluna a ser imputada.
+
+        Returns:
+            tuple: (KDTree, valores da coluna alvo nas doadoras), ou (None, None) se não
+            houver doadoras elegíveis.
+        """
+        elegiveis = self._observados[:, observadas].all(axis=1) & self._observados[:, alvo]
+        if not elegiveis.any():
+            return None, None
+
+        chave = (observadas.tobytes(), np.packbits(elegiveis).tobytes())
+        if chave in self._indices:
+            self._indices.move_to_end(chave)
+        else:
+            pontos = self.dados_[np.ix_(elegiveis, observadas)]
+            self._indices[chave] = KDTree(pontos, leaf_size=self.leaf_size)
+            self._bytes_indices += pontos.nbytes
+            while self._bytes_indices > self.memoria_maxima_mb * 1024 ** 2 and len(self._indices) > 1:
+                _, antiga = self._indices.popitem(last=False)
+                self._bytes_indices -= antiga.data.nbytes
+        return self._indices[chave], self.dados_[elegiveis, alvo]
+
+    def transform(self, X: np.ndarray, copiar: bool = True) -> np.ndarray:
+        """
+        Imputa os valores ausentes de `X` com a média das doadoras mais próximas.
+
+        Linhas sem nenhuma coluna observada, ou sem doadoras elegíveis, recebem a média
+        da coluna, como no `KNNImputer`.
+
+        Args:
+            X (np.ndarray): Matriz numérica com as mesmas colunas usadas em `fit`.
+            copiar (bool, opcional): Se False e `X` já for um array float64, os valores
+                são preenchidos no próprio `X`. O padrão é True.
+
+        Returns:
+            np.ndarray: Matriz com os valores ausentes preenchidos.
+
+        Raises:
+            AttributeError: Se o imputador ainda não tiver sido ajustado.
+        """
+        if not hasattr(self, 'dados_'):
+            raise AttributeError("❌ O imputador precisa ser ajustado com `fit` antes de `transform`.")
+
+        X = np.array(X, dtype=np.float64) if copiar else np.asarray(X, dtype=np.float64)
+        ausentes = np.isnan(X)
+        incompletas = np.flatnonzero(ausentes.any(axis=1))
+        if incompletas.size == 0:
+            return X
+
+        orcamento = self.memoria_maxima_mb * 1024 ** 2
+        padroes, padrao_por_linha = np.unique(ausentes[incompletas], axis=0, return_inverse=True)
+        padrao_por_linha = padrao_por_linha.ravel()
+
+        for p, padrao in enumerate(padroes):
+            linhas = incompletas[padrao_por_linha == p]
+            observadas = ~padrao
+
+            for alvo in np.flatnonzero(padrao):
+                arvore, valores = self._indice(observadas, alvo) if observadas.any() else (None, None)
+                if arvore is None:
+                    X[linhas, alvo] = self.medias_[alvo]
+                    continue
+
+                k = min(self.n_neighbors, valores.size)
+                # Por linha consultada: k distâncias, k índices e k valores (8 bytes cada)
+                tamanho_lote = max(1, int(orcamento // (24 * k)))
+                for inicio in range(0, linhas.size, tamanho_lote):
+                    lote = linhas[inicio:inicio + tamanho_lote]
+                    vizinhos = arvore.query(X[np.ix_(lote, observadas)], k=k, return_distance=False)
+                    X[lote, alvo] = valores[vizinhos].mean(axis=1)
+
+        return X
+
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        Ajusta o imputador em `X` e imputa seus valores ausentes.
+
+        Args:
+            X (np.ndarray): Matriz numérica com NaN nos valores ausentes.
+
+        Returns:
+            np.ndarray: Nova matriz com os valores ausentes preenchidos.
+        """
+        return self.fit(X).transform(X)
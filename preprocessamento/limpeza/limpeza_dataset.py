@@ -1,7 +1,21 @@
+import os
+
+import joblib
 import pandas as pd
 import numpy as np
+import sklearn
 from sklearn.impute import KNNImputer
 
+from preprocessamento.limpeza.interpolacao_temporal import preencher_lacunas_temporais
+from preprocessamento.limpeza.knn_grupos import imputar_por_grupo
+from preprocessamento.limpeza.knn_indexado import ImputadorKNNIndexado
+from pipeline.instrumentacao import medir
+from pipeline.copia import copia_preguicosa
+
+BACKENDS_KNN = ('sklearn', 'indexado')
+# Um país tem no máximo 16 anos no dataset: exigir mais doadoras mandaria tudo ao pool global
+MIN_DOADORES_PADRAO = 5
+
 class PreenchendoKNN:
     """
     Classe para imputação de valores ausentes usando K-Nearest Neighbors (KNN).
@@ -14,13 +28,36 @@ class PreenchendoKNN:
     - Aplicar KNN Imputer para preencher valores ausentes em colunas numéricas.
     - Manter a estrutura original do DataFrame.
     - Evitar a imputação de colunas categóricas.
+    - Escolher o backend de busca de vizinhos: força bruta (`KNNImputer`) ou indexado por
+      KD-Tree (`ImputadorKNNIndexado`), que escala para centenas de milhares de linhas.
+    - Restringir as doadoras ao mesmo grupo (ex.: 'Country' ou 'Status'), com os grupos
+      imputados em paralelo e recurso ao pool global quando faltam doadoras.
+    - Persistir o imputador ajustado em disco e, nas execuções seguintes, imputar apenas as
+      linhas novas ou alteradas (`transform`), reajustando conforme a política definida.
+    - Preencher antes lacunas curtas de cada país por interpolação ao longo de 'Year',
+      deixando para o KNN apenas os buracos restantes.
 
     Attributes:
         df (pd.DataFrame): O DataFrame original contendo valores ausentes.
         n_neighbors (int): Número de vizinhos considerados no algoritmo KNN.
+        backend (str): Backend de busca de vizinhos ('sklearn' ou 'indexado').
+        memoria_maxima_mb (float): Memória máxima de trabalho por lote de consultas, em MB.
+        agrupar_por (list): Colunas que restringem a busca de doadoras, ou None.
+        min_doadores (int): Mínimo de doadoras por coluna para imputar dentro do grupo.
+        n_workers (int): Número de processos usados na imputação por grupo.
+        caminho_estado (str): Arquivo com o estado persistido do imputador, ou None.
+        chaves_estado (list): Colunas que identificam cada linha no estado persistido.
+        reajustar_apos (float): Fração de linhas novas, desde o último ajuste, que força
+            um novo ajuste completo.
+        lacuna_maxima (int): Maior lacuna, em anos consecutivos, preenchida por interpolação
+            temporal antes do KNN (0 desativa a etapa).
+        relatorio_preenchimento (dict): Células preenchidas por cada etapa na última imputação.
     """
 
-    def __init__(self, df: pd.DataFrame, n_neighbors: int = 20):
+    def __init__(self, df: pd.DataFrame, n_neighbors: int = 20, backend: str = 'sklearn',
+                 memoria_maxima_mb: float = 256, agrupar_por=None, min_doadores: int = None,
+                 n_workers: int = 1, caminho_estado: str = None, chaves_estado: list = None,
+                 reajustar_apos: float = 0.2, lacuna_maxima: int = 0):
         """
         Inicializa a classe com um DataFrame e configura o KNN Imputer.
 
@@ -28,15 +65,91 @@ class PreenchendoKNN:
             df (pd.DataFrame): O DataFrame que será processado.
             n_neighbors (int, opcional): Número de vizinhos considerados para imputação.
                 O padrão é 20.
+            backend (str, opcional): 'sklearn' usa o `KNNImputer` (distâncias para todas as
+                linhas); 'indexado' usa KD-Trees por padrão de valores ausentes, com
+                resultado numericamente comparável. O padrão é 'sklearn'.
+            memoria_maxima_mb (float, opcional): Memória máxima de trabalho, em MB, usada
+                para dimensionar os lotes de consulta. O padrão é 256.
+            agrupar_por (str | list, opcional): Coluna(s) que definem os grupos de doadoras,
+                como 'Country', 'Status' ou uma coluna de região. O padrão (None) usa todo
+                o dataset como pool de doadoras.
+            min_doadores (int, opcional): Se um grupo tiver menos linhas observadas do que
+                isso numa coluna, os valores ausentes dessa coluna no grupo são imputados
+                com o pool global. O padrão é `min(n_neighbors, 5)`, adequado a grupos
+                pequenos como a série anual de um país.
+            n_workers (int, opcional): Número de processos usados para imputar os grupos.
+                O padrão é 1.
+            caminho_estado (str, opcional): Arquivo onde o imputador ajustado, as chaves e os
+                valores imputados são salvos. Se o arquivo existir e for compatível, apenas
+                as linhas novas ou alteradas são imputadas, sem novo ajuste. O padrão (None)
+                desativa a persistência.
+            chaves_estado (list, opcional): Colunas que identificam unicamente cada linha.
+                O padrão é ['Country', 'Year'].
+            reajustar_apos (float, opcional): Quando as linhas novas acumuladas desde o
+                último ajuste passam dessa fração das linhas ajustadas, o imputador é
+                reajustado com todo o dataset. Use 0 para sempre reajustar. O padrão é 0.2.
+            lacuna_maxima (int, opcional): Lacunas de até esse número de anos consecutivos,
+                dentro da série de um país, são preenchidas por interpolação linear ao longo
+                de 'Year' antes do KNN. O padrão (0) desativa essa etapa. Sobre a saída de
+                `Outlier` com `interpolar_ausentes=True`, as lacunas internas já estão
+                interpoladas e não sobra nada para esta etapa; no pipeline, `Outlier` roda
+                com `interpolar_ausentes=False` quando ela está ativa.
         """
         if not isinstance(df, pd.DataFrame):
             raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
         if not isinstance(n_neighbors, int) or n_neighbors <= 0:
             raise ValueError("❌ O número de vizinhos deve ser um inteiro positivo.")
+        if backend not in BACKENDS_KNN:
+            raise ValueError(f"❌ O backend deve ser um dos seguintes: {BACKENDS_KNN}.")
+        if isinstance(agrupar_por, str):
+            agrupar_por = [agrupar_por]
+        if agrupar_por is not None and not set(agrupar_por).issubset(df.columns):
+            raise KeyError(f"❌ O DataFrame deve conter as colunas {agrupar_por} para agrupar as doadoras.")
+        if min_doadores is not None and (not isinstance(min_doadores, int) or min_doadores <= 0):
+            raise ValueError("❌ O número mínimo de doadoras deve ser um inteiro positivo.")
+        if not isinstance(n_workers, int) or n_workers <= 0:
+            raise ValueError("❌ O número de workers deve ser um inteiro positivo.")
+        chaves_estado = chaves_estado if chaves_estado is not None else ['Country', 'Year']
+        if caminho_estado is not None:
+            if agrupar_por is not None:
+                raise ValueError("❌ A persistência do imputador não é compatível com `agrupar_por`.")
+            if not set(chaves_estado).issubset(df.columns):
+                raise KeyError(f"❌ O DataFrame deve conter as colunas {chaves_estado} para identificar as linhas.")
+        if reajustar_apos < 0:
+            raise ValueError("❌ A fração para reajuste deve ser maior ou igual a zero.")
+        if not isinstance(lacuna_maxima, int) or lacuna_maxima < 0:
+            raise ValueError("❌ A lacuna máxima deve ser um inteiro maior ou igual a zero.")
+        if lacuna_maxima > 0 and not {'Country', 'Year'}.issubset(df.columns):
+            raise KeyError("❌ O DataFrame deve conter as colunas 'Country' e 'Year' para a interpolação temporal.")
 
-        self.df = df.copy()  # Mantém os dados originais intactos
+        self.df = copia_preguicosa(df)  # Mantém os dados originais intactos
         self.n_neighbors = n_neighbors
-        self.imputer = KNNImputer(n_neighbors=self.n_neighbors)
+        self.backend = backend
+        self.memoria_maxima_mb = memoria_maxima_mb
+        self.agrupar_por = agrupar_por
+        self.min_doadores = min_doadores if min_doadores is not None else min(n_neighbors, MIN_DOADORES_PADRAO)
+        self.n_workers = n_workers
+        self.caminho_estado = caminho_estado
+        self.chaves_estado = list(chaves_estado)
+        self.reajustar_apos = reajustar_apos
+        self.lacuna_maxima = lacuna_maxima
+        self.relatorio_preenchimento = {}
+        self.imputer = self._criar_imputer(backend)
+
+    def _criar_imputer(self, backend: str):
+        """
+        Cria o imputador correspondente ao backend escolhido.
+
+        Args:
+            backend (str): 'sklearn' ou 'indexado'.
+
+        Returns:
+            KNNImputer | ImputadorKNNIndexado: Imputador configurado.
+        """
+        if backend == 'indexado':
+            return ImputadorKNNIndexado(n_neighbors=self.n_neighbors,
+                                        memoria_maxima_mb=self.memoria_maxima_mb)
+        return KNNImputer(n_neighbors=self.n_neighbors)
     
     def imputar_valores(self) -> pd.DataFrame:
         """
@@ -55,17 +168,150 @@ class PreenchendoKNN:
             >>> df_imputado = bot.imputar_valores()
         """
 
-        # Seleciona apenas colunas numéricas
-        colunas_numericas = self.df.select_dtypes(exclude='object').columns
+        # Seleciona apenas colunas numéricas (chaves categóricas ficam de fora)
+        colunas_numericas = self.df.select_dtypes(include='number').columns
         if colunas_numericas.empty:
             raise ValueError("❌ O DataFrame não possui colunas numéricas para imputação.")
 
-        df_imputado = self.df.copy()
-        df_imputado.loc[:, colunas_numericas] = self.imputer.fit_transform(self.df[colunas_numericas])
+        valores = self.df[colunas_numericas].to_numpy(dtype=np.float64)
+        preenchidos_interpolacao = 0
+        if self.lacuna_maxima > 0:
+            with medir('PreenchendoKNN.interpolacao_temporal', linhas=len(valores)):
+                valores, preenchidos_interpolacao = preencher_lacunas_temporais(
+                    valores, self.df['Country'], self.df['Year'], self.lacuna_maxima
+                )
+        preenchidos_knn = int(np.isnan(valores).sum())
 
+        with sklearn.config_context(working_memory=self.memoria_maxima_mb), \
+                medir('PreenchendoKNN.knn', linhas=len(valores), backend=self.backend):
+            if self.caminho_estado is not None:
+                valores = self._imputar_com_estado(list(colunas_numericas), valores)
+            elif self.agrupar_por is None:
+                valores = self.imputer.fit_transform(valores)
+            else:
+                valores, preenchidos_globais = imputar_por_grupo(
+                    valores, self.df[self.agrupar_por], self.imputer, self.min_doadores, self.n_workers,
+                )
+                print(f"🔎 Doadoras restritas por {self.agrupar_por}; "
+                      f"{preenchidos_globais} valores imputados com o pool global.")
+                if preenchidos_knn and preenchidos_globais == preenchidos_knn:
+                    print(f"⚠️ Nenhum grupo de {self.agrupar_por} tem {self.min_doadores} doadoras por coluna: "
+                          f"todos os valores foram imputados com o pool global. Reduza `min_doadores`.")
+
+        df_imputado = copia_preguicosa(self.df)
+        for j, col in enumerate(colunas_numericas):
+            # Colunas float mantêm a precisão do esquema de leitura; inteiras passam a float64
+            destino = self.df[col].dtype if self.df[col].dtype.kind == 'f' else np.float64
+            df_imputado[col] = valores[:, j].astype(destino, copy=False)
+
+        self.relatorio_preenchimento = {'interpolacao': preenchidos_interpolacao, 'knn': preenchidos_knn}
+        if self.lacuna_maxima > 0:
+            print(f"📈 Interpolação temporal (lacunas de até {self.lacuna_maxima} anos): "
+                  f"{preenchidos_interpolacao} valores; KNN: {preenchidos_knn} valores.")
         print(f"✅ Imputação KNN aplicada com sucesso utilizando {self.n_neighbors} vizinhos.")
         return df_imputado
     
+    def _imputar_com_estado(self, colunas: list, valores: np.ndarray) -> np.ndarray:
+        """
+        Imputa as colunas numéricas reaproveitando o estado persistido em `caminho_estado`.
+
+        Linhas cujas chaves já estão no estado e cujos valores originais não mudaram
+        recebem os valores imputados salvos. As demais são imputadas com `transform`
+        sobre o imputador salvo, sem novo ajuste. Um ajuste completo (`fit_transform`)
+        é feito quando não há estado, quando ele é incompatível (colunas, backend,
+        número de vizinhos ou lacuna máxima diferentes) ou quando as linhas novas
+        acumuladas passam de `reajustar_apos` (ou sempre, se `reajustar_apos` for 0).
+
+        Args:
+            colunas (list): Colunas numéricas a serem imputadas.
+            valores (np.ndarray): Valores dessas colunas, alinhados às linhas de `self.df`.
+
+        Returns:
+            np.ndarray: Matriz imputada, alinhada às linhas de `self.df`.
+
+        Raises:
+            ValueError: Se as chaves de `chaves_estado` não identificarem unicamente as linhas.
+        """
+        chaves = pd.MultiIndex.from_frame(self.df[self.chaves_estado])
+        if not chaves.is_unique:
+            raise ValueError(f"❌ As colunas {self.chaves_estado} não identificam unicamente as linhas.")
+
+        assinaturas = pd.util.hash_pandas_object(pd.DataFrame(valores), index=False).to_numpy()
+        estado = self._carregar_estado(colunas)
+
+        if estado is not None:
+            posicoes = estado['chaves'].get_indexer(chaves)
+            conhecidas = posicoes >= 0
+            conhecidas[conhecidas] = estado['assinaturas'][posicoes[conhecidas]] == assinaturas[conhecidas]
+            novas = int((~conhecidas).sum())
+            acumuladas = estado['linhas_novas'] + novas
+            # Com `reajustar_apos=0`, o estado nunca é reaproveitado: sempre há novo ajuste
+            if self.reajustar_apos > 0 and acumuladas <= self.reajustar_apos * estado['linhas_ajuste']:
+                imputado = valores.copy()
+                imputado[conhecidas] = estado['imputados'][posicoes[conhecidas]]
+                if novas:
+                    imputado[~conhecidas] = estado['imputer'].transform(valores[~conhecidas])
+
+                estado.update(chaves=chaves, assinaturas=assinaturas, imputados=imputado,
+                              linhas_novas=acumuladas)
+                self.imputer = estado['imputer']
+                self._salvar_estado(estado)
+                print(f"♻️ Estado do imputador reaproveitado: {int(conhecidas.sum())} linhas já imputadas, "
+                      f"{novas} linhas novas ou alteradas imputadas sem novo ajuste.")
+                return imputado
+
+        imputado = self.imputer.fit_transform(valores)
+        self._salvar_estado({
+            'colunas': colunas, 'backend': self.backend, 'n_neighbors': self.n_neighbors,
+            'lacuna_maxima': self.lacuna_maxima, 'imputer': self.imputer, 'chaves': chaves,
+            'assinaturas': assinaturas, 'imputados': imputado, 'linhas_ajuste': len(valores), 'linhas_novas': 0,
+        })
+        print(f"💾 Imputador ajustado com {len(valores)} linhas e salvo em '{self.caminho_estado}'.")
+        return imputado
+
+    def _carregar_estado(self, colunas: list):
+        """
+        Carrega o estado persistido, se existir e for compatível com a configuração atual.
+
+        Args:
+            colunas (list): Colunas numéricas a serem imputadas.
+
+        Returns:
+            dict | None: O estado salvo, ou None se for preciso um novo ajuste.
+        """
+        if not os.path.exists(self.caminho_estado):
+            return None
+
+        estado = joblib.load(self.caminho_estado)
+        compativel = (
+            estado.get('colunas') == colunas
+            and estado.get('backend') == self.backend
+            and estado.get('n_neighbors') == self.n_neighbors
+            # A interpolação temporal muda os valores entregues ao KNN e as assinaturas das linhas
+            and estado.get('lacuna_maxima') == self.lacuna_maxima
+        )
+        if not compativel:
+            print("⚠️ O estado salvo do imputador é incompatível com a configuração atual; reajustando.")
+            return None
+        return estado
+
+    def _salvar_estado(self, estado: dict) -> None:
+        """
+        Salva o estado do imputador em `caminho_estado`, criando o diretório se necessário.
+
+        A escrita é feita num arquivo temporário e depois renomeada, para que uma
+        interrupção não deixe um estado corrompido.
+
+        Args:
+            estado (dict): Estado a ser persistido.
+        """
+        diretorio = os.path.dirname(self.caminho_estado)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        temporario = f"{self.caminho_estado}.tmp"
+        joblib.dump(estado, temporario)
+        os.replace(temporario, self.caminho_estado)
+
     def executar_limpeza_dados(self) -> pd.DataFrame:
         """
         Executa o pipeline de imputação de valores ausentes no dataset.
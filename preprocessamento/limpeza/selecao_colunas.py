@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+from analise_exploratoria.correlacao_streaming import correlacionar
+
+
+def agrupar_colineares(correlacao: pd.DataFrame, limiar: float = 0.7) -> list:
+    """
+    Agrupa as colunas em clusters de colinearidade.
+
+    Usa agrupamento hierárquico de ligação completa sobre a distância `1 - |r|`: dentro de
+    um cluster, todos os pares têm `|r| >= limiar`, o que evita juntar A e C só porque
+    ambos se correlacionam com B. Pares com correlação indefinida (NaN) contam como não
+    correlacionados.
+
+    Args:
+        correlacao (pd.DataFrame): Matriz de correlação quadrada.
+        limiar (float, opcional): Correlação mínima, em módulo, entre membros de um
+            cluster. O padrão é 0.7.
+
+    Returns:
+        list: Clusters (listas de colunas, na ordem da matriz), inclusive os de uma só coluna.
+    """
+    from scipy.cluster.hierarchy import fcluster, linkage
+    from scipy.spatial.distance import squareform
+
+    colunas = list(correlacao.columns)
+    if len(colunas) < 2:
+        return [[col] for col in colunas]
+
+    distancia = 1 - np.abs(np.nan_to_num(correlacao.to_numpy(dtype=np.float64)))
+    distancia = np.clip((distancia + distancia.T) / 2, 0.0, 1.0)
+    np.fill_diagonal(distancia, 0.0)
+    rotulos = fcluster(linkage(squareform(distancia, checks=False), method='complete'),
+                       t=1 - limiar, criterion='distance')
+
+    clusters = {}
+    for col, rotulo in zip(colunas, rotulos):
+        clusters.setdefault(rotulo, []).append(col)
+    return sorted(clusters.values(), key=lambda cluster: colunas.index(cluster[0]))
+
+
+def remover_por_vif(correlacao: pd.DataFrame, limiar: float = 5.0, fixas: list = ()) -> tuple:
+    """
+    Remove, uma a uma, as colunas com maior fator de inflação da variância (VIF) acima do limiar.
+
+    O VIF de cada coluna é o elemento da diagonal da inversa da matriz de correlação. A
+    inversa é calculada uma única vez; a cada remoção ela é atualizada por uma correção de
+    posto um, sem nova inversão:
+
+        P' = P[-j, -j] - P[-j, j] P[j, -j] / P[j, j]
+
+    o que custa O(colunas²) por remoção, em vez de O(colunas³).
+
+    Colunas em `fixas` nunca são removidas, mas continuam na matriz: a redundância das
+    demais é medida também em relação a elas.
+
+    Args:
+        correlacao (pd.DataFrame): Matriz de correlação das colunas candidatas.
+        limiar (float, opcional): VIF máximo aceito. O padrão é 5.0.
+        fixas (list, opcional): Colunas que entram no cálculo mas não podem ser removidas.
+
+    Returns:
+        tuple: (colunas removidas, na ordem de remoção; pd.Series com o VIF final das
+        colunas mantidas).
+    """
+    colunas = list(correlacao.columns)
+    matriz = np.nan_to_num(correlacao.to_numpy(dtype=np.float64))
+    np.fill_diagonal(matriz, 1.0)
+    # Uma pequena regularização mantém a matriz invertível com colinearidade exata
+    inversa = np.linalg.inv(matriz + 1e-9 * np.eye(len(colunas)))
+
+    removidas = []
+    while colunas:
+        vif = np.diag(inversa)
+        vif = np.where(vif > 0, vif, np.inf)
+        vif = np.where([col in fixas for col in colunas], -np.inf, vif)
+        pior = int(np.argmax(vif))
+        if vif[pior] <= limiar:
+            break
+        removidas.append(colunas.pop(pior))
+        manter = np.arange(len(vif)) != pior
+        coluna = inversa[manter, pior]
+        inversa = inversa[np.ix_(manter, manter)] - np.outer(coluna, coluna) / inversa[pior, pior]
+
+    return removidas, pd.Series(np.diag(inversa), index=colunas, dtype=np.float64)
+
+
+class SelecaoColunas:
+    """
+    Seleção automática de colunas redundantes a partir da matriz de correlação.
+
+    Em duas fases:
+    1. Agrupa as colunas numéricas em clusters de colinearidade (`agrupar_colineares`) e
+       mantém um representante por cluster: a coluna mais correlacionada com o alvo (ou,
+       sem alvo, a mais correlacionada com o restante do cluster). Num cluster com colunas
+       protegidas, todas elas são mantidas no lugar do representante.
+    2. Entre os representantes, remove iterativamente os de maior VIF acima do limiar
+       (`remover_por_vif`), o que pega redundâncias entre várias colunas que nenhum par,
+       isoladamente, revela. As protegidas entram no cálculo do VIF, mas nunca saem.
+
+    O alvo não entra nos clusters, e nem ele nem as colunas protegidas são removidos.
+
+    Attributes:
+        df (pd.DataFrame): Dados analisados.
+        alvo (str): Coluna prevista pelo modelo, ou None.
+        limiar_correlacao (float): Correlação mínima, em módulo, dentro de um cluster.
+        limiar_vif (float): VIF máximo aceito.
+        protegidas (list): Colunas que nunca são removidas.
+        clusters (list): Clusters encontrados (após `selecionar`).
+        relatorio (pd.DataFrame): Situação de cada coluna candidata (após `selecionar`).
+    """
+
+    def __init__(self, df: pd.DataFrame, alvo: str = 'Life expectancy ', limiar_correlacao: float = 0.7,
+                 limiar_vif: float = 5.0, protegidas: list = None, metodo: str = 'pearson'):
+        """
+        Inicializa a seleção.
+
+        Args:
+            df (pd.DataFrame): Dados analisados; só as colunas numéricas são candidatas.
+            alvo (str, opcional): Coluna prevista pelo modelo. O padrão é 'Life expectancy '.
+            limiar_correlacao (float, opcional): Correlação mínima, em módulo, entre membros
+                de um cluster. O padrão é 0.7.
+            limiar_vif (float, opcional): VIF máximo aceito. O padrão é 5.0.
+            protegidas (list, opcional): Colunas que nunca são removidas.
+            metodo (str, opcional): 'pearson' ou 'spearman'. O padrão é 'pearson'.
+
+        Raises:
+            TypeError: Se `df` não for um DataFrame.
+            ValueError: Se algum limiar estiver fora do intervalo válido.
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
+        if not 0 < limiar_correlacao <= 1:
+            raise ValueError("❌ O limiar de correlação deve estar entre 0 e 1.")
+        if limiar_vif < 1:
+            raise ValueError("❌ O limiar de VIF deve ser maior ou igual a 1.")
+
+        self.df = df
+        self.alvo = alvo if alvo in df.columns else None
+        self.limiar_correlacao = limiar_correlacao
+        self.limiar_vif = limiar_vif
+        self.protegidas = list(protegidas or [])
+        self.metodo = metodo
+        self.clusters = []
+        self.relatorio = None
+
+    def _mantidas(self, cluster: list, correlacao: pd.DataFrame) -> list:
+        """Colunas mantidas de um cluster: todas as protegidas ou, sem elas, o representante."""
+        protegidas = [col for col in cluster if col in self.protegidas]
+        if protegidas:
+            return protegidas
+        if self.alvo is not None:
+            forca = correlacao.loc[cluster, self.alvo].abs()
+        else:
+            forca = correlacao.loc[cluster, cluster].abs().sum(axis=1)
+        # idxmax devolve a primeira coluna em caso de empate (ou se tudo for NaN, após o fillna)
+        return [forca.fillna(-1).idxmax()]
+
+    def selecionar(self) -> list:
+        """
+        Escolhe as colunas a remover.
+
+        Returns:
+            list: Colunas redundantes, na ordem do DataFrame.
+        """
+        correlacao = correlacionar(self.df, self.metodo)
+        candidatas = [col for col in correlacao.columns if col != self.alvo]
+        self.clusters = agrupar_colineares(correlacao.loc[candidatas, candidatas], self.limiar_correlacao)
+
+        situacao = {}
+        representantes = []
+        for cluster in self.clusters:
+            mantidas = self._mantidas(cluster, correlacao)
+            representantes.extend(mantidas)
+            for col in cluster:
+                if col not in mantidas:
+                    # Com várias protegidas no cluster, cita a mais correlacionada com a coluna
+                    mantida = correlacao.loc[col, mantidas].abs().fillna(-1).idxmax()
+                    situacao[col] = f"colinear com '{mantida}' (|r| = {abs(correlacao.loc[col, mantida]):.2f})"
+
+        removidas_vif, vif = remover_por_vif(correlacao.loc[representantes, representantes], self.limiar_vif,
+                                             fixas=self.protegidas)
+        for col in removidas_vif:
+            situacao[col] = f"VIF acima de {self.limiar_vif:g}"
+
+        self.relatorio = pd.DataFrame({
+            'cluster': [next(i for i, c in enumerate(self.clusters) if col in c) for col in candidatas],
+            'vif': [vif.get(col, np.nan) for col in candidatas],
+            'situacao': [situacao.get(col, 'mantida') for col in candidatas],
+        }, index=pd.Index(candidatas, name='coluna'))
+        return [col for col in self.df.columns if col in situacao]
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.impute import KNNImputer
+
+from preprocessamento.limpeza.interpolacao_temporal import preencher_lacunas_temporais
+from preprocessamento.limpeza.knn_indexado import ImputadorKNNIndexado
+from preprocessamento.outliers.detectores import indexar_painel, normalizar_detector, tratar_fatia
+from pipeline.instrumentacao import medir
+
+BACKENDS_FUNDIDO = ('sklearn', 'indexado')
+
+
+class TratamentoFundido:
+    """
+    Classe que funde o tratamento de outliers e a imputação KNN em uma única etapa.
+
+    Em vez de `Outlier` e `PreenchendoKNN` copiarem e percorrerem o DataFrame cada um por
+    sua vez, as colunas numéricas são copiadas uma única vez para um buffer float64
+    contíguo, ordenado por país. A detecção de outliers, a interpolação e a imputação
+    KNN são aplicadas sobre esse buffer, e o DataFrame final é montado apenas no fim.
+
+    O resultado equivale a executar `Outlier(df).tratar_outliers()` seguido de
+    `PreenchendoKNN(...).imputar_valores()` com a mesma configuração; com `lacuna_maxima`,
+    a `Outlier(df, interpolar_ausentes=False)` seguido de
+    `PreenchendoKNN(..., lacuna_maxima=lacuna_maxima)`, como no pipeline.
+
+    Funcionalidades:
+    - Detectar outliers por país com os detectores de `preprocessamento.outliers.detectores`.
+    - Substituir outliers por NaN e interpolar linearmente dentro de cada país.
+    - Opcionalmente, deixar os ausentes originais para a interpolação de lacunas curtas
+      ao longo de 'Year' (`lacuna_maxima`).
+    - Imputar os valores restantes com KNN (`KNNImputer` ou `ImputadorKNNIndexado`).
+
+    Attributes:
+        df (pd.DataFrame): O DataFrame original (não é copiado nem modificado).
+        detector (tuple): Detector padrão, como (nome, parametros).
+        detectores_por_coluna (dict): Detectores específicos por coluna.
+        dtype_deteccao (np.dtype): Precisão da matriz usada na detecção.
+        n_neighbors (int): Número de vizinhos considerados no KNN.
+        backend (str): Backend de busca de vizinhos ('sklearn' ou 'indexado').
+        memoria_maxima_mb (float): Memória máxima de trabalho do KNN, em MB.
+        lacuna_maxima (int): Maior lacuna, em anos, interpolada antes do KNN (0 desativa).
+        relatorio_preenchimento (dict): Células ausentes na entrada preenchidas por cada
+            etapa na última execução (com `lacuna_maxima`).
+    """
+
+    def __init__(self, df: pd.DataFrame, detector='zscore', detectores_por_coluna: dict = None,
+                 dtype_deteccao=np.float64, n_neighbors: int = 20, backend: str = 'sklearn',
+                 memoria_maxima_mb: float = 256, lacuna_maxima: int = 0):
+        """
+        Inicializa a classe com um DataFrame e a configuração das duas etapas.
+
+        Args:
+            df (pd.DataFrame): O DataFrame que será processado.
+            detector (str | tuple, opcional): Detector padrão de outliers. O padrão é 'zscore'.
+            detectores_por_coluna (dict, opcional): Detectores específicos por coluna.
+            dtype_deteccao (np.dtype, opcional): Precisão da matriz usada na detecção.
+                O padrão é `np.float64`.
+            n_neighbors (int, opcional): Número de vizinhos do KNN. O padrão é 20.
+            backend (str, opcional): 'sklearn' ou 'indexado'. O padrão é 'sklearn'.
+            memoria_maxima_mb (float, opcional): Memória máxima de trabalho do KNN, em MB.
+                O padrão é 256.
+            lacuna_maxima (int, opcional): Se positivo, a interpolação do tratamento de
+                outliers preenche só os outliers; os valores ausentes na entrada passam pela
+                interpolação de lacunas de até esse número de anos e, o que sobrar, pelo
+                KNN, ao custo de uma cópia a mais do buffer. O padrão (0) interpola todas
+                as lacunas junto com os outliers.
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
+        if not isinstance(n_neighbors, int) or n_neighbors <= 0:
+            raise ValueError("❌ O número de vizinhos deve ser um inteiro positivo.")
+        if backend not in BACKENDS_FUNDIDO:
+            raise ValueError(f"❌ O backend deve ser um dos seguintes: {BACKENDS_FUNDIDO}.")
+        if not isinstance(lacuna_maxima, int) or lacuna_maxima < 0:
+            raise ValueError("❌ A lacuna máxima deve ser um inteiro maior ou igual a zero.")
+        if lacuna_maxima > 0 and 'Year' not in df.columns:
+            raise KeyError("❌ O DataFrame deve conter a coluna 'Year' para a interpolação temporal.")
+
+        self.df = df  # Somente leitura: o resultado é montado a partir do buffer
+        self.detector = normalizar_detector(detector)
+        self.detectores_por_coluna = {
+            col: normalizar_detector(det) for col, det in (detectores_por_coluna or {}).items()
+        }
+        self.dtype_deteccao = np.dtype(dtype_deteccao)
+        self.n_neighbors = n_neighbors
+        self.backend = backend
+        self.memoria_maxima_mb = memoria_maxima_mb
+        self.lacuna_maxima = lacuna_maxima
+        self.relatorio_preenchimento = {}
+
+    def tratar_e_imputar(self) -> pd.DataFrame:
+        """
+        Trata outliers e imputa valores ausentes em uma única passada sobre o buffer.
+
+        Returns:
+            pd.DataFrame: Novo DataFrame, na ordem original das linhas, com os outliers
+            tratados e sem valores ausentes nas colunas numéricas.
+
+        Raises:
+            KeyError: Se a coluna 'Country' não estiver presente no DataFrame.
+            ValueError: Se não houver colunas numéricas para processar.
+
+        Example:
+            >>> etapa = TratamentoFundido(df, backend='indexado')
+            >>> df_limpo = etapa.tratar_e_imputar()
+        """
+        if 'Country' not in self.df.columns:
+            raise KeyError("❌ O DataFrame deve conter a coluna 'Country' para segmentação dos dados.")
+
+        colunas_numericas = self.df.select_dtypes(include='number').columns
+        if colunas_numericas.empty:
+            raise ValueError("❌ O DataFrame não possui colunas numéricas para análise.")
+
+        tempo = self.df['Year'] if 'Year' in self.df.columns else None
+        ordem, grupo_por_linha, inicios, fins, indice_temporal = indexar_painel(self.df['Country'], tempo)
+
+        # Linhas sem país não passam pelo tratamento de outliers, mas são imputadas
+        sem_grupo = np.setdiff1d(np.arange(len(self.df)), ordem, assume_unique=True)
+        ordem_buffer = np.concatenate([ordem, sem_grupo])
+
+        # Única cópia dos dados: buffer contíguo ordenado por país
+        buffer = np.empty((len(self.df), colunas_numericas.size), dtype=np.float64)
+        for j, col in enumerate(colunas_numericas):
+            buffer[:, j] = self.df[col].to_numpy(dtype=np.float64)[ordem_buffer]
+
+        ausentes = np.isnan(buffer) if self.lacuna_maxima > 0 else None
+        if ordem.size:
+            with medir('TratamentoFundido.tratar_fatia', linhas=ordem.size):
+                tratar_fatia(buffer[:ordem.size], indice_temporal, grupo_por_linha, inicios, fins,
+                             [self.detectores_por_coluna.get(col, self.detector) for col in colunas_numericas],
+                             self.dtype_deteccao, inplace=True)
+        print("✅ Outliers removidos e interpolação aplicada com sucesso.")
+
+        if self.lacuna_maxima > 0:
+            # Como `Outlier(interpolar_ausentes=False)`: o que já faltava volta a NaN
+            buffer[ausentes] = np.nan
+            with medir('TratamentoFundido.interpolacao_temporal', linhas=len(buffer)):
+                buffer[:], preenchidos_interpolacao = preencher_lacunas_temporais(
+                    buffer, self.df['Country'].iloc[ordem_buffer], self.df['Year'].iloc[ordem_buffer],
+                    self.lacuna_maxima,
+                )
+            self.relatorio_preenchimento = {'interpolacao': preenchidos_interpolacao,
+                                            'knn': int(np.isnan(buffer).sum())}
+            print(f"📈 Interpolação temporal (lacunas de até {self.lacuna_maxima} anos): "
+                  f"{preenchidos_interpolacao} valores; KNN: {self.relatorio_preenchimento['knn']} valores.")
+
+        with sklearn.config_context(working_memory=self.memoria_maxima_mb), \
+                medir('TratamentoFundido.knn', linhas=len(buffer), backend=self.backend):
+            if self.backend == 'indexado':
+                imputer = ImputadorKNNIndexado(n_neighbors=self.n_neighbors,
+                                               memoria_maxima_mb=self.memoria_maxima_mb)
+                imputer.fit(buffer).transform(buffer, copiar=False)
+            else:
+                buffer[:] = KNNImputer(n_neighbors=self.n_neighbors).fit_transform(buffer)
+        print(f"✅ Imputação KNN aplicada com sucesso utilizando {self.n_neighbors} vizinhos.")
+
+        colunas = {}
+        for col in self.df.columns:
+            if col in colunas_numericas:
+                j = colunas_numericas.get_loc(col)
+                # Colunas inteiras passam a float64, como em `Outlier`
+                destino = self.df[col].dtype if self.df[col].dtype.kind == 'f' else np.float64
+                valores = np.empty(len(self.df), dtype=destino)
+                valores[ordem_buffer] = buffer[:, j]
+                colunas[col] = valores
+            else:
+                colunas[col] = self.df[col]
+        return pd.DataFrame(colunas, index=self.df.index)
+
+    def executar_tratamento_fundido(self) -> pd.DataFrame:
+        """
+        Executa a etapa fundida de tratamento de outliers e imputação KNN.
+
+        Este método encapsula a chamada de `tratar_e_imputar()`, substituindo a execução
+        sequencial de `Outlier.executar_outliers()` e `PreenchendoKNN.executar_limpeza_dados()`.
+
+        Returns:
+            pd.DataFrame: DataFrame processado.
+
+        Example:
+            >>> etapa = TratamentoFundido(df)
+            >>> df_limpo = etapa.executar_tratamento_fundido()
+        """
+        return self.tratar_e_imputar()
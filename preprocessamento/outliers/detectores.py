@@ -0,0 +1,365 @@
+import numpy as np
+import pandas as pd
+
+# Registro de detectores disponíveis: nome -> função de detecção
+DETECTORES = {}
+
+
+def registrar_detector(nome: str):
+    """
+    Decorador que registra uma função de detecção de outliers em `DETECTORES`.
+
+    Toda função registrada recebe o bloco ordenado por (país, ano), o índice do grupo
+    de cada linha, os limites de cada grupo e os parâmetros do detector, e devolve uma
+    máscara booleana com o mesmo formato do bloco.
+
+    Args:
+        nome (str): Nome pelo qual o detector será referenciado.
+
+    Example:
+        >>> @registrar_detector('meu_detector')
+        ... def detectar_meu(bloco, grupo_por_linha, inicios, fins, limiar=2.0):
+        ...     ...
+    """
+    def decorador(funcao):
+        DETECTORES[nome] = funcao
+        return funcao
+    return decorador
+
+
+def normalizar_detector(detector) -> tuple:
+    """
+    Converte a configuração de um detector para o formato (nome, parametros).
+
+    Args:
+        detector (str | tuple): Nome do detector ou tupla (nome, parametros).
+
+    Returns:
+        tuple: (nome, parametros).
+
+    Raises:
+        ValueError: Se o detector não estiver registrado.
+    """
+    nome, parametros = (detector, {}) if isinstance(detector, str) else detector
+    if nome not in DETECTORES:
+        raise ValueError(f"❌ Detector '{nome}' desconhecido. Disponíveis: {sorted(DETECTORES)}.")
+    return nome, dict(parametros)
+
+
+def agrupar_linhas(chaves: pd.Series, tempo: pd.Series = None) -> tuple:
+    """
+    Ordena as linhas por grupo e calcula os limites de cada bloco contíguo.
+
+    Sem `tempo`, a ordem relativa das linhas dentro de cada grupo é preservada (ordenação
+    estável). Com `tempo`, as linhas de cada grupo são ordenadas pela coluna temporal.
+    Linhas cuja chave é nula não pertencem a nenhum grupo e ficam de fora da ordenação.
+
+    Args:
+        chaves (pd.Series): Coluna usada para segmentar os dados (ex.: 'Country').
+        tempo (pd.Series, opcional): Coluna temporal usada para ordenar cada grupo (ex.: 'Year').
+
+    Returns:
+        tuple: (ordem, grupo_por_linha, inicios, fins), onde `ordem` são as posições das
+        linhas ordenadas por grupo, `grupo_por_linha` o índice do grupo de cada linha
+        ordenada e `inicios`/`fins` os limites (fim exclusivo) de cada bloco.
+    """
+    codigos, _ = pd.factorize(chaves, sort=False)
+    validas = np.flatnonzero(codigos >= 0)
+    if tempo is None:
+        ordem = validas[np.argsort(codigos[validas], kind='stable')]
+    else:
+        ordem = validas[np.lexsort((tempo.to_numpy()[validas], codigos[validas]))]
+    grupos = codigos[ordem]
+
+    contagens = np.bincount(grupos) if grupos.size else np.zeros(0, dtype=np.intp)
+    fins = np.cumsum(contagens)
+    inicios = fins - contagens
+    grupo_por_linha = np.repeat(np.arange(contagens.size), contagens)
+    return ordem, grupo_por_linha, inicios, fins
+
+
+def indexar_painel(chaves: pd.Series, tempo: pd.Series = None) -> tuple:
+    """
+    Calcula a ordenação por grupo e o índice temporal usados pelo núcleo de outliers.
+
+    Args:
+        chaves (pd.Series): Coluna usada para segmentar os dados (ex.: 'Country').
+        tempo (pd.Series, opcional): Coluna temporal (ex.: 'Year').
+
+    Returns:
+        tuple: (ordem, grupo_por_linha, inicios, fins, indice_temporal), onde os quatro
+        primeiros vêm de `agrupar_linhas(chaves)` e `indice_temporal` dá, para cada linha
+        na ordem (grupo, ano), sua posição no bloco agrupado.
+    """
+    ordem, grupo_por_linha, inicios, fins = agrupar_linhas(chaves)
+    ordem_temporal = agrupar_linhas(chaves, tempo)[0]
+    posicao_no_bloco = np.empty(len(chaves), dtype=np.intp)
+    posicao_no_bloco[ordem] = np.arange(ordem.size)
+    return ordem, grupo_por_linha, inicios, fins, posicao_no_bloco[ordem_temporal]
+
+
+def interpolar_por_grupo(bloco: np.ndarray, grupo_por_linha: np.ndarray,
+                         inicios: np.ndarray, fins: np.ndarray, inplace: bool = False) -> np.ndarray:
+    """
+    Aplica interpolação linear posicional a cada coluna, sem cruzar limites de grupo.
+
+    Equivale a `Series.interpolate(method='linear')` aplicado a cada grupo: valores
+    ausentes entre duas observações são interpolados, os ausentes ao final do grupo
+    repetem a última observação e os ausentes no início permanecem NaN.
+
+    Args:
+        bloco (np.ndarray): Matriz (linhas x colunas) já ordenada por grupo.
+        grupo_por_linha (np.ndarray): Índice do grupo de cada linha do bloco.
+        inicios (np.ndarray): Posição inicial de cada grupo.
+        fins (np.ndarray): Posição final (exclusiva) de cada grupo.
+        inplace (bool, opcional): Se True, escreve o resultado no próprio `bloco`.
+
+    Returns:
+        np.ndarray: Matriz com os valores ausentes interpolados (o próprio `bloco` se
+        `inplace=True`).
+    """
+    n_linhas = bloco.shape[0]
+    ausentes = np.isnan(bloco)
+    resultado = bloco if inplace else bloco.copy()
+    if not ausentes.any():
+        return resultado
+
+    posicoes = np.arange(n_linhas)[:, None]
+    anterior = np.maximum.accumulate(np.where(ausentes, -1, posicoes), axis=0)
+    posterior = np.minimum.accumulate(np.where(ausentes, n_linhas, posicoes)[::-1], axis=0)[::-1]
+
+    inicio_linha = inicios[grupo_por_linha][:, None]
+    fim_linha = fins[grupo_por_linha][:, None]
+    tem_anterior = ausentes & (anterior >= inicio_linha)
+    tem_posterior = tem_anterior & (posterior < fim_linha)
+
+    # Só células ausentes são escritas e só células válidas são lidas, então o cálculo
+    # pode ser feito sobre o próprio bloco quando `inplace=True`.
+
+    # Ausentes ao final do grupo repetem a última observação válida
+    linhas, colunas = np.nonzero(tem_anterior)
+    resultado[linhas, colunas] = bloco[anterior[linhas, colunas], colunas]
+
+    # Ausentes entre duas observações: mesma fórmula usada por np.interp
+    linhas, colunas = np.nonzero(tem_posterior)
+    p = anterior[linhas, colunas]
+    q = posterior[linhas, colunas]
+    inclinacao = (bloco[q, colunas] - bloco[p, colunas]) / (q - p)
+    resultado[linhas, colunas] = inclinacao * (linhas - p) + bloco[p, colunas]
+    return resultado
+
+
+def _quantil_por_grupo(bloco: np.ndarray, grupo_por_linha: np.ndarray,
+                       inicios: np.ndarray, fins: np.ndarray, q: float) -> np.ndarray:
+    """
+    Calcula o quantil `q` de cada coluna dentro de cada grupo, ignorando NaN.
+
+    Usa a mesma interpolação linear de `np.nanquantile`. Grupos sem valores válidos
+    resultam em NaN.
+
+    Returns:
+        np.ndarray: Matriz (grupos x colunas) com os quantis.
+    """
+    n_grupos = inicios.size
+    resultado = np.full((n_grupos, bloco.shape[1]), np.nan)
+
+    for j in range(bloco.shape[1]):
+        coluna = bloco[:, j]
+        # Ordena por (grupo, valor); os NaN ficam no final de cada grupo
+        ordenada = coluna[np.lexsort((coluna, grupo_por_linha))]
+        n_validos = np.bincount(grupo_por_linha, weights=~np.isnan(coluna), minlength=n_grupos).astype(np.intp)
+
+        com_dados = n_validos > 0
+        posicao = (n_validos[com_dados] - 1) * q
+        baixo = np.floor(posicao).astype(np.intp)
+        alto = np.ceil(posicao).astype(np.intp)
+        v_baixo = ordenada[inicios[com_dados] + baixo]
+        v_alto = ordenada[inicios[com_dados] + alto]
+        resultado[com_dados, j] = v_baixo + (v_alto - v_baixo) * (posicao - baixo)
+
+    return resultado
+
+
+@registrar_detector('zscore')
+def detectar_zscore(bloco: np.ndarray, grupo_por_linha: np.ndarray,
+                    inicios: np.ndarray, fins: np.ndarray, limiar: float = 3.0) -> np.ndarray:
+    """
+    Marca como outliers os valores com |Z-Score| acima do limiar dentro do grupo.
+
+    Reproduz a semântica de `scipy.stats.zscore` (ddof=0): um grupo com qualquer NaN na
+    coluna, ou com desvio padrão zero, não tem outliers marcados.
+    """
+    tamanhos = (fins - inicios)[:, None]
+    medias = np.add.reduceat(bloco, inicios, axis=0) / tamanhos
+    desvios = bloco - medias[grupo_por_linha]
+    std = np.sqrt(np.add.reduceat(desvios * desvios, inicios, axis=0) / tamanhos)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.abs(desvios / std[grupo_por_linha]) > limiar
+
+
+@registrar_detector('mad')
+def detectar_mad(bloco: np.ndarray, grupo_por_linha: np.ndarray,
+                 inicios: np.ndarray, fins: np.ndarray, limiar: float = 3.5) -> np.ndarray:
+    """
+    Marca como outliers os valores cujo Z-Score modificado (mediana/MAD) excede o limiar.
+
+    O Z-Score modificado é 0.6745 * (x - mediana) / MAD, calculado por grupo ignorando
+    NaN. Grupos com MAD igual a zero não têm outliers marcados.
+    """
+    medianas = _quantil_por_grupo(bloco, grupo_por_linha, inicios, fins, 0.5)
+    desvios = bloco - medianas[grupo_por_linha]
+    mad = _quantil_por_grupo(np.abs(desvios), grupo_por_linha, inicios, fins, 0.5)
+    mad[mad == 0] = np.nan
+
+    with np.errstate(invalid='ignore'):
+        return np.abs(0.6745 * desvios / mad[grupo_por_linha]) > limiar
+
+
+@registrar_detector('iqr')
+def detectar_iqr(bloco: np.ndarray, grupo_por_linha: np.ndarray,
+                 inicios: np.ndarray, fins: np.ndarray, fator: float = 1.5) -> np.ndarray:
+    """
+    Marca como outliers os valores fora das cercas de Tukey [Q1 - fator*IQR, Q3 + fator*IQR].
+
+    Os quartis são calculados por grupo, ignorando NaN.
+    """
+    q1 = _quantil_por_grupo(bloco, grupo_por_linha, inicios, fins, 0.25)
+    q3 = _quantil_por_grupo(bloco, grupo_por_linha, inicios, fins, 0.75)
+    iqr = q3 - q1
+    inferior = (q1 - fator * iqr)[grupo_por_linha]
+    superior = (q3 + fator * iqr)[grupo_por_linha]
+
+    with np.errstate(invalid='ignore'):
+        return (bloco < inferior) | (bloco > superior)
+
+
+@registrar_detector('zscore_movel')
+def detectar_zscore_movel(bloco: np.ndarray, grupo_por_linha: np.ndarray,
+                          inicios: np.ndarray, fins: np.ndarray, janela: int = 5,
+                          limiar: float = 3.0, min_vizinhos: int = 3) -> np.ndarray:
+    """
+    Marca como outliers os valores distantes da média de seus vizinhos temporais.
+
+    Para cada linha, considera a janela centrada de `janela` anos consecutivos do mesmo
+    grupo (o bloco deve estar ordenado por ano dentro de cada grupo), excluindo o próprio
+    valor, e calcula o Z-Score (ddof=0) em relação à média e ao desvio dos vizinhos.
+    Linhas com menos de `min_vizinhos` vizinhos válidos não são marcadas.
+    """
+    if not isinstance(janela, int) or janela < 3:
+        raise ValueError("❌ A janela do Z-Score móvel deve ser um inteiro maior ou igual a 3.")
+
+    n_linhas = bloco.shape[0]
+    validos = ~np.isnan(bloco)
+    valores = np.where(validos, bloco, 0.0)
+    posicoes = np.arange(n_linhas)
+    inicio_linha = inicios[grupo_por_linha]
+    fim_linha = fins[grupo_por_linha]
+
+    # Pares (linha, vizinho) de cada deslocamento da janela que não cruzam o limite do grupo
+    pares = []
+    for deslocamento in range(-(janela // 2), janela // 2 + 1):
+        vizinho = posicoes + deslocamento
+        no_grupo = (vizinho >= inicio_linha) & (vizinho < fim_linha)
+        if deslocamento != 0:
+            pares.append((posicoes[no_grupo], vizinho[no_grupo]))
+
+    n = np.zeros(bloco.shape)
+    soma = np.zeros(bloco.shape)
+    for linhas, origem in pares:
+        n[linhas] += validos[origem]
+        soma[linhas] += valores[origem]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = soma / n
+        soma_quadrados = np.zeros(bloco.shape)
+        for linhas, origem in pares:
+            desvio = np.where(validos[origem], valores[origem] - media[linhas], 0.0)
+            soma_quadrados[linhas] += desvio * desvio
+
+        std = np.sqrt(soma_quadrados / n)
+        z = (bloco - media) / std
+        z[(n < min_vizinhos) | (std == 0)] = np.nan
+        return np.abs(z) > limiar
+
+
+def detectar_outliers(bloco: np.ndarray, grupo_por_linha: np.ndarray, inicios: np.ndarray,
+                      fins: np.ndarray, detectores_por_coluna: list) -> np.ndarray:
+    """
+    Núcleo vetorizado comum a todos os detectores.
+
+    As colunas que usam o mesmo detector (com os mesmos parâmetros) são processadas juntas,
+    em uma única chamada sobre o sub-bloco correspondente, e as máscaras resultantes são
+    combinadas em uma matriz com o formato do bloco.
+
+    Args:
+        bloco (np.ndarray): Matriz (linhas x colunas) ordenada por (grupo, ano).
+        grupo_por_linha (np.ndarray): Índice do grupo de cada linha do bloco.
+        inicios (np.ndarray): Posição inicial de cada grupo.
+        fins (np.ndarray): Posição final (exclusiva) de cada grupo.
+        detectores_por_coluna (list): Para cada coluna do bloco, uma tupla
+            (nome_do_detector, parametros).
+
+    Returns:
+        np.ndarray: Máscara booleana com os outliers detectados.
+
+    Raises:
+        ValueError: Se algum detector não estiver registrado.
+    """
+    if bloco.shape[0] == 0:
+        return np.zeros(bloco.shape, dtype=bool)
+
+    lotes = {}
+    for j, (nome, parametros) in enumerate(detectores_por_coluna):
+        if nome not in DETECTORES:
+            raise ValueError(f"❌ Detector '{nome}' desconhecido. Disponíveis: {sorted(DETECTORES)}.")
+        chave = (nome, tuple(sorted(parametros.items())))
+        lotes.setdefault(chave, []).append(j)
+
+    if len(lotes) == 1:
+        # Um único detector para todas as colunas: usa o bloco inteiro, sem copiar colunas
+        (nome, parametros), = lotes
+        return DETECTORES[nome](bloco, grupo_por_linha, inicios, fins, **dict(parametros))
+
+    mascara = np.zeros(bloco.shape, dtype=bool)
+    for (nome, parametros), colunas in lotes.items():
+        mascara[:, colunas] = DETECTORES[nome](
+            bloco[:, colunas], grupo_por_linha, inicios, fins, **dict(parametros)
+        )
+    return mascara
+
+
+def tratar_fatia(bloco: np.ndarray, indice_temporal: np.ndarray, grupo_por_linha: np.ndarray,
+                 inicios: np.ndarray, fins: np.ndarray, detectores_por_coluna: list,
+                 dtype_deteccao=np.float64, inplace: bool = False) -> np.ndarray:
+    """
+    Detecta os outliers de um conjunto de grupos, substitui-os por NaN e interpola.
+
+    Como todas as operações são locais a cada grupo, o resultado de uma fatia de grupos
+    é idêntico ao trecho correspondente do processamento do bloco inteiro.
+
+    Args:
+        bloco (np.ndarray): Matriz (linhas x colunas) em float64, agrupada na ordem
+            original das linhas de cada grupo.
+        indice_temporal (np.ndarray): Para cada linha da ordem (grupo, ano), sua posição
+            em `bloco`.
+        grupo_por_linha (np.ndarray): Índice do grupo de cada linha do bloco.
+        inicios (np.ndarray): Posição inicial de cada grupo.
+        fins (np.ndarray): Posição final (exclusiva) de cada grupo.
+        detectores_por_coluna (list): Para cada coluna, uma tupla (nome_do_detector, parametros).
+        dtype_deteccao (np.dtype, opcional): Precisão da matriz usada na detecção.
+        inplace (bool, opcional): Se True, trata o próprio `bloco` em vez de uma cópia.
+
+    Returns:
+        np.ndarray: Matriz, na ordem de `bloco`, com outliers tratados e interpolados.
+    """
+    mascara_temporal = detectar_outliers(
+        bloco[indice_temporal].astype(dtype_deteccao, copy=False),
+        grupo_por_linha, inicios, fins, detectores_por_coluna,
+    )
+    outliers = np.zeros_like(mascara_temporal)
+    outliers[indice_temporal] = mascara_temporal
+
+    tratado = bloco if inplace else bloco.copy()
+    tratado[outliers] = np.nan
+    return interpolar_por_grupo(tratado, grupo_por_linha, inicios, fins, inplace=True)
@@ -1,35 +1,90 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
+
+from preprocessamento.outliers.detectores import indexar_painel, normalizar_detector, tratar_fatia
+from preprocessamento.outliers.paralelo import tratar_em_paralelo
+from pipeline.instrumentacao import medir
+from pipeline.copia import copia_preguicosa
+
+METODOS_OUTLIER = ('vetorizado', 'referencia')
+
 
 class Outlier:
     """
     Classe para detecção e tratamento de outliers em um DataFrame do Pandas.
 
-    Esta classe identifica outliers usando o Z-Score (>3 desvios padrão) e os substitui por NaN,
-    aplicando interpolação linear para preencher os valores ausentes.
+    Esta classe identifica outliers usando, por padrão, o Z-Score (>3 desvios padrão) e os
+    substitui por NaN, aplicando interpolação linear para preencher os valores ausentes.
 
     Funcionalidades:
     - Identificar outliers em colunas numéricas com base no Z-Score.
+    - Trocar o detector por coluna: mediana/MAD, cercas IQR ou Z-Score móvel ao longo de 'Year'
+      (ver `preprocessamento.outliers.detectores.DETECTORES`).
     - Substituir outliers por NaN para evitar distorções na análise.
     - Aplicar interpolação linear para suavizar os dados.
+    - Opcionalmente, interpolar só os outliers, deixando os valores que já faltavam na
+      entrada para a etapa de imputação (`interpolar_ausentes=False`).
 
     Attributes:
         df (pd.DataFrame): O DataFrame original a ser processado.
+        metodo (str): Motor de tratamento ('vetorizado' ou 'referencia').
+        detector (tuple): Detector padrão, como (nome, parametros).
+        detectores_por_coluna (dict): Detectores específicos por coluna.
+        dtype_deteccao (np.dtype): Precisão da matriz usada na detecção.
+        n_workers (int): Número de processos usados no tratamento vetorizado.
+        interpolar_ausentes (bool): Se False, os valores ausentes na entrada continuam NaN.
     """
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, metodo: str = 'vetorizado', detector='zscore',
+                 detectores_por_coluna: dict = None, dtype_deteccao=np.float64, n_workers: int = 1,
+                 interpolar_ausentes: bool = True):
         """
         Inicializa a classe com um DataFrame.
 
         Args:
             df (pd.DataFrame): O DataFrame que será analisado e processado.
+            metodo (str, opcional): Motor de tratamento dos outliers. 'vetorizado' processa
+                todos os países e colunas em uma única passada sobre blocos NumPy contíguos;
+                'referencia' mantém a implementação original (laço por país e por coluna),
+                útil para validar resultados. O padrão é 'vetorizado'.
+            detector (str | tuple, opcional): Detector aplicado às colunas sem configuração
+                específica, dado pelo nome ou por (nome, parametros). O padrão é 'zscore'.
+            detectores_por_coluna (dict, opcional): Mapeia colunas para detectores, no mesmo
+                formato de `detector`. Ex.: {'Population': ('mad', {'limiar': 4.0})}.
+            dtype_deteccao (np.dtype, opcional): Precisão da matriz (país, ano) usada na
+                detecção. `np.float32` reduz pela metade a memória do bloco; o padrão
+                `np.float64` mantém o resultado idêntico ao modo de referência.
+            n_workers (int, opcional): Número de processos do modo 'vetorizado'. Com mais de
+                um, os países são divididos entre os processos e o bloco numérico é
+                compartilhado via memória compartilhada; o resultado é idêntico ao serial.
+                O padrão é 1.
+            interpolar_ausentes (bool, opcional): Se True, a interpolação preenche também
+                os valores que já faltavam na entrada (todas as lacunas internas e as do
+                fim da série de cada país). Se False, só os outliers removidos são
+                interpolados e os ausentes originais ficam para `PreenchendoKNN`, cuja
+                interpolação de lacunas curtas (`lacuna_maxima`) e o KNN passam a
+                preenchê-los. O padrão é True.
         """
         if not isinstance(df, pd.DataFrame):
             raise TypeError("❌ O argumento fornecido deve ser um DataFrame do Pandas.")
+        if metodo not in METODOS_OUTLIER:
+            raise ValueError(f"❌ O método deve ser um dos seguintes: {METODOS_OUTLIER}.")
+        if not isinstance(n_workers, int) or n_workers <= 0:
+            raise ValueError("❌ O número de workers deve ser um inteiro positivo.")
+
+        self.df = copia_preguicosa(df)  # Faz uma cópia do DataFrame original para evitar alterações diretas
+        self.metodo = metodo
+        self.detector = normalizar_detector(detector)
+        self.detectores_por_coluna = {
+            col: normalizar_detector(det) for col, det in (detectores_por_coluna or {}).items()
+        }
+        self.dtype_deteccao = np.dtype(dtype_deteccao)
+        self.n_workers = n_workers
+        self.interpolar_ausentes = interpolar_ausentes
+
+        if metodo == 'referencia' and (self.detector != ('zscore', {}) or self.detectores_por_coluna):
+            raise ValueError("❌ O método 'referencia' suporta apenas o detector 'zscore' padrão.")
 
-        self.df = df.copy()  # Faz uma cópia do DataFrame original para evitar alterações diretas
-    
     def tratar_outliers(self) -> pd.DataFrame:
         """
         Remove outliers e interpola valores ausentes em colunas numéricas.
@@ -39,6 +94,8 @@ class Outlier:
         - Substitui os outliers por NaN.
         - Aplica interpolação linear para preencher os valores ausentes.
 
+        Ambos os métodos (`vetorizado` e `referencia`) produzem o mesmo resultado.
+
         Returns:
             pd.DataFrame: DataFrame processado com outliers removidos e interpolação aplicada.
 
@@ -56,11 +113,90 @@ class Outlier:
             raise KeyError("❌ O DataFrame deve conter a coluna 'Country' para segmentação dos dados.")
 
         # Obtém colunas numéricas
-        colunas_numericas = self.df.select_dtypes(include=['float', 'int']).columns
+        colunas_numericas = self.df.select_dtypes(include='number').columns
         if colunas_numericas.empty:
             raise ValueError("❌ O DataFrame não possui colunas numéricas para análise.")
 
-        df_filtrado = self.df.copy()
+        if self.metodo == 'referencia':
+            df_filtrado = self._tratar_outliers_referencia(colunas_numericas)
+        else:
+            df_filtrado = self._tratar_outliers_vetorizado(colunas_numericas)
+
+        if not self.interpolar_ausentes:
+            # Só os outliers ficam interpolados: o que já faltava volta a NaN
+            for col in colunas_numericas:
+                ausentes = self.df[col].isna().to_numpy()
+                if ausentes.any():
+                    valores = df_filtrado[col].to_numpy(copy=True)
+                    valores[ausentes] = np.nan
+                    df_filtrado[col] = valores
+
+        print("✅ Outliers removidos e interpolação aplicada com sucesso.")
+        return df_filtrado
+
+    def _tratar_outliers_vetorizado(self, colunas_numericas: pd.Index) -> pd.DataFrame:
+        """
+        Trata os outliers de todos os países de uma só vez.
+
+        A detecção roda no núcleo comum (`detectar_outliers`) sobre uma matriz ordenada por
+        (país, ano). A máscara resultante é levada de volta à ordem original das linhas de
+        cada país, onde a interpolação é calculada para todos os grupos e colunas em
+        operações vetorizadas, e o resultado é reescrito nas posições originais. Com
+        `n_workers > 1`, os países são divididos entre processos (`tratar_em_paralelo`).
+
+        Args:
+            colunas_numericas (pd.Index): Colunas numéricas a serem tratadas.
+
+        Returns:
+            pd.DataFrame: DataFrame processado.
+        """
+        df_filtrado = copia_preguicosa(self.df)
+        # Detecção sobre a matriz ordenada por (país, ano); os grupos são os mesmos de `ordem`
+        tempo = df_filtrado['Year'] if 'Year' in df_filtrado.columns else None
+        ordem, grupo_por_linha, inicios, fins, indice_temporal = indexar_painel(df_filtrado['Country'], tempo)
+        if ordem.size == 0:
+            return df_filtrado
+
+        # Monta o bloco já na ordem (país, ano), coluna a coluna, sem a cópia intermediária
+        # de `to_numpy()` do DataFrame inteiro
+        bloco = np.empty((ordem.size, len(colunas_numericas)), dtype=np.float64)
+        for j, col in enumerate(colunas_numericas):
+            bloco[:, j] = df_filtrado[col].to_numpy()[ordem]
+
+        detectores = [self.detectores_por_coluna.get(col, self.detector) for col in colunas_numericas]
+        with medir('Outlier.tratar_fatia', linhas=ordem.size, n_workers=self.n_workers):
+            if self.n_workers > 1:
+                bloco = tratar_em_paralelo(bloco, indice_temporal, grupo_por_linha, inicios, fins,
+                                           detectores, self.dtype_deteccao, self.n_workers)
+            else:
+                bloco = tratar_fatia(bloco, indice_temporal, grupo_por_linha, inicios, fins,
+                                     detectores, self.dtype_deteccao, inplace=True)
+
+        for j, col in enumerate(colunas_numericas):
+            # Colunas inteiras passam a float64, assim como na implementação de referência
+            destino = df_filtrado[col].dtype if df_filtrado[col].dtype.kind == 'f' else np.float64
+            valores = df_filtrado[col].to_numpy(dtype=destino, copy=True)
+            valores[ordem] = bloco[:, j]
+            df_filtrado[col] = valores
+
+        return df_filtrado
+
+    def _tratar_outliers_referencia(self, colunas_numericas: pd.Index) -> pd.DataFrame:
+        """
+        Implementação original, que percorre cada país e cada coluna numérica.
+
+        Mantida como referência para validar o motor vetorizado.
+
+        Args:
+            colunas_numericas (pd.Index): Colunas numéricas a serem tratadas.
+
+        Returns:
+            pd.DataFrame: DataFrame processado.
+        """
+        # O SciPy só é necessário nesta implementação de referência
+        from scipy import stats
+
+        df_filtrado = copia_preguicosa(self.df)
 
         # Itera sobre cada país único no DataFrame
         for country in df_filtrado['Country'].unique():
@@ -76,7 +212,6 @@ class Outlier:
                 df_filtrado.loc[df_filtrado['Country'] == country, col] = \
                     df_filtrado.loc[df_filtrado['Country'] == country, col].interpolate(method='linear')
 
-        print("✅ Outliers removidos e interpolação aplicada com sucesso.")
         return df_filtrado
     
     def executar_outliers(self) -> pd.DataFrame:
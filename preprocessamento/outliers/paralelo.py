@@ -0,0 +1,121 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from preprocessamento.outliers.detectores import tratar_fatia
+
+
+def dividir_grupos(fins: np.ndarray, n_fatias: int) -> list:
+    """
+    Divide os grupos em fatias contíguas com número de linhas aproximadamente igual.
+
+    Um grupo nunca é dividido entre duas fatias.
+
+    Args:
+        fins (np.ndarray): Posição final (exclusiva) de cada grupo.
+        n_fatias (int): Número desejado de fatias.
+
+    Returns:
+        list: Lista de tuplas (primeiro_grupo, ultimo_grupo_exclusivo), sem fatias vazias.
+    """
+    total = fins[-1] if fins.size else 0
+    alvos = total * np.arange(1, n_fatias) / n_fatias
+    cortes = np.unique(np.concatenate([[0], np.searchsorted(fins, alvos, side='left') + 1, [fins.size]]))
+    cortes = np.minimum(cortes, fins.size)
+    return [(int(a), int(b)) for a, b in zip(cortes[:-1], cortes[1:]) if b > a]
+
+
+def _anexar(nome: str, shape: tuple, dtype) -> tuple:
+    """
+    Anexa um bloco de memória compartilhada existente e o expõe como array NumPy.
+
+    Returns:
+        tuple: (memoria, array). A memória deve ser fechada pelo chamador.
+    """
+    memoria = shared_memory.SharedMemory(name=nome)
+    return memoria, np.ndarray(shape, dtype=dtype, buffer=memoria.buf)
+
+
+def _processar_fatia(tarefa: dict) -> None:
+    """
+    Processa uma fatia de grupos em um processo trabalhador.
+
+    Lê o bloco e o índice temporal diretamente da memória compartilhada, sem cópia via
+    pickle, e escreve o resultado no trecho correspondente do bloco de saída.
+
+    Args:
+        tarefa (dict): Nomes e formatos das memórias compartilhadas, limites dos grupos da
+            fatia e configuração dos detectores.
+    """
+    mem_bloco, bloco = _anexar(tarefa['bloco'], tarefa['shape'], np.float64)
+    mem_indice, indice = _anexar(tarefa['indice'], (tarefa['shape'][0],), np.intp)
+    mem_saida, saida = _anexar(tarefa['saida'], tarefa['shape'], np.float64)
+    try:
+        a, b = tarefa['linhas']
+        saida[a:b] = tratar_fatia(
+            bloco[a:b], indice[a:b] - a, tarefa['grupo_por_linha'],
+            tarefa['inicios'], tarefa['fins'], tarefa['detectores_por_coluna'],
+            tarefa['dtype_deteccao'],
+        )
+    finally:
+        del bloco, indice, saida
+        mem_bloco.close()
+        mem_indice.close()
+        mem_saida.close()
+
+
+def tratar_em_paralelo(bloco: np.ndarray, indice_temporal: np.ndarray, grupo_por_linha: np.ndarray,
+                       inicios: np.ndarray, fins: np.ndarray, detectores_por_coluna: list,
+                       dtype_deteccao, n_workers: int) -> np.ndarray:
+    """
+    Executa `tratar_fatia` em um pool de processos, com os países divididos em fatias.
+
+    O bloco numérico, o índice temporal e o bloco de saída ficam em memória compartilhada;
+    cada trabalhador recebe apenas os limites da sua fatia. O resultado é idêntico, byte a
+    byte, ao do processamento serial.
+
+    Args:
+        bloco (np.ndarray): Matriz (linhas x colunas) em float64 agrupada por país.
+        indice_temporal (np.ndarray): Posição em `bloco` de cada linha da ordem (país, ano).
+        grupo_por_linha (np.ndarray): Índice do grupo de cada linha do bloco.
+        inicios (np.ndarray): Posição inicial de cada grupo.
+        fins (np.ndarray): Posição final (exclusiva) de cada grupo.
+        detectores_por_coluna (list): Para cada coluna, uma tupla (nome_do_detector, parametros).
+        dtype_deteccao (np.dtype): Precisão da matriz usada na detecção.
+        n_workers (int): Número de processos trabalhadores.
+
+    Returns:
+        np.ndarray: Matriz tratada, na ordem de `bloco`.
+    """
+    bloco = np.ascontiguousarray(bloco, dtype=np.float64)
+    indice_temporal = np.ascontiguousarray(indice_temporal, dtype=np.intp)
+    memorias = [
+        shared_memory.SharedMemory(create=True, size=max(bloco.nbytes, 1)),
+        shared_memory.SharedMemory(create=True, size=max(indice_temporal.nbytes, 1)),
+        shared_memory.SharedMemory(create=True, size=max(bloco.nbytes, 1)),
+    ]
+    try:
+        np.ndarray(bloco.shape, dtype=np.float64, buffer=memorias[0].buf)[:] = bloco
+        np.ndarray(indice_temporal.shape, dtype=np.intp, buffer=memorias[1].buf)[:] = indice_temporal
+
+        tarefas = []
+        for g0, g1 in dividir_grupos(fins, n_workers):
+            a, b = int(inicios[g0]), int(fins[g1 - 1])
+            tarefas.append({
+                'bloco': memorias[0].name, 'indice': memorias[1].name, 'saida': memorias[2].name,
+                'shape': bloco.shape, 'linhas': (a, b),
+                'grupo_por_linha': grupo_por_linha[a:b] - g0,
+                'inicios': inicios[g0:g1] - a, 'fins': fins[g0:g1] - a,
+                'detectores_por_coluna': detectores_por_coluna,
+                'dtype_deteccao': dtype_deteccao,
+            })
+
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tarefas))) as executor:
+            list(executor.map(_processar_fatia, tarefas))
+
+        return np.ndarray(bloco.shape, dtype=np.float64, buffer=memorias[2].buf).copy()
+    finally:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()